@@ -0,0 +1,72 @@
+"""
+Measures the time and memory cost of creating configuration instances, as
+ registries do for each registration and variant.
+
+The benchmarked configuration has ``--fields`` fields with metadata: tags on all
+ fields, variants on some, and registration key variants on dependencies.
+
+Usage:
+    python benchmarks/config_construction.py --fields 60 --instances 10000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Optional
+
+from pydantic import create_model
+
+from cinnamon.configuration import Configuration, Param
+from cinnamon.registry import RegistrationKey
+
+
+def build_config_class(fields: int):
+    definitions = {}
+    for idx in range(fields):
+        if idx % 10 == 0:
+            variants = [
+                RegistrationKey(name=f"dependency{value}", namespace="benchmark")
+                for value in range(10)
+            ]
+            definitions[f"field{idx}"] = (
+                Optional[RegistrationKey],
+                Param(None, tags={"dependency"}, variants=variants),
+            )
+        elif idx % 10 == 1:
+            definitions[f"field{idx}"] = (
+                int,
+                Param(0, tags={"variant"}, variants=list(range(1, 11))),
+            )
+        else:
+            definitions[f"field{idx}"] = (int, Param(idx, tags={"value"}))
+    return create_model("WideConfig", __base__=Configuration, **definitions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=60)
+    parser.add_argument("--instances", type=int, default=10000)
+    args = parser.parse_args()
+
+    config_class = build_config_class(fields=args.fields)
+
+    gc.collect()
+    start = time.perf_counter()
+    configs = [config_class() for _ in range(args.instances)]
+    elapsed = time.perf_counter() - start
+    del configs
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    configs = [config_class() for _ in range(args.instances)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(
+        f"{args.instances} instances of {args.fields} fields in {elapsed:.2f}s"
+        f" ({elapsed / args.instances * 1e6:.1f}us per instance),"
+        f" {(after - before) / args.instances / 1024:.1f} KiB per instance"
+    )
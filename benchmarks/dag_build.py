@@ -0,0 +1,138 @@
+"""
+Measures the build time and memory footprint of the registry dependency DAG.
+
+The DAG is built as during registration and expansion: each registration is a
+ child of the root, depends on a shared registration, and has variants depending
+ on the same registration.
+Ancestor queries (i.e., ``Registry.dependents()``) are timed both by traversal and
+ via the DAG reachability index.
+If ``networkx`` is installed, the same graph is built as a ``networkx.DiGraph``
+ for comparison.
+
+Usage:
+    python benchmarks/dag_build.py --keys 10000 --variants 100
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from cinnamon.registry import RegistrationKey
+from cinnamon.utility.dag import DAG
+
+
+def build_graph(graph, root, keys, dependencies, variants, add_edge):
+    for key, dependency, key_variants in zip(keys, dependencies, variants):
+        add_edge(graph, root, key, "child")
+        add_edge(graph, key, dependency, "child")
+        for variant_key in key_variants:
+            add_edge(graph, key, variant_key, "variant")
+            add_edge(graph, variant_key, dependency, "child")
+    return graph
+
+
+def measure(build):
+    # Build time and memory are measured separately, as tracing slows down builds.
+    # As in timeit, the garbage collector is disabled while timing.
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    del graph
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    graph = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, elapsed, after - before
+
+
+def measure_checks(graph, is_acyclic, topological_sort):
+    start = time.perf_counter()
+    is_acyclic(graph)
+    topological_sort(graph)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--variants", type=int, default=100)
+    args = parser.parse_args()
+
+    root = RegistrationKey(name="root", namespace="root")
+    keys = [
+        RegistrationKey(name=f"model{idx}", namespace="benchmark")
+        for idx in range(args.keys)
+    ]
+    # Dependencies are registered before their dependants
+    dependencies = [RegistrationKey(name="data", namespace="benchmark")] * args.keys
+    variants = [
+        [key.from_variant({"x": value}) for value in range(args.variants)]
+        for key in keys
+    ]
+
+    def add_dag_edge(graph, source, target, edge_type):
+        graph.add_edge(source, target, edge_type=edge_type)
+
+    builds = {
+        "DAG": (
+            lambda: build_graph(
+                DAG(), root, keys, dependencies, variants, add_dag_edge
+            ),
+            DAG.is_acyclic,
+            DAG.topological_sort,
+        )
+    }
+
+    try:
+        import networkx as nx
+
+        def add_nx_edge(graph, source, target, edge_type):
+            graph.add_edge(source, target, type=edge_type)
+
+        builds["networkx.DiGraph"] = (
+            lambda: build_graph(
+                nx.DiGraph(), root, keys, dependencies, variants, add_nx_edge
+            ),
+            nx.is_directed_acyclic_graph,
+            lambda graph: list(nx.topological_sort(graph)),
+        )
+    except ImportError:
+        pass
+
+    # Ancestor queries: the dependants of the shared registration and of variants
+    dag = builds["DAG"][0]()
+    queried = [dependencies[0]] * 10 + [key_variants[0] for key_variants in variants]
+    start = time.perf_counter()
+    for key in queried:
+        dag.ancestors(key)
+    traversal = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = dag.reachability(edge_type="child", reverse=True)
+    indexing = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in queried:
+        index.reachable(key)
+    lookup = time.perf_counter() - start
+    print(
+        f"DAG ancestors of {len(queried)} nodes: traversal {traversal:.2f}s,"
+        f" reachability index {indexing:.2f}s + lookup {lookup:.2f}s"
+    )
+    del dag, index
+
+    for name, (build, is_acyclic, topological_sort) in builds.items():
+        graph, elapsed, memory = measure(build)
+        checks = measure_checks(graph, is_acyclic, topological_sort)
+        print(
+            f"{name}: {len(graph)} nodes, build {elapsed:.2f}s,"
+            f" cycle check and topological sort {checks:.2f}s,"
+            f" {memory / len(graph):.1f} bytes per node"
+        )
@@ -0,0 +1,54 @@
+"""
+Measures the cost of the field-level properties of ``Configuration`` that run
+ several times per variant during expansion, resolution and instantiation:
+ ``dependencies``, ``values``, ``has_variants``, ``variants`` and ``meta``.
+
+The benchmarked configuration has ``--fields`` fields, some of which are
+ dependencies and some of which have variants.
+
+Usage:
+    python benchmarks/field_access.py --fields 60 --repeats 10000
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from pydantic import create_model
+
+from cinnamon.configuration import Configuration, Param
+from cinnamon.registry import RegistrationKey
+
+
+def build_config_class(fields: int):
+    definitions = {}
+    for idx in range(fields):
+        if idx % 10 == 0:
+            definitions[f"field{idx}"] = (Optional[RegistrationKey], Param(None))
+        elif idx % 10 == 1:
+            definitions[f"field{idx}"] = (int, Param(0, variants=[1, 2]))
+        else:
+            definitions[f"field{idx}"] = (int, Param(idx))
+    return create_model("WideConfig", __base__=Configuration, **definitions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=10000)
+    args = parser.parse_args()
+
+    config = build_config_class(fields=args.fields).default()
+
+    for name, access in [
+        ("dependencies", lambda: config.dependencies),
+        ("values", lambda: config.values),
+        ("has_variants", lambda: config.has_variants),
+        ("variants", lambda: config.variants),
+        ("meta", lambda: config.meta.field1),
+    ]:
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            access()
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / args.repeats * 1e6:.2f}us per access")
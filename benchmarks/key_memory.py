@@ -0,0 +1,85 @@
+"""
+Measures the memory footprint of expanded ``RegistrationKey`` instances.
+
+Variant keys are generated from a parent key as during registry expansion,
+ and a fraction of them is marked as invalid with a validation error message.
+With ``--depth``, the parent key depends on a chain of nested variant keys, whose
+ tags are inherited as hierarchy tags (e.g., ``encoder.layer.dropout=0.1``).
+
+Usage:
+    python benchmarks/key_memory.py --keys 100000 --invalid-ratio 0.1 --depth 3
+"""
+
+import argparse
+import gc
+import itertools
+import tracemalloc
+
+from cinnamon.registry import RegistrationKey
+
+
+def build_dependency(depth: int):
+    dependency = None
+    for level in range(depth):
+        key = RegistrationKey(name=f"level{level}", namespace="benchmark")
+        variant_kwargs = {"dropout": 0.1, "units": 128 * (level + 1)}
+        if dependency is not None:
+            variant_kwargs["layer"] = dependency
+        dependency = key.from_variant(variant_kwargs=variant_kwargs)
+    return dependency
+
+
+def build_keys(count: int, invalid_ratio: float, depth: int = 0):
+    parent = RegistrationKey(name="model", namespace="benchmark", tags={"default"})
+    dependency = build_dependency(depth=depth)
+    fields = {
+        "learning_rate": [1e-3, 1e-4, 1e-5, 5e-5],
+        "batch_size": list(range(1, 101)),
+        "seed": list(range(count // 400 + 1)),
+    }
+
+    invalid_every = int(1 / invalid_ratio) if invalid_ratio > 0 else 0
+    keys = []
+    for idx, values in enumerate(itertools.product(*fields.values())):
+        if idx == count:
+            break
+
+        variant_kwargs = dict(zip(fields, values))
+        if dependency is not None:
+            variant_kwargs["encoder"] = dependency
+        key = parent.from_variant(variant_kwargs=variant_kwargs)
+        if invalid_every and not idx % invalid_every:
+            key.metadata = (
+                f"1 validation error for Configuration\nbatch_size\n  Input should "
+                f"be less than or equal to 64 [type=less_than_equal, "
+                f"input_value={values[1]}, input_type=int]"
+            )
+        keys.append(key)
+
+    return keys
+
+
+def measure(count: int, invalid_ratio: float, depth: int = 0) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keys = build_keys(count=count, invalid_ratio=invalid_ratio, depth=depth)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(keys) == count
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.1)
+    parser.add_argument("--depth", type=int, default=0)
+    args = parser.parse_args()
+
+    bytes_per_key = measure(
+        count=args.keys, invalid_ratio=args.invalid_ratio, depth=args.depth
+    )
+    print(f"{args.keys} keys: {bytes_per_key:.1f} bytes per key")
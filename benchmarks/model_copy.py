@@ -0,0 +1,89 @@
+"""
+Compares the field-level validation path of ``Configuration.model_copy()`` with a
+ full re-validation of the copy, on wide configurations.
+
+The benchmarked configuration has ``--fields`` fields of different types (ints,
+ floats, strings, lists, dicts and optional values), and each copy updates one of
+ them, as variant expansion does.
+The full path is the one taken when the configuration class declares model
+ validators: the copy is dumped and validated again as a whole.
+Validation alone is timed as well, i.e. validating all fields against validating
+ the updated one.
+
+Usage:
+    python benchmarks/model_copy.py --fields 60 --copies 10000
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, create_model
+
+from cinnamon.configuration import Configuration, Param
+
+FIELD_TYPES = [
+    (int, 1),
+    (float, 0.5),
+    (str, "value"),
+    (List[int], [1, 2, 3]),
+    (Dict[str, float], {"a": 1.0, "b": 2.0}),
+    (Optional[int], None),
+]
+
+
+def build_config_class(fields: int):
+    definitions = {}
+    for idx in range(fields):
+        annotation, default = FIELD_TYPES[idx % len(FIELD_TYPES)]
+        definitions[f"field{idx}"] = (annotation, Param(default))
+    return create_model("WideConfig", __base__=Configuration, **definitions)
+
+
+def full_copy(config: Configuration, update):
+    model_copy = BaseModel.model_copy(config, update=update)
+    return config.model_validate(model_copy.model_dump(mode="python"))
+
+
+def fast_copy(config: Configuration, update):
+    return config.model_copy(update=update)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fields", type=int, default=60)
+    parser.add_argument("--copies", type=int, default=10000)
+    args = parser.parse_args()
+
+    config = build_config_class(fields=args.fields).default()
+    updates = [{"field0": idx} for idx in range(args.copies)]
+
+    for name, create_copy in [
+        ("full validation", full_copy),
+        ("field-level validation", fast_copy),
+    ]:
+        start = time.perf_counter()
+        for update in updates:
+            create_copy(config, update)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: {args.copies} copies of {args.fields} fields in {elapsed:.2f}s"
+            f" ({elapsed / args.copies * 1e6:.1f}us per copy)"
+        )
+
+    validator = config.fields_validator()
+    values = config.model_dump(mode="python")
+    for name, validate in [
+        ("full validation", lambda update: validator.validate_python(values | update)),
+        (
+            "field-level validation",
+            lambda update: validator.validate_assignment(
+                dict(values), "field0", update["field0"]
+            ),
+        ),
+    ]:
+        start = time.perf_counter()
+        for update in updates:
+            validate(update)
+        elapsed = time.perf_counter() - start
+        print(f"{name} only: {elapsed / args.copies * 1e6:.1f}us per copy")
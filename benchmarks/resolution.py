@@ -0,0 +1,65 @@
+"""
+Measures the cost of resolving and validating configurations during expansion,
+ when many variants share the same dependency subtree.
+
+The benchmarked registry has a chain of ``--depth`` configurations, each depending
+ on the next one and checking a condition, and a top configuration with
+ ``--variants`` variants depending on the chain.
+
+Usage:
+    python benchmarks/resolution.py --depth 50 --variants 2000
+"""
+
+import argparse
+import time
+
+from pydantic import create_model
+
+from cinnamon.configuration import Configuration, Param
+from cinnamon.registry import RegistrationKey, Registry
+
+
+def register_chain(depth: int, variants: int):
+    LeafConfig = create_model("LeafConfig", __base__=Configuration, x=(int, Param(1)))
+    ChainConfig = create_model(
+        "ChainConfig",
+        __base__=Configuration,
+        x=(int, Param(1)),
+        child=(RegistrationKey, Param()),
+    )
+    TopConfig = create_model(
+        "TopConfig",
+        __base__=Configuration,
+        x=(int, Param(0, variants=list(range(1, variants + 1)))),
+        child=(RegistrationKey, Param()),
+    )
+
+    child = None
+    for idx in range(depth):
+        config = LeafConfig() if child is None else ChainConfig(child=child)
+        config.add_condition(name="positive", condition=lambda c: c.x > 0)
+        child = Registry.register_configuration(
+            config=config, name=f"chain{idx}", namespace="benchmark"
+        )
+
+    Registry.register_configuration(
+        config=TopConfig(child=child), name="top", namespace="benchmark"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=50)
+    parser.add_argument("--variants", type=int, default=2000)
+    args = parser.parse_args()
+
+    Registry.initialize()
+    register_chain(depth=args.depth, variants=args.variants)
+
+    start = time.perf_counter()
+    valid_keys, invalid_keys = Registry.dag_resolution()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(valid_keys)} valid and {len(invalid_keys)} invalid keys"
+        f" (depth {args.depth}, {args.variants} variants) in {elapsed:.2f}s"
+    )
@@ -40,6 +40,26 @@ def build():
         default=None,
         help="Path to file containing all external directories",
     )
+    parser.add_argument(
+        "-cache",
+        "--cache",
+        action="store_true",
+        help="Store and re-use an on-disk snapshot of the registry",
+    )
+    parser.add_argument(
+        "-inc",
+        "--incremental",
+        action="store_true",
+        help="Only re-expand registrations affected by configuration scripts changed"
+        " since the cached snapshot (implies --cache)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse and validate configurations",
+    )
     args = parser.parse_args()
 
     directory = check_directory(directory_path=args.directory)
@@ -57,7 +77,12 @@ def build():
     sys.path.insert(0, directory.as_posix())
 
     valid_keys, invalid_keys = Registry.build(
-        directory=directory, external_directories=external_directories
+        directory=directory,
+        external_directories=external_directories,
+        # Each call is a new process: the previous state is the cached snapshot
+        cache=args.cache or args.incremental,
+        incremental=args.incremental,
+        workers=args.workers,
     )
     valid_keys = sorted(list(valid_keys), key=lambda key: key.name)
     invalid_keys = sorted(list(invalid_keys), key=lambda key: key.name)
@@ -101,6 +126,40 @@ def run():
         default=None,
         help="Path to file containing all external directories",
     )
+    parser.add_argument(
+        "-cache",
+        "--cache",
+        action="store_true",
+        help="Store and re-use an on-disk snapshot of the registry",
+    )
+    parser.add_argument(
+        "-inc",
+        "--incremental",
+        action="store_true",
+        help="Only re-expand registrations affected by configuration scripts changed"
+        " since the cached snapshot (implies --cache)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse and validate configurations",
+    )
+    parser.add_argument(
+        "-static",
+        "--static",
+        action="store_true",
+        help="List runnable keys via static analysis before building the registry",
+    )
+    parser.add_argument(
+        "-q",
+        "--query",
+        type=str,
+        default=None,
+        help="Select runnable keys via a query instead of interactive filtering"
+        ' (e.g., "name:svm* and C>=0.1")',
+    )
     args = parser.parse_args()
 
     directory = check_directory(directory_path=args.directory)
@@ -117,16 +176,39 @@ def run():
     # add to PYTHONPATH
     sys.path.insert(0, directory.as_posix())
 
-    Registry.build(directory=directory, external_directories=external_directories)
-    keys = Registry.retrieve_runnable_keys()
+    if args.static:
+        catalog = Registry.catalog(
+            directory=directory,
+            external_directories=external_directories,
+            workers=args.workers,
+        )
+        keys = [key for key, entry in catalog.items() if entry.run_method is not None]
+        if args.query is not None:
+            keys = Registry.query(query=args.query, keys=keys)
+    else:
+        Registry.build(
+            directory=directory,
+            external_directories=external_directories,
+            # Each call is a new process: the previous state is the cached snapshot
+            cache=args.cache or args.incremental,
+            incremental=args.incremental,
+            workers=args.workers,
+        )
+        if args.query is not None:
+            keys = Registry.query(query=f"special_tag:__runnable and ({args.query})")
+        else:
+            keys = Registry.retrieve_runnable_keys()
 
     if not len(keys):
         logger.info("Could not find any registered runnable component. Aborting...")
         return
 
-    filtered_keys = []
-    while not len(filtered_keys):
-        filtered_keys = filter_keys(keys=list(keys))
+    if args.query is not None:
+        filtered_keys = list(keys)
+    else:
+        filtered_keys = []
+        while not len(filtered_keys):
+            filtered_keys = filter_keys(keys=list(keys))
 
     logger.info(
         f"You have selected the following keys to execute: {os.linesep}"
@@ -138,6 +220,15 @@ def run():
     if not action:
         return
 
+    # Only the namespaces of selected keys are loaded
+    if args.static:
+        Registry.build(
+            directory=directory,
+            external_directories=external_directories,
+            workers=args.workers,
+            lazy=True,
+        )
+
     for key in filtered_keys:
         logger.info(f"Executing {key}")
 
@@ -186,6 +277,26 @@ def generate():
         default=None,
         help="Path to file containing all external directories",
     )
+    parser.add_argument(
+        "-cache",
+        "--cache",
+        action="store_true",
+        help="Store and re-use an on-disk snapshot of the registry",
+    )
+    parser.add_argument(
+        "-inc",
+        "--incremental",
+        action="store_true",
+        help="Only re-expand registrations affected by configuration scripts changed"
+        " since the cached snapshot (implies --cache)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse and validate configurations",
+    )
     args = parser.parse_args()
 
     directory = check_directory(directory_path=args.directory)
@@ -204,7 +315,12 @@ def generate():
     sys.path.insert(0, directory.as_posix())
 
     valid_keys, invalid_keys = Registry.build(
-        directory=directory, external_directories=external_directories
+        directory=directory,
+        external_directories=external_directories,
+        # Each call is a new process: the previous state is the cached snapshot
+        cache=args.cache or args.incremental,
+        incremental=args.incremental,
+        workers=args.workers,
     )
 
     if not len(valid_keys):
@@ -243,9 +359,8 @@ if __name__ == '__main__':
         {code_keys}
 ]
 
-    # Use RegistrationKey.from_string() to retrieve the RegistrationKey instance from string
-    for key in keys:
-        key = RegistrationKey.from_string(key)
+    # Use RegistrationKey.parse_many() to retrieve RegistrationKey instances from strings
+    for key in RegistrationKey.parse_many(keys):
 
         config_info = Registry.retrieve_configuration_info(registration_key=key)
         logger.info(config_info.config.model_dump())
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 import copy
-import itertools
 import logging
 import typing
 import warnings
 from dataclasses import dataclass
+from pathlib import PurePath
 from typing import (
     Any,
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
+    Iterable,
     List,
     Mapping,
     Set,
+    Tuple,
     Type,
     TypeVar,
 )
@@ -26,10 +29,11 @@ from pydantic import (
     model_validator,
 )
 from pydantic.fields import FieldInfo
-from pydantic_core import PydanticUndefined
+from pydantic_core import CoreSchema, PydanticUndefined, SchemaValidator
 from typing_extensions import Self
 
 import cinnamon.registry
+from cinnamon.utility.configuration import Constraint, VariantSpace
 from cinnamon.utility.exceptions import (
     ValidationFailureException,
     ValidationResult,
@@ -45,12 +49,99 @@ __all__ = ["Configuration", "C", "Param"]
 
 logger = logging.getLogger(__name__)
 
+# Field values that can be shared by overlays without ever being copied
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, PurePath)
+
 
 @dataclass
 class ConditionInfo:
     condition: Condition
     tags: Tags
     description: str | None = None
+    fields: Set[str] | None = None
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """
+    Field layout of a ``Configuration`` class, computed once per class.
+
+    Attributes:
+        fields: field names, in declaration (i.e., dump) order.
+        dependency_fields: fields annotated as dependencies (``RegistrationKey`` or
+         ``Configuration``). Other fields are dependencies only if their value is.
+        variant_fields: fields declaring variants in the class definition.
+        metas: class-level field metadata, shared by instances until modified.
+        meta: class-level access to field metadata.
+    """
+
+    fields: Tuple[str, ...]
+    dependency_fields: FrozenSet[str]
+    variant_fields: Tuple[str, ...]
+    metas: Dict[str, ParamMeta]
+    meta: FieldMetaProxy
+
+
+def is_dependency_annotation(annotation: Any) -> bool:
+    args = typing.get_args(annotation)
+    actual_type = args[0] if args else annotation
+    return (
+        actual_type is cinnamon.registry.RegistrationKey or actual_type is Configuration
+    )
+
+
+class PartialConfiguration:
+    """
+    Read-only view of a ``Configuration`` where some fields are assigned
+     candidate variant values.
+    Used to check conditions before variants are instantiated.
+    """
+
+    def __init__(self, config: Configuration, values: Dict[str, Any]):
+        self._config = config
+        self._values = values
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        return getattr(self._config, name)
+
+
+def build_fields_validator(schema: CoreSchema) -> SchemaValidator | None:
+    """
+    Builds a validator of the fields of a model, without model validators, from
+     the model core schema.
+
+    Args:
+        schema: the model core schema (i.e., ``__pydantic_core_schema__``).
+
+    Returns:
+        The validator of the ``model-fields`` schema, or None if not found.
+    """
+    definitions = {}
+    config = None
+    while schema["type"] != "model-fields":
+        if schema["type"] == "definitions":
+            definitions.update(
+                (definition["ref"], definition) for definition in schema["definitions"]
+            )
+        elif schema["type"] == "definition-ref":
+            schema = definitions[schema["schema_ref"]]
+            continue
+        elif schema["type"] == "model":
+            config = schema.get("config")
+
+        if "schema" not in schema:
+            return None
+        schema = schema["schema"]
+
+    if definitions:
+        schema = {
+            "type": "definitions",
+            "schema": schema,
+            "definitions": list(definitions.values()),
+        }
+    return SchemaValidator(schema, config)
 
 
 class ParamMeta:
@@ -58,6 +149,14 @@ class ParamMeta:
         self.tags = tags
         self.variants = variants
 
+    def copy(self) -> ParamMeta:
+        """
+        Copies the metadata, so that its tags and variants can be modified in place
+         without affecting the original one.
+        Tag and variant values are not copied.
+        """
+        return ParamMeta(tags=set(self.tags), variants=list(self.variants))
+
     def __call__(self, schema: dict) -> None:
         pass
 
@@ -81,33 +180,94 @@ def Param(
     )
 
 
+class FieldMetaView:
+    """
+    Instance-level access to the metadata of a field.
+    Reads go through the instance metadata if any, and through the class one
+     otherwise: shared class tags and variants are returned as a ``frozenset`` and
+     a ``tuple``, so that they cannot be modified in place.
+    Assigning ``tags`` or ``variants`` copies the class metadata to the instance
+     first.
+    """
+
+    __slots__ = ("_source", "_field_name", "_class_meta")
+
+    def __init__(self, source_dict: dict, field_name: str, class_meta: ParamMeta):
+        self._source = source_dict
+        self._field_name = field_name
+        self._class_meta = class_meta
+
+    def writable(self) -> ParamMeta:
+        """
+        Retrieves the instance metadata of the field, copying the class one if the
+         instance has none.
+        """
+        meta = self._source.get(self._field_name)
+        if meta is None:
+            meta = self._source[self._field_name] = self._class_meta.copy()
+        return meta
+
+    @property
+    def tags(self) -> Set[str] | FrozenSet[str]:
+        meta = self._source.get(self._field_name)
+        if meta is None:
+            return frozenset(self._class_meta.tags)
+        return meta.tags
+
+    @tags.setter
+    def tags(self, tags: Set[str]):
+        self.writable().tags = tags
+
+    @property
+    def variants(self) -> List[Any] | Tuple[Any, ...]:
+        meta = self._source.get(self._field_name)
+        if meta is None:
+            return tuple(self._class_meta.variants)
+        return meta.variants
+
+    @variants.setter
+    def variants(self, variants: List[Any]):
+        self.writable().variants = variants
+
+
 class FieldMetaProxy:
-    """Navigates your metadata maps depending on context."""
+    """
+    Navigates your metadata maps depending on context.
+    Instance metadata is copied from the class one (``owner``) on first write (see
+     ``FieldMetaView``).
+    """
 
-    def __init__(self, source_dict: dict, is_instance: bool):
+    def __init__(self, source_dict: dict, is_instance: bool, owner: type = None):
         self._source = source_dict
         self._is_instance = is_instance
+        self._owner = owner
 
-    def __getattr__(self, field_name: str) -> ParamMeta:
-        if field_name not in self._source:
+    def __getattr__(self, field_name: str) -> ParamMeta | FieldMetaView:
+        # Private names are looked up before initialization (e.g., when copying)
+        if field_name.startswith("_"):
             raise AttributeError(f"No field named '{field_name}'")
 
         if self._is_instance:
-            return self._source[field_name]
+            class_meta = self._owner.field_plan().metas.get(field_name)
+            if class_meta is None:
+                raise AttributeError(f"No field named '{field_name}'")
+            return FieldMetaView(self._source, field_name, class_meta)
         else:
+            if field_name not in self._source:
+                raise AttributeError(f"No field named '{field_name}'")
             field_info = self._source[field_name]
             if field_info.json_schema_extra is None:
                 field_info.json_schema_extra = ParamMeta(tags=set(), variants=[])
             return field_info.json_schema_extra
 
-    def get(self, field_name: str) -> ParamMeta:
+    def get(self, field_name: str) -> ParamMeta | FieldMetaView:
         """Allows dynamic string access via .get()"""
         try:
             return self.__getattr__(field_name)
         except AttributeError:
             raise KeyError(f"No field named '{field_name}'")
 
-    def __getitem__(self, field_name: str) -> ParamMeta:
+    def __getitem__(self, field_name: str) -> ParamMeta | FieldMetaView:
         """Allows dictionary bracket access: self.meta[field_name]"""
         return self.get(field_name)
 
@@ -120,10 +280,10 @@ class MetaDescriptor:
     def __get__(self, instance: Any, owner: type) -> FieldMetaProxy:
         if instance is None:
             # Triggered by: MyConfig.meta.x.variants (Class context)
-            return FieldMetaProxy(owner.model_fields, is_instance=False)
+            return owner.field_plan().meta
         else:
             # Triggered by: config.meta.x.variants (Instance context)
-            return FieldMetaProxy(instance._instance_meta, is_instance=True)
+            return instance._meta_proxy
 
 
 class Configuration(BaseModel):
@@ -135,22 +295,38 @@ class Configuration(BaseModel):
     _conditions: Dict[str, ConditionInfo] = PrivateAttr(default_factory=dict)
     _expanded: bool = PrivateAttr(default=False)
 
+    # Fields whose mutable value may be shared with other configurations (see
+    # ``overlay()``), copied by ``detach()``
+    _shared_fields: Set[str] = PrivateAttr(default_factory=set)
+
     # ignore this variable during serialization
+    # Only holds the field metadata modified via ``meta``: other fields share the
+    # class metadata (see ``field_meta()``)
     _instance_meta: Dict[str, ParamMeta] = PrivateAttr(default_factory=dict)
+    _meta_proxy: FieldMetaProxy | None = PrivateAttr(default=None)
 
     meta: ClassVar[MetaDescriptor] = MetaDescriptor()
 
+    # Validator of model fields only, by class (see ``fields_validator()``)
+    _FIELDS_VALIDATORS: ClassVar[Dict[type, SchemaValidator | None]] = {}
+
+    # Field layout, by class (see ``field_plan()``)
+    _FIELD_PLANS: ClassVar[Dict[type, FieldPlan]] = {}
+
     model_config = ConfigDict(validate_default=True)
 
     def model_post_init(self, __context: Any) -> None:
         """Runs automatically right after Pydantic instantiates an object."""
         instance_map = {}
-        for field_name, field_info in self.fields.items():
-            extra = field_info.json_schema_extra or ParamMeta(tags=set(), variants=[])
-            instance_map[field_name] = copy.deepcopy(extra)
 
         # Safely assign to our private attribute using object.__setattr__
         object.__setattr__(self, "_instance_meta", instance_map)
+        object.__setattr__(
+            self,
+            "_meta_proxy",
+            FieldMetaProxy(instance_map, is_instance=True, owner=self.__class__),
+        )
+        object.__setattr__(self, "_shared_fields", set())
 
     @classmethod
     def retrieve(
@@ -200,13 +376,55 @@ class Configuration(BaseModel):
             if field_info.json_schema_extra is None:
                 field_info.json_schema_extra = ParamMeta(tags=set(), variants=[])
 
+        # Incomplete classes (i.e., with unresolved annotations) are planned on
+        # first use, after being rebuilt
+        if cls.__pydantic_complete__:
+            cls.field_plan()
+
+    @classmethod
+    def field_plan(cls) -> FieldPlan:
+        """
+        The field layout of this class (see ``FieldPlan``), computed on class
+         creation.
+
+        Returns:
+            The class ``FieldPlan``.
+        """
+        plan = cls._FIELD_PLANS.get(cls)
+        if plan is None:
+            fields = cls.model_fields
+            metas = {}
+            for field_name, field_info in fields.items():
+                if not isinstance(field_info.json_schema_extra, ParamMeta):
+                    field_info.json_schema_extra = ParamMeta(tags=set(), variants=[])
+                metas[field_name] = field_info.json_schema_extra
+
+            plan = FieldPlan(
+                fields=tuple(fields),
+                dependency_fields=frozenset(
+                    field_name
+                    for field_name, field_info in fields.items()
+                    if is_dependency_annotation(field_info.annotation)
+                ),
+                variant_fields=tuple(
+                    field_name for field_name, meta in metas.items() if meta.variants
+                ),
+                metas=metas,
+                meta=FieldMetaProxy(fields, is_instance=False),
+            )
+            if cls.__pydantic_complete__:
+                cls._FIELD_PLANS[cls] = plan
+        return plan
+
     @model_validator(mode="after")
     def validate_variants(self) -> C:
-        for field_name, field_info in self.fields.items():
-            field_variants = self.meta[field_name].variants
+        fields = self.fields
+        for field_name in self.field_plan().variant_fields:
+            field_variants = self.field_meta(field_name=field_name).variants
             if not field_variants:
                 continue
 
+            field_info = fields[field_name]
             default_value = field_info.default
             if (
                 default_value is PydanticUndefined
@@ -221,9 +439,106 @@ class Configuration(BaseModel):
                 )
         return self
 
+    @classmethod
+    def fields_validator(cls) -> SchemaValidator | None:
+        """
+        The validator of the fields of this class, without model validators, built
+         on first use.
+        Validating a field assignment only runs the validators of that field.
+
+        Returns:
+            The fields validator, or None if the class declares model validators
+             other than ``validate_variants()``, which must run on every update.
+        """
+        if cls not in cls._FIELDS_VALIDATORS:
+            model_validators = cls.__pydantic_decorators__.model_validators
+            cls._FIELDS_VALIDATORS[cls] = (
+                build_fields_validator(cls.__pydantic_core_schema__)
+                if set(model_validators) <= {"validate_variants"}
+                else None
+            )
+        return cls._FIELDS_VALIDATORS[cls]
+
+    @classmethod
+    def update_validator(cls, update: Mapping[str, Any]) -> SchemaValidator | None:
+        """
+        Retrieves the fields validator (see ``fields_validator()``) if the given
+         update can be validated field by field.
+
+        Returns:
+            The fields validator, or None if the update requires a full validation,
+             i.e. when the class declares model validators, or when updating
+             unknown or frozen fields.
+        """
+        validator = cls.fields_validator()
+        if validator is None:
+            return None
+
+        fields = cls.model_fields
+        for field_name in update:
+            field = fields.get(field_name)
+            if field is None or field.frozen:
+                return None
+        return validator
+
+    def assign_fields(self, update: Mapping[str, Any]) -> bool:
+        """
+        Validates and assigns the given field values, only running the validators
+         of the updated fields.
+        ``validate_variants()`` is not run: it only checks class-level metadata.
+
+        Args:
+            update: the updated field values.
+
+        Returns:
+            False if the update requires a full validation (see
+             ``update_validator()``). In this case, no field is assigned.
+
+        Raises:
+            ``pydantic.ValidationError``: if an updated field value is not valid.
+        """
+        validator = self.update_validator(update=update)
+        if validator is None:
+            return False
+
+        values = self.__dict__
+        for field_name, value in update.items():
+            values, _, _ = validator.validate_assignment(values, field_name, value)
+
+        object.__setattr__(self, "__dict__", values)
+        self.__pydantic_fields_set__.update(update)
+        return True
+
     def model_copy(
         self, *, update: Mapping[str, Any] | None = None, deep: bool = False
     ) -> Self:
+        """
+        Copies the configuration, validating updated field values.
+        Only the validators of updated fields run, unless the class declares model
+         validators: in this case, the whole copy is validated.
+        Field metadata is reset to the class one.
+
+        Args:
+            update: the updated field values.
+            deep: whether to deep copy field values and conditions.
+
+        Returns:
+            The configuration copy.
+
+        Raises:
+            ``pydantic.ValidationError``: if the copy is not valid.
+        """
+        # Fast path: the copy is only validated for updated fields
+        if not update or self.update_validator(update=update) is not None:
+            model_copy = super().model_copy(deep=deep)
+            model_copy.model_post_init(None)
+            if update:
+                model_copy.assign_fields(update=update)
+            # Deep copies already copy private attributes
+            if not deep:
+                object.__setattr__(model_copy, "_conditions", dict(self._conditions))
+            return model_copy
+
         # 1. Get a pydantic copy with the updates applied
         model_copy = super().model_copy(update=update, deep=deep)
 
@@ -238,16 +553,101 @@ class Configuration(BaseModel):
 
         return validated
 
+    def overlay(self, update: Mapping[str, Any] | None = None) -> Self:
+        """
+        Creates a copy-on-write overlay of the configuration: a configuration that
+         only stores the given field updates, and shares all other field values
+         with this one.
+        Mutable shared values (e.g., lists, dicts and nested configurations) and
+         updated values are recorded in both configurations: ``detach()`` copies
+         them before they are modified in place.
+        The ``Registry`` detaches configurations when they are retrieved or
+         instantiated, so variants never copy values during expansion.
+        Only updated fields are validated (see ``assign_fields()``), unless the
+         class declares model validators: in this case, the configuration with the
+         whole update applied is validated once.
+        Conditions are copied shallowly, while field metadata is reset to the class
+         one, as in ``model_copy()``.
+
+        Args:
+            update: the values of overridden fields.
+
+        Returns:
+            The overlay configuration.
+
+        Raises:
+            ``pydantic.ValidationError``: if an updated field value is not valid.
+        """
+        overlay = self.__copy__()
+        object.__setattr__(overlay, "_conditions", dict(self._conditions))
+        overlay.model_post_init(None)
+
+        if not update or overlay.assign_fields(update=update):
+            return self.share_fields(overlay=overlay)
+
+        # Model validators must not see partially updated configurations.
+        # Unknown and frozen fields are rejected by assignment validation
+        fields = self.fields
+        if self.fields_validator() is None and all(
+            field_name in fields and not fields[field_name].frozen
+            for field_name in update
+        ):
+            validated = self.model_validate({**overlay.values, **update})
+            object.__setattr__(validated, "_conditions", overlay._conditions)
+            object.__setattr__(validated, "_expanded", self._expanded)
+            return self.share_fields(overlay=validated)
+
+        validator = self.__pydantic_validator__
+        for field_name, value in update.items():
+            validator.validate_assignment(overlay, field_name, value)
+        return self.share_fields(overlay=overlay)
+
+    def share_fields(self, overlay: Self) -> Self:
+        """
+        Records the mutable field values an overlay of this configuration may
+         share with it or with field variants (see ``detach()``).
+
+        Args:
+            overlay: the overlay configuration.
+
+        Returns:
+            The overlay configuration.
+        """
+        values = self.__dict__
+        overlay_values = overlay.__dict__
+        for field_name in self.field_plan().fields:
+            value = overlay_values[field_name]
+            if isinstance(value, _IMMUTABLE_TYPES):
+                continue
+
+            overlay._shared_fields.add(field_name)
+            if value is values[field_name]:
+                self._shared_fields.add(field_name)
+        return overlay
+
+    def detach(self) -> Self:
+        """
+        Copies the mutable field values the configuration may share with its
+         overlays or its base configuration (see ``overlay()``), so that they can
+         be modified in place without affecting other configurations.
+        Values are copied at most once.
+
+        Returns:
+            The configuration itself.
+        """
+        shared_fields = self._shared_fields
+        if shared_fields:
+            memo = {}
+            values = self.__dict__
+            for field_name in shared_fields:
+                values[field_name] = copy.deepcopy(values[field_name], memo)
+            shared_fields.clear()
+        return self
+
     def is_dependency(self, field_name: str, field: FieldInfo) -> bool:
-        field_value = getattr(self, field_name)
-        annotation = field.annotation
-        args = typing.get_args(annotation)
-        actual_type = args[0] if args else annotation
-        return (
-            isinstance(field_value, cinnamon.registry.RegistrationKey)
-            or isinstance(field_value, Configuration)
-            or actual_type is cinnamon.registry.RegistrationKey
-            or actual_type is Configuration
+        return field_name in self.field_plan().dependency_fields or isinstance(
+            getattr(self, field_name),
+            (cinnamon.registry.RegistrationKey, Configuration),
         )
 
     @property
@@ -264,19 +664,24 @@ class Configuration(BaseModel):
 
     @property
     def values(self) -> Dict[str, Any]:
+        values = self.__dict__
         return {
-            field_name: getattr(self, field_name)
-            for field_name, field in self.fields.items()
+            field_name: values[field_name] for field_name in self.field_plan().fields
         }
 
     @property
     def dependencies(
         self,
     ) -> Dict[str, cinnamon.registry.RegistrationKey | Configuration]:
+        plan = self.field_plan()
+        values = self.__dict__
         return {
-            field_name: getattr(self, field_name)
-            for field_name, field in self.fields.items()
-            if self.is_dependency(field_name=field_name, field=field)
+            field_name: values[field_name]
+            for field_name in plan.fields
+            if field_name in plan.dependency_fields
+            or isinstance(
+                values[field_name], (cinnamon.registry.RegistrationKey, Configuration)
+            )
         }
 
     def add_condition(
@@ -285,6 +690,7 @@ class Configuration(BaseModel):
         name: str,
         description: str | None = None,
         tags: Tags = None,
+        fields: Iterable[str] | None = None,
     ):
         """
         Adds a condition to be validated.
@@ -295,28 +701,45 @@ class Configuration(BaseModel):
             name: unique identifier.
             description: a string description for readability purposes.
             tags: a set of string tags to mark the condition with metadata.
+            fields: the fields read by the condition, if known.
+             Conditions that only read non-dependency fields are checked on partial
+             variant combinations, so that variants violating them are never
+             instantiated (see ``variant_constraints``).
+             The condition must not read any other field.
 
         Raises:
             ``AlreadyExistingParameterException``: if the provided `name`
              already exists in the Configuration instance.
+
+            ``KeyError``: if one of the given fields does not exist.
         """
+        if fields is not None:
+            fields = set(fields)
+            for field_name in fields:
+                if field_name not in self.fields:
+                    raise KeyError(f"No field named '{field_name}'")
+
         if name in self._conditions:
             warnings.warn(
                 "Condition with name {name} already exists! Overwriting...",
-                RuntimeWarning
+                RuntimeWarning,
             )
 
         self._conditions[name] = ConditionInfo(
-            condition=condition, description=description, tags=tags
+            condition=condition, description=description, tags=tags, fields=fields
         )
 
-    def validate_conditions(self, strict: bool = True) -> ValidationResult:
+    def validate_conditions(
+        self, strict: bool = True, recursive: bool = True
+    ) -> ValidationResult:
         """
         Validates all provided conditions related to the ``Configuration`` instance.
 
          Args:
              strict: if True, a failed validation process will raise
               ``InvalidConfigurationException``
+             recursive: if True, the conditions of ``Configuration`` dependencies
+              are validated first.
 
          Returns:
              A ``ValidationResult`` that stores the boolean result of the validation
@@ -327,11 +750,12 @@ class Configuration(BaseModel):
               process failed
         """
 
-        for dependency_name, dependency in self.dependencies.items():
-            if isinstance(dependency, Configuration):
-                child_validation = dependency.validate_conditions(strict=strict)
-                if not child_validation.passed:
-                    return child_validation
+        if recursive:
+            for dependency_name, dependency in self.dependencies.items():
+                if isinstance(dependency, Configuration):
+                    child_validation = dependency.validate_conditions(strict=strict)
+                    if not child_validation.passed:
+                        return child_validation
 
         for condition_name, condition_info in self._conditions.items():
             if not condition_info.condition(self):
@@ -359,18 +783,39 @@ class Configuration(BaseModel):
         """
         return cls()
 
+    def field_meta(self, field_name: str) -> ParamMeta:
+        """
+        Read-only access to the metadata of a field.
+        Unlike ``meta``, the metadata object itself is returned, shared with the
+         class if the instance metadata was never modified: the returned metadata
+         must not be modified.
+
+        Args:
+            field_name: the field name.
+
+        Returns:
+            The instance metadata of the field if any, the class one otherwise.
+
+        Raises:
+            ``KeyError``: if the field does not exist.
+        """
+        return (
+            self._instance_meta.get(field_name) or self.field_plan().metas[field_name]
+        )
+
     @property
     def has_variants(self) -> bool:
-        for field_name, field_info in self.fields.items():
-            if len(self.meta[field_name].variants):
-                return True
-        return False
+        # Instance metadata may differ from the class one (e.g., after expansion)
+        return any(
+            self.field_meta(field_name=field_name).variants
+            for field_name in self.field_plan().fields
+        )
 
     @property
     def has_at_least_two_variants(self) -> bool:
         field_with_variants = 0
-        for field_name, field_info in self.fields.items():
-            if len(self.meta[field_name].variants):
+        for field_name in self.field_plan().fields:
+            if self.field_meta(field_name=field_name).variants:
                 field_with_variants += 1
             if field_with_variants >= 2:
                 return True
@@ -379,21 +824,24 @@ class Configuration(BaseModel):
     @property
     def variants(
         self,
-    ) -> List[Dict[str, Dict[str, Any]]]:
+    ) -> VariantSpace:
         """
         Computes all unique combinations of a configuration's fields along
          with their indices.
         The baseline/default value always gets index 0.
         Subsequent unique variants get an increasing index (1, 2, ...).
+        Combinations are generated lazily: the returned ``VariantSpace`` can be
+         iterated, indexed and measured without materializing all of them.
         """
         field_choices = {}
 
         if not self.has_variants:
-            return []
+            return VariantSpace(field_choices={})
 
-        for field_name in self.fields.keys():
-            current_value = getattr(self, field_name)
-            variants = self.meta[field_name].variants or []
+        values = self.__dict__
+        for field_name in self.field_plan().fields:
+            current_value = values[field_name]
+            variants = self.field_meta(field_name=field_name).variants or []
 
             field_choices[field_name] = [
                 (item, idx + 1) for idx, item in enumerate(variants)
@@ -402,24 +850,49 @@ class Configuration(BaseModel):
             if len(self.fields) > 1:
                 field_choices[field_name].insert(0, (current_value, 0))
 
-        # Unpack keys and their list of (value, index) tuples
-        keys = list(field_choices.keys())
-        value_lists = list(field_choices.values())
+        # exclude default configuration
+        return VariantSpace(
+            field_choices=field_choices, exclude_default=len(self.fields) > 1
+        )
 
-        combinations = []
-        # ((val_x, idx_x), (val_y, idx_y), ...)
-        for combination_tuple in itertools.product(*value_lists):
-            combo_values = {}
-            combo_indexes = {}
+    @property
+    def variant_constraints(self) -> List[Constraint]:
+        """
+        The conditions that can be checked on partial variant combinations, i.e.
+         those declaring the fields they read, none of which is a dependency.
+        Each constraint is a (read fields, predicate) pair, where the predicate
+         evaluates the condition with candidate values for assigned fields.
+        """
+        constraints = []
+        dependencies = self.dependencies
+        for condition_info in self._conditions.values():
+            if condition_info.fields is None or not dependencies.keys().isdisjoint(
+                condition_info.fields
+            ):
+                continue
 
-            for key, (val, idx) in zip(keys, combination_tuple):
-                combo_values[key] = val
-                combo_indexes[key] = idx
+            def predicate(values, condition=condition_info.condition):
+                return condition(PartialConfiguration(config=self, values=values))
 
-            # exclude default configuration
-            if sum(list(combo_indexes.values())) == 0:
-                continue
+            constraints.append((condition_info.fields, predicate))
+
+        return constraints
 
-            combinations.append({"values": combo_values, "indexes": combo_indexes})
+    @property
+    def variant_count(self) -> int:
+        """
+        The number of variant combinations, computed without generating them.
+        """
+        return len(self.variants)
+
+    def variant_at(self, index: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Computes a variant combination from its position in ``variants``.
 
-        return combinations
+        Args:
+            index: position of the combination.
+
+        Returns:
+            A dict with ``values`` and ``indexes`` of the combination.
+        """
+        return self.variants.variant_at(index)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import ast
+import functools
 import importlib.util
+import itertools
 import json
 import math
+import operator
+import re
 import sys
-from dataclasses import dataclass
+import types
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from logging import getLogger
 from pathlib import Path
 from typing import (
@@ -14,6 +21,8 @@ from typing import (
     Callable,
     Dict,
     Generic,
+    Iterable,
+    Iterator,
     List,
     Set,
     Tuple,
@@ -21,13 +30,14 @@ from typing import (
     Union,
 )
 
-import networkx as nx
 import pydantic
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import core_schema
 
 import cinnamon.configuration
 from cinnamon.utility.configuration import batched
+from cinnamon.utility.dag import DAG
+from cinnamon.utility.discovery import FileIndex
 from cinnamon.utility.exceptions import (
     AlreadyExpandedException,
     AlreadyRegisteredException,
@@ -38,37 +48,135 @@ from cinnamon.utility.exceptions import (
     NotBoundException,
     NotExpandedException,
     NotRegisteredException,
+    ValidationResult,
 )
+from cinnamon.utility.index import IndexedRegistry, KeyIndex
+from cinnamon.utility.query import parse_query
 from cinnamon.utility.registration import (
     TAGGABLE_TYPES,
-    NamespaceExtractor,
+    CatalogEntry,
     Tags,
+    extract_registrations,
     import_class_from_string,
     match_name,
     match_namespace,
     match_tags,
 )
+from cinnamon.utility.sampling import SamplingPolicy
 from cinnamon.utility.sanity import time_it
+from cinnamon.utility.snapshot import (
+    deserialize,
+    dump_snapshot,
+    load_snapshot,
+    serialize,
+)
+from cinnamon.utility.tags import TAG_TRIE, Tag, TagPath
 
 logger = getLogger(__name__)
 
 Constructor = Callable[[], "cinnamon.configuration.Configuration"]
 Registration = Union["RegistrationKey", str]
+Sampling = Union[SamplingPolicy, Dict[Union[Registration, None], SamplingPolicy], None]
+# Expansion progress: (level index, number of levels, keys expanded in the level)
+ExpansionProgress = Callable[[int, int, List["RegistrationKey"]], None]
+_TAGGABLE_TYPES = tuple(TAGGABLE_TYPES)
 T = TypeVar("T")
 
-__all__ = ["RegistrationKey", "register", "register_method", "Registry", "Registration"]
+__all__ = [
+    "RegistrationKey",
+    "register",
+    "register_method",
+    "Registry",
+    "Registration",
+    "Sampling",
+]
 
 
 class RegistrationKey(Generic[T]):
     """
     Compound key used for registration.
+
+    Keys are immutable and interned: equal keys are the same object.
+    Hence, keys are compared and hashed by identity, without calling Python code.
+    The ``name``, ``namespace`` and ``tags`` identifying a key cannot be changed.
+    The ``description`` and ``metadata`` annotations are shared by all references
+     to the key.
+    ``special_tags`` are owned by the ``Registry``: they are derived from the
+     registered ``ConfigurationInfo`` (see ``Registry.special_tags()``).
+
+    Keys are compact: identifying fields are stored as a single tuple of interned
+     strings and shared tags, and the string format is computed on first use only.
+    ``metadata`` is stored in a side table, since only invalid keys have it.
+
+    Tags are structured (see ``Tag``): each tag is a path in the shared ``TagTrie``
+     with an optional typed value (e.g., ``model.kernel=linear``).
+    ``tags`` lists their string formats, while ``structured_tags`` and ``tag_map``
+     expose them without string parsing.
     """
 
+    __slots__ = (
+        "_identity",
+        "_string",
+        "description",
+        "__weakref__",
+    )
+
     KEY_VALUE_SEPARATOR: str = "="
     ATTRIBUTE_SEPARATOR: str = "--"
     HIERARCHY_SEPARATOR: str = "."
     MAX_TAGS_PER_LINE: int = 6
 
+    # Maximum number of memoized string formats (see ``from_string()``)
+    PARSE_CACHE_SIZE: int = 65536
+
+    # String format produced by ``__str__()`` for tags without quotes or escapes
+    _CANONICAL_FORMAT = re.compile(
+        r"name=((?:[^-]|-(?!-))*)"
+        r"(?:--tags=\[((?:'[^'\\]*', )*'[^'\\]*')\])?"
+        r"--namespace=((?:[^-]|-(?!-))*)"
+    )
+
+    # Shared by all keys without special tags
+    EMPTY_TAGS: frozenset = frozenset()
+
+    # Shared by all runnable registered keys
+    RUNNABLE_TAGS: frozenset = frozenset({"__runnable"})
+
+    # Live keys by (name, namespace, *sorted tags)
+    _INTERNED: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    # Metadata of (invalid) keys
+    _METADATA: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    # Shared tag paths and tags
+    _TAG_TRIE = TAG_TRIE
+
+    def __new__(
+        cls,
+        name: str,
+        namespace: str | None = None,
+        tags: Tags = None,
+        description: str | None = None,
+        metadata: str | None = None,
+    ):
+        namespace = namespace if namespace is not None else "default"
+        if tags:
+            tags = cls._TAG_TRIE.parse_many(tags)
+            identity = (name, namespace, *sorted(tags, key=_tag_order))
+        else:
+            identity = (name, namespace)
+
+        key = cls._INTERNED.get(identity)
+        if key is None:
+            key = super().__new__(cls)
+            identity = (sys.intern(name), sys.intern(namespace), *identity[2:])
+            object.__setattr__(key, "_identity", identity)
+            object.__setattr__(key, "_string", None)
+            object.__setattr__(key, "description", None)
+            cls._INTERNED[identity] = key
+
+        return key
+
     def __init__(
         self,
         name: str,
@@ -76,7 +184,6 @@ class RegistrationKey(Generic[T]):
         tags: Tags = None,
         description: str | None = None,
         metadata: str | None = None,
-        special_tags: Tags = None,
     ):
         """
 
@@ -93,18 +200,103 @@ class RegistrationKey(Generic[T]):
             tags: metadata for quick inspection of a registered ``Configuration``.
             In the case of ``Configuration`` with the same name and namespace
             (e.g., multiple models implemented by the same user), tags are used
-            to distinguish among them.
+            to distinguish among them. Tags are given in their string format or
+            as ``Tag`` instances.
             description: natural language description of a ``RegistrationKey``.
             metadata: optionally contains information about the invalidity of the
              ``RegistrationKey``
-            special_tags: set of special tags for internal use.
+
+        Annotations are set only if given, since the key may already exist.
         """
-        self.name = name
-        self.namespace = namespace if namespace is not None else "default"
-        self.tags = tags if tags is not None else set()
-        self.description = description
-        self.metadata = metadata
-        self.special_tags = special_tags if special_tags is not None else set()
+        if description is not None:
+            self.description = description
+        if metadata is not None:
+            self.metadata = metadata
+
+    @property
+    def name(self) -> str:
+        return self._identity[0]
+
+    @property
+    def namespace(self) -> str:
+        return self._identity[1]
+
+    @property
+    def tags(self) -> frozenset:
+        return frozenset(map(_tag_string, self._identity[2:]))
+
+    @property
+    def structured_tags(self) -> Tuple[Tag, ...]:
+        return self._identity[2:]
+
+    @property
+    def tag_map(self) -> Dict[TagPath, Any]:
+        """
+        The typed values of compound tags, by tag path: e.g.,
+         ``{("C",): 1.0, ("model", "kernel"): "linear"}``.
+        """
+        return {tag.path: tag.value for tag in self._identity[2:] if tag.is_compound}
+
+    def tag_value(self, path: Union[TagPath, str], default: Any = None) -> Any:
+        """
+        Retrieves the typed value of a compound tag.
+
+        Args:
+            path: the tag path, either as a tuple or in its string format
+             (e.g., ``model.kernel``).
+            default: the value returned if the key has no such compound tag.
+
+        Returns:
+            The typed tag value, or ``default``.
+        """
+        if isinstance(path, str):
+            path = tuple(path.split(self.HIERARCHY_SEPARATOR))
+
+        for tag in self._identity[2:]:
+            if tag.is_compound and tag.path == path:
+                return tag.value
+        return default
+
+    @property
+    def metadata(self) -> str | None:
+        return self._METADATA.get(self)
+
+    @metadata.setter
+    def metadata(self, metadata: str | None):
+        if metadata is None:
+            self._METADATA.pop(self, None)
+        else:
+            self._METADATA[self] = metadata
+
+    @property
+    def special_tags(self) -> frozenset:
+        """
+        Special tags for internal use (e.g., ``__runnable``), as assigned by the
+         ``Registry`` to the registered key.
+        """
+        return Registry.special_tags(registration_key=self)
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in ("description", "metadata"):
+            raise AttributeError(
+                f"{RegistrationKey.__name__} is immutable. Cannot set {name}"
+            )
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return RegistrationKey, (
+            self.name,
+            self.namespace,
+            self.tags,
+            self.description,
+            self.metadata,
+        )
+
+    def __copy__(self) -> RegistrationKey[T]:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> RegistrationKey[T]:
+        return self
 
     @classmethod
     def __get_pydantic_core_schema__(
@@ -117,18 +309,22 @@ class RegistrationKey(Generic[T]):
             ),
         )
 
-    def __hash__(self) -> int:
-        return hash(self.__str__())
-
     def __str__(self) -> str:
+        if self._string is None:
+            object.__setattr__(self, "_string", self.format())
+        return self._string
+
+    def format(self) -> str:
+        """
+        Computes the string format of the key.
+        """
         to_return = [f"name{self.KEY_VALUE_SEPARATOR}{self.name}"]
 
-        if self.tags is not None:
-            tags = sorted(list(self.tags)) if self.tags else None
-            if tags is not None:
-                to_return.append(
-                    f"{self.ATTRIBUTE_SEPARATOR}tags{self.KEY_VALUE_SEPARATOR}{tags}"
-                )
+        tags = sorted(map(_tag_string, self._identity[2:]))
+        if tags:
+            to_return.append(
+                f"{self.ATTRIBUTE_SEPARATOR}tags{self.KEY_VALUE_SEPARATOR}{tags}"
+            )
 
         to_return.append(
             f"{self.ATTRIBUTE_SEPARATOR}namespace{self.KEY_VALUE_SEPARATOR}{self.namespace}"
@@ -160,41 +356,37 @@ class RegistrationKey(Generic[T]):
             return True
         return False
 
-    def __eq__(self, other) -> bool:
-        if other is None or not isinstance(other, RegistrationKey):
-            return False
-
-        return (
-            self.check_name(other.name)
-            and self.check_tags(other.tags)
-            and self.check_namespace(other.namespace)
-        )
-
     @property
     def compound_tags(self):
-        return {tag for tag in self.tags if self.KEY_VALUE_SEPARATOR in tag}
+        return {tag.string for tag in self._identity[2:] if tag.text is not None}
 
     @property
     def hierarchy_tags(self):
-        return {tag for tag in self.tags if self.HIERARCHY_SEPARATOR in tag}
+        return {tag.string for tag in self._identity[2:] if tag.is_hierarchy}
 
-    def sanitize_variant_tag(
-        self, param_name: str, param_index: int, param_value: Any
-    ) -> str:
-        if isinstance(param_value, tuple(TAGGABLE_TYPES)):
-            sanitized_tag = f"{param_name}{self.KEY_VALUE_SEPARATOR}{param_value}"
+    def variant_tag(self, param_name: str, param_index: int, param_value: Any) -> Tag:
+        if isinstance(param_value, _TAGGABLE_TYPES):
+            variant_value = str(param_value)
         else:
             variant_value = f"variant-{param_index}"
-            sanitized_tag = f"{param_name}{self.KEY_VALUE_SEPARATOR}{variant_value}"
 
-        return sanitized_tag
+        return self._TAG_TRIE.tag(path=(param_name,), text=variant_value)
+
+    def sanitize_variant_tag(
+        self, param_name: str, param_index: int, param_value: Any
+    ) -> str:
+        return self.variant_tag(
+            param_name=param_name,
+            param_index=param_index,
+            param_value=param_value,
+        ).string
 
     def from_variant(
         self,
         variant_kwargs: Dict[str, Any],
         variant_indexes: Dict[str, int] | None = None,
     ) -> RegistrationKey[T]:
-        variant_tags = []
+        variant_tags = list(self._identity[2:])
         variant_indexes = (
             {key: 1 for key in variant_kwargs}
             if variant_indexes is None
@@ -206,22 +398,22 @@ class RegistrationKey(Generic[T]):
 
             if isinstance(variant_value, RegistrationKey):
                 # The recursive approach of dag resolution ensures tag hierarchy
-                for tag in variant_value.tags:
-                    variant_tags.append(f"{param_name}{self.HIERARCHY_SEPARATOR}{tag}")
+                for tag in variant_value.structured_tags:
+                    variant_tags.append(self._TAG_TRIE.prefixed(param_name, tag))
             else:
                 variant_tags.append(
-                    self.sanitize_variant_tag(
+                    self.variant_tag(
                         param_name=param_name,
                         param_index=variant_indexes[param_name],
                         param_value=variant_value,
                     )
                 )
 
-        return RegistrationKey[T](
+        # Keys do not store their generic alias: build them via the plain class
+        return RegistrationKey(
             name=self.name,
-            tags=self.tags.union(set(variant_tags)),
+            tags=variant_tags,
             namespace=self.namespace,
-            special_tags=self.special_tags,
             description=self.description,
             metadata=self.metadata,
         )
@@ -245,10 +437,113 @@ class RegistrationKey(Generic[T]):
             name=self.name, tags=remaining_tags, namespace=self.namespace
         )
 
+    @classmethod
+    def _tokenize_tags(cls, string_format: str, position: int) -> Tuple[List[str], int]:
+        """
+        Tokenizes the tag list of a string format, i.e. the ``repr`` of a list of
+         strings, starting at the given position.
+
+        Returns:
+            tags: the parsed tags.
+            position: the position right after the tag list.
+        """
+        if not string_format.startswith("[", position):
+            raise ValueError(f"Expected a tag list at position {position}")
+        position += 1
+
+        tags = []
+        if string_format.startswith("]", position):
+            return tags, position + 1
+
+        while True:
+            quote = string_format[position : position + 1]
+            if quote not in ("'", '"'):
+                raise ValueError(f"Expected a quoted tag at position {position}")
+
+            end = string_format.find(quote, position + 1)
+            if end < 0:
+                raise ValueError(f"Unterminated tag at position {position}")
+
+            if "\\" in string_format[position + 1 : end]:
+                # Escaped characters: find the closing quote and decode the literal
+                end = position + 1
+                while string_format[end : end + 1] != quote:
+                    if end >= len(string_format):
+                        raise ValueError(f"Unterminated tag at position {position}")
+                    end += 2 if string_format[end] == "\\" else 1
+                tags.append(ast.literal_eval(string_format[position : end + 1]))
+            else:
+                tags.append(string_format[position + 1 : end])
+
+            position = end + 1
+            if string_format.startswith(", ", position):
+                position += 2
+            elif string_format.startswith("]", position):
+                return tags, position + 1
+            else:
+                raise ValueError(f"Malformed tag list at position {position}")
+
+    @classmethod
+    def tokenize(cls, string_format: str) -> Dict[str, Any]:
+        """
+        Tokenizes the string format of a ``RegistrationKey`` instance into its
+         attributes.
+        Attribute values cannot contain the attribute separator, except for tags.
+        The format produced by ``__str__()`` is matched by a single regular
+         expression, while other formats (e.g., with quoted tags or additional
+         attributes) are scanned attribute by attribute.
+
+        Args:
+            string_format: the string format of a ``RegistrationKey`` instance.
+
+        Returns:
+            The mapping from attribute name to value.
+
+        Raises:
+            ``ValueError``: if the string format is malformed.
+        """
+        match = cls._CANONICAL_FORMAT.fullmatch(string_format)
+        if match is not None:
+            name, tags, namespace = match.groups()
+            attributes = {"name": name, "namespace": namespace}
+            if tags is not None:
+                attributes["tags"] = set(tags[1:-1].split("', '"))
+            return attributes
+
+        attributes = {}
+        position = 0
+        length = len(string_format)
+        while True:
+            separator = string_format.find(cls.KEY_VALUE_SEPARATOR, position)
+            if separator < 0:
+                raise ValueError(f"Expected an attribute at position {position}")
+
+            attribute = string_format[position:separator]
+            position = separator + len(cls.KEY_VALUE_SEPARATOR)
+            if attribute == "tags":
+                value, position = cls._tokenize_tags(
+                    string_format=string_format, position=position
+                )
+                value = set(value)
+            else:
+                end = string_format.find(cls.ATTRIBUTE_SEPARATOR, position)
+                end = length if end < 0 else end
+                value = string_format[position:end]
+                position = end
+            attributes[attribute] = value
+
+            if position == length:
+                return attributes
+
+            if not string_format.startswith(cls.ATTRIBUTE_SEPARATOR, position):
+                raise ValueError(f"Expected an attribute separator at {position}")
+            position += len(cls.ATTRIBUTE_SEPARATOR)
+
     @classmethod
     def from_string(cls, string_format: str) -> RegistrationKey[Any]:
         """
         Parses a ``RegistrationKey`` instance from its string format.
+        Parsed keys are memoized (see ``PARSE_CACHE_SIZE``).
 
         Args:
             string_format: the string format of a ``RegistrationKey`` instance.
@@ -256,24 +551,50 @@ class RegistrationKey(Generic[T]):
         Returns:
             The corresponding parsed ``RegistrationKey`` instance
         """
+        try:
+            return _parse_key(string_format)
+        except (ValueError, SyntaxError) as e:
+            logger.exception(
+                f"Failed parsing registration key from string.. Got: {string_format}"
+            )
+            raise e
 
-        registration_attributes = string_format.split(cls.ATTRIBUTE_SEPARATOR)
-        registration_dict = {}
-        for registration_attribute in registration_attributes:
-            try:
-                key, value = registration_attribute.split(cls.KEY_VALUE_SEPARATOR)
-                if key == "tags":
-                    value = set(ast.literal_eval(value))
-
-                registration_dict[key] = value
-            except ValueError as e:
-                logger.exception(
-                    f"Failed parsing registration key from string.. "
-                    f"Got: {string_format}"
-                )
-                raise e
+    @classmethod
+    def parse_many(
+        cls, registration_keys: Iterable[Registration]
+    ) -> List[RegistrationKey[Any]]:
+        """
+        Parses many ``RegistrationKey`` instances at once.
+        Repeated string formats are parsed once.
+
+        Args:
+            registration_keys: ``RegistrationKey`` instances in their class instance
+             or string format.
+
+        Returns:
+            The parsed ``RegistrationKey`` instances, in the given order.
+        """
+        parsed = {}
+        keys = []
+        for registration_key in registration_keys:
+            if isinstance(registration_key, RegistrationKey):
+                keys.append(registration_key)
+                continue
+
+            key = parsed.get(registration_key)
+            if key is None:
+                try:
+                    key = cls(**cls.tokenize(registration_key))
+                except (ValueError, SyntaxError) as e:
+                    logger.exception(
+                        f"Failed parsing registration key from string.. "
+                        f"Got: {registration_key}"
+                    )
+                    raise e
+                parsed[registration_key] = key
+            keys.append(key)
 
-        return RegistrationKey[Any](**registration_dict)
+        return keys
 
     @classmethod
     def parse(
@@ -344,6 +665,15 @@ class RegistrationKey(Generic[T]):
         """
 
 
+_tag_order = operator.attrgetter("order")
+_tag_string = operator.attrgetter("string")
+
+
+@functools.lru_cache(maxsize=RegistrationKey.PARSE_CACHE_SIZE)
+def _parse_key(string_format: str) -> RegistrationKey[Any]:
+    return RegistrationKey(**RegistrationKey.tokenize(string_format))
+
+
 class BufferedRegistration:
     def __init__(
         self,
@@ -406,12 +736,16 @@ def register(func: Callable) -> Callable:
 class RegistrationContext:
     def __init__(self):
         self.is_registering: bool = False
+        self.depth: int = 0
 
     def __enter__(self):
+        # Registrations may trigger nested registrations of other namespaces
+        self.depth += 1
         self.is_registering = True
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.is_registering = False
+        self.depth -= 1
+        self.is_registering = self.depth > 0
 
 
 @dataclass
@@ -432,6 +766,33 @@ class ConfigurationInfo:
     component: str | None = None
     run_method: str | None = None
 
+    @property
+    def special_tags(self) -> frozenset:
+        """
+        The special tags of the registration: runnable registrations are tagged
+         ``__runnable``.
+        """
+        if self.run_method is None:
+            return RegistrationKey.EMPTY_TAGS
+        return RegistrationKey.RUNNABLE_TAGS
+
+
+def _validate_payload(payload: bytes) -> ValidationResult | None:
+    """
+    Validates the conditions of a serialized configuration in a worker process.
+
+    Returns:
+        The validation result, or None if the configuration could not be
+         deserialized.
+    """
+    try:
+        config = deserialize(payload, script_loader=Registry.import_script)
+    except Exception:
+        return None
+
+    # Dependencies are validated by the registry (see ``validate_dependencies()``)
+    return config.validate_conditions(strict=False, recursive=False)
+
 
 class Registry:
     """
@@ -453,10 +814,15 @@ class Registry:
 
     _CONFIGURATION_FOLDER = "configurations"
 
-    _REGISTRY: Dict[RegistrationKey[Any], ConfigurationInfo]
+    # Maximum number of variants held in memory at once during parallel expansion
+    VARIANT_CHUNK_SIZE: int = 1024
+    _SNAPSHOT_FILENAME = "registry.pkl"
+
+    # Valid (or not yet validated) registrations, indexed for retrieval
+    _REGISTRY: IndexedRegistry = IndexedRegistry()
 
     _ROOT_KEY = RegistrationKey[Any](name="root", namespace="root")
-    _DEPENDENCY_DAG: nx.DiGraph
+    _DEPENDENCY_DAG: DAG
 
     expanded: bool = False
 
@@ -464,23 +830,70 @@ class Registry:
     _EXP_MODULES: Set[Path]
     _MODULE_MAPPING: Dict[str, str]
     _EXP_NAMESPACES: List[str]
+    _SCRIPT_MODULES: Dict[Path, types.ModuleType] = {}
+    _FILE_INDEX: Dict[Path, FileIndex] = {}
+
+    # Statically extracted namespaces and registrations by script content hash
+    _PARSE_CACHE: Dict[str, Tuple[List[str], List[CatalogEntry]]] = {}
+
+    # Incremental build state
+    _INVALID_REGISTRY: Dict[RegistrationKey[Any], ConfigurationInfo] = {}
+    _VALID_KEYS: Set[RegistrationKey[Any]]
+    _INVALID_KEYS: Set[RegistrationKey[Any]]
+    # Validation errors of invalid keys, reported by their dependants
+    _VALIDATION_ERRORS: Dict[RegistrationKey[Any], ValidationResult] = {}
+    _SCRIPT_KEYS: Dict[Path, Set[RegistrationKey[Any]]]
+    _CURRENT_SCRIPT: Path | None = None
+    _FINGERPRINT: Dict[str, str] | None = None
+    _BUILD_DIRECTORIES: List[Path]
+
+    # Lazy build state
+    _LAZY: bool = False
+    _NAMESPACE_SCRIPTS: Dict[str, List[Tuple[Path, Path]]]
+    _LOADED_NAMESPACES: Set[str]
+    _EXPAND_ON_DEMAND: bool = False
+
+    # Variant sampling policies by registration key (None for all other keys)
+    _SAMPLING: Dict[RegistrationKey[Any] | None, SamplingPolicy] = {}
+
+    # Shared resolved configurations by registration key (see
+    # ``resolved_configuration()``)
+    _RESOLVED: Dict[RegistrationKey[Any], cinnamon.configuration.Configuration] = {}
 
     REGISTRATION_METHODS: Dict[str, Callable | BufferedRegistration]
     REGISTRATION_CONTEXT: RegistrationContext
 
     @classmethod
     def initialize(cls):
-        cls._REGISTRY = {}
+        cls._REGISTRY = IndexedRegistry()
 
         cls.REGISTRATION_METHODS = {}
         cls.REGISTRATION_CONTEXT = RegistrationContext()
         cls._EXP_MODULES = set()
         cls._MODULE_MAPPING = {}
         cls._EXP_NAMESPACES = []
+        cls._SCRIPT_MODULES = {}
+        cls._FILE_INDEX = {}
+
+        cls._INVALID_REGISTRY = {}
+        cls._VALID_KEYS = set()
+        cls._INVALID_KEYS = set()
+        cls._VALIDATION_ERRORS = {}
+        cls._SCRIPT_KEYS = {}
+        cls._CURRENT_SCRIPT = None
+        cls._FINGERPRINT = None
+        cls._BUILD_DIRECTORIES = []
+
+        cls._LAZY = False
+        cls._NAMESPACE_SCRIPTS = {}
+        cls._LOADED_NAMESPACES = set()
+        cls._EXPAND_ON_DEMAND = False
+        cls._SAMPLING = {}
+        cls._RESOLVED = {}
 
         cls.expanded = False
 
-        cls._DEPENDENCY_DAG = nx.DiGraph()
+        cls._DEPENDENCY_DAG = DAG()
         cls._DEPENDENCY_DAG.add_node(cls._ROOT_KEY)
 
     @classmethod
@@ -489,6 +902,13 @@ class Registry:
         cls,
         directory: Union[Path, AnyStr],
         external_directories: List[Union[AnyStr, Path]] | None = None,
+        cache: bool = False,
+        cache_directory: Union[Path, AnyStr] | None = None,
+        incremental: bool = False,
+        workers: int = 1,
+        lazy: bool = False,
+        expand: bool = True,
+        sampling: Sampling = None,
     ) -> Tuple[Set[RegistrationKey[Any]], Set[RegistrationKey[Any]]]:
         """
         Main entrypoint of cinnamon.
@@ -500,6 +920,28 @@ class Registry:
         Args:
             directory: the main directory of the project containing configurations.
             external_directories: external directories containing configurations.
+            cache: if True, the registry state is stored on disk as a snapshot after
+             the build. Subsequent builds load the snapshot instead of re-building
+             the registry, provided that no configuration script has changed.
+            cache_directory: the directory where the registry snapshot is stored.
+             Defaults to ``directory/registrations/.cache``.
+            incremental: if True, the previous registry state (either the current
+             one or the cached snapshot) is updated by re-expanding only the
+             registrations affected by changed configuration scripts.
+            workers: number of worker processes used to statically parse
+             configuration scripts and to validate configurations
+             (see ``dag_resolution()``).
+            lazy: if True, configuration scripts are only statically parsed.
+             The scripts declaring a namespace are imported and their registrations
+             expanded when a key of that namespace is first retrieved, instantiated
+             or required as a dependency (see ``load_namespaces()``).
+             ``cache`` and ``incremental`` are ignored.
+            expand: if False, registrations are not expanded during the build.
+             A registration and its dependencies are expanded when first retrieved or
+             instantiated, or via ``expand_keys()``.
+             ``cache`` and ``incremental`` are ignored.
+            sampling: variant sampling policy, either global or by registration key
+             (see ``dag_resolution()``).
 
         Returns:
             valid_keys: a ``ResolutionInfo` containing valid ``RegistrationKey``
@@ -523,280 +965,1520 @@ class Registry:
 
         directory = Path(directory).resolve()
 
-        cls.initialize()
-
-        local_namespaces, local_module_mapping = cls.parse_configuration_files(
-            directories=[directory]
-        )
-        cls.update_namespaces(
-            namespaces=local_namespaces, module_mapping=local_module_mapping
-        )
-
         if external_directories is not None:
             external_directories = cls.resolve_external_directories(
                 external_directories=external_directories
             )
-            cls._MODULES = external_directories
-            ext_namespaces, ext_module_mapping = cls.parse_configuration_files(
-                directories=external_directories
-            )
-            cls.update_namespaces(
-                namespaces=ext_namespaces, module_mapping=ext_module_mapping
-            )
+        directories = [directory] + [
+            Path(external_directory).resolve()
+            for external_directory in external_directories or []
+        ]
 
-        cls.load_registrations(directory=directory)
-        valid_keys, invalid_keys = cls.dag_resolution()
+        sampling = cls.parse_sampling(sampling=sampling)
 
-        cls._REGISTRY = {
-            key: value for key, value in cls._REGISTRY.items() if key in valid_keys
-        }
+        if lazy or not expand:
+            cls.initialize()
+            if external_directories is not None:
+                cls._MODULES = external_directories
+            cls._SAMPLING = sampling
+
+            cls._FILE_INDEX = {}
+            cls.register_namespaces(directories=directories, workers=workers)
+            cls._BUILD_DIRECTORIES = directories
+            cls._LAZY = lazy
+            cls._EXPAND_ON_DEMAND = not expand
+
+            if not lazy:
+                cls.load_registrations(directory=directory)
+                cls.check_registration_graph()
+
+            cls.expanded = True
+            return cls._VALID_KEYS, cls._INVALID_KEYS
+
+        restored = incremental and cls.is_built_from(
+            directories=directories, sampling=sampling
+        )
+        if not restored:
+            cls.initialize()
+
+            if external_directories is not None:
+                cls._MODULES = external_directories
+            cls._SAMPLING = sampling
+
+        # Directories are walked once per build
+        cls._FILE_INDEX = {}
+
+        fingerprint = None
+        if cache or incremental:
+            fingerprint = cls.fingerprint_configuration_files(directories=directories)
+
+        if cache:
+            cache_directory = (
+                Path(cache_directory)
+                if cache_directory is not None
+                else directory.joinpath("registrations", ".cache")
+            )
+            snapshot_path = cache_directory.joinpath(cls._SNAPSHOT_FILENAME)
+
+        if cache and not restored:
+            snapshot = load_snapshot(
+                filename=snapshot_path,
+                script_loader=cls.import_script,
+                fingerprint=None if incremental else fingerprint,
+            )
+            if (
+                snapshot is not None
+                and snapshot[1]["directories"] == directories
+                and snapshot[1].get("sampling", {}) == sampling
+            ):
+                logger.info(f"Loaded registry snapshot from {snapshot_path}")
+                cls.restore_state(fingerprint=snapshot[0], state=snapshot[1])
+                restored = True
+
+        if restored:
+            changed = cls._FINGERPRINT != fingerprint
+            valid_keys, invalid_keys = cls.incremental_build(
+                fingerprint=fingerprint, workers=workers
+            )
+        else:
+            changed = True
+            cls.register_namespaces(directories=directories, workers=workers)
+            cls.load_registrations(directory=directory)
+            valid_keys, invalid_keys = cls.dag_resolution(
+                workers=workers, sampling=sampling
+            )
+            cls.split_invalid_registrations(invalid_keys=invalid_keys)
+
+            cls._VALID_KEYS, cls._INVALID_KEYS = valid_keys, invalid_keys
+            cls._FINGERPRINT = fingerprint
+            cls._BUILD_DIRECTORIES = directories
+
+        if cache and changed:
+            dump_snapshot(
+                filename=snapshot_path,
+                fingerprint=fingerprint,
+                state=cls.snapshot_state(),
+                scripts=cls._SCRIPT_MODULES,
+            )
 
         return valid_keys, invalid_keys
 
     @classmethod
-    @time_it
-    def update_namespaces(
-        cls, namespaces: List[str], module_mapping: Dict[str, List[str]]
-    ):
-        for key in module_mapping:
-            if key in cls._MODULE_MAPPING:
-                raise RuntimeWarning(
-                    f"Found duplicate namespace: {key}. Overriding existing mapping..."
-                )
-
-        cls._EXP_NAMESPACES.extend(namespaces)
-        cls._MODULE_MAPPING = {**cls._MODULE_MAPPING, **module_mapping}
+    def is_built_from(
+        cls,
+        directories: List[Path],
+        sampling: Dict[RegistrationKey[Any] | None, SamplingPolicy] | None = None,
+    ) -> bool:
+        """
+        Checks if the registry has been built from the given directories
+         and variant sampling policies and can be incrementally updated.
+        """
+        return (
+            cls.expanded
+            and cls._FINGERPRINT is not None
+            and cls._BUILD_DIRECTORIES == directories
+            and cls._SAMPLING == (sampling or {})
+        )
 
     @classmethod
-    @time_it
-    def parse_configuration_files(
-        cls, directories: List[Path]
-    ) -> Tuple[List[str], Dict[str, List[str]]]:
+    def register_namespaces(cls, directories: List[Path], workers: int = 1):
         """
-        Runs a static code analyzer to inspect code scripts containing
-         cinnamon registrations with the goal of determining unique namespaces.
+        Statically parses the given directories to determine the namespaces
+         they declare.
+        The first directory is the main one, the remaining ones are external.
 
         Args:
             directories: list of directories containing cinnamon registrations.
-
-        Returns:
-            namespaces: unique list of namespaces
-            mapping: mapping from namespace to pathlib.Path directories.
+            workers: number of worker processes used for parsing.
         """
+        local_namespaces, local_module_mapping = cls.parse_configuration_files(
+            directories=directories[:1], workers=workers
+        )
+        cls.update_namespaces(
+            namespaces=local_namespaces, module_mapping=local_module_mapping
+        )
 
-        extractor = NamespaceExtractor()
-        namespaces = []
-        mapping = {}
-        for directory in directories:
-            for config_folder in directory.rglob(Registry._CONFIGURATION_FOLDER):
-                for python_script in config_folder.glob("*.py"):
-                    dir_namespaces = extractor.process(filename=python_script)
-                    namespaces.extend(dir_namespaces)
-                    mapping = {
-                        **mapping,
-                        **{namespace: directory for namespace in dir_namespaces},
-                    }
+        if len(directories) > 1:
+            ext_namespaces, ext_module_mapping = cls.parse_configuration_files(
+                directories=directories[1:], workers=workers
+            )
+            cls.update_namespaces(
+                namespaces=ext_namespaces, module_mapping=ext_module_mapping
+            )
 
-        namespaces = list(set(namespaces))
-        return namespaces, mapping
+        cls._NAMESPACE_SCRIPTS = {}
+        for directory, python_script, (namespaces, _) in cls.parse_scripts(
+            directories=directories, workers=workers
+        ):
+            for namespace in dict.fromkeys(namespaces):
+                cls._NAMESPACE_SCRIPTS.setdefault(namespace, []).append(
+                    (directory, python_script)
+                )
 
     @classmethod
-    @time_it
-    def resolve_external_directories(
-        cls,
-        external_directories: List[Union[AnyStr, Path]],
-    ) -> List[Path]:
+    def load_namespace(cls, namespace: str):
         """
-        Checks if provided directories are valid directories and exist.
+        Imports the configuration scripts declaring the given namespace and runs
+         their registration methods.
+        Already imported scripts are skipped.
+        Registrations are not expanded.
 
         Args:
-            external_directories: directories to validate.
-
-        Returns:
-            resolved_directories: validated directories as pathlib.Path instances
-
-        Raises:
-            ``InvalidDirectoryException``: if any of the provided directories is
-             not a directory or does not exist.
+            namespace: the namespace to load.
         """
+        if namespace in cls._LOADED_NAMESPACES:
+            return
+        cls._LOADED_NAMESPACES.add(namespace)
 
-        resolved_directories = []
-        for directory in external_directories:
-            directory = Path(directory)
-            if not directory.exists() or not directory.is_dir():
-                raise InvalidDirectoryException(directory=directory)
-            resolved_directories.append(directory)
+        for directory, python_script in cls._NAMESPACE_SCRIPTS.get(namespace, []):
+            if python_script.resolve() in cls._SCRIPT_KEYS:
+                continue
 
-        return resolved_directories
+            if directory.as_posix() not in sys.path:
+                sys.path.insert(0, directory.as_posix())
+
+            cls.load_script(python_script=python_script)
 
     @classmethod
     @time_it
-    def load_registrations(
-        cls,
-        directory: Union[AnyStr, Path],
-    ):
+    def load_namespaces(cls, namespaces: List[str] | None = None):
         """
-        Imports a Python's module for registration.
-        The Registry looks for ``register()`` and ``register_method()`` decorators.
-        These functions are the entry points for registrations: that is, where the
-         ``Registry`` APIs are invoked to issue registrations.
+        Loads and expands the given namespaces when the registry has been built
+         lazily (see ``build()``).
+        Registrations of already loaded namespaces are left untouched.
+        This is a no-op while namespaces are being loaded.
 
         Args:
-            directory: path of the module
-
-        Raises:
-            ``InvalidDirectoryException``: if the provided directory is not a directory
-             or does not exist.
+            namespaces: the namespaces to load. If None, all declared namespaces
+             are loaded.
         """
-        directory = Path(directory)
+        if not cls._LAZY or not cls.expanded:
+            return
 
-        if not directory.exists() or not directory.is_dir():
-            raise InvalidDirectoryException(directory=directory)
+        if namespaces is None:
+            namespaces = list(cls._NAMESPACE_SCRIPTS)
 
-        if directory in cls._EXP_MODULES:
+        namespaces = [
+            namespace
+            for namespace in namespaces
+            if namespace not in cls._LOADED_NAMESPACES
+        ]
+        if not namespaces:
             return
 
-        # Add directory to PYTHONPATH
-        sys.path.insert(0, directory.as_posix())
+        logger.info(f"Loading namespaces: {namespaces}")
 
-        cls._EXP_MODULES.add(directory)
+        # Invalid configurations are required to resolve their dependants
+        cls._REGISTRY.update(cls._INVALID_REGISTRY)
+        cls._INVALID_REGISTRY = {}
+        cls.expanded = False
 
-        with cls.REGISTRATION_CONTEXT:
-            for python_script in directory.rglob("*.py"):
-                if cls._CONFIGURATION_FOLDER not in python_script.parts:
-                    continue
+        try:
+            current_keys = set(cls._REGISTRY)
+            for namespace in namespaces:
+                cls.load_namespace(namespace=namespace)
 
-                spec = importlib.util.spec_from_file_location(
-                    name=python_script.name, location=python_script
-                )
+            cls.check_registration_graph()
 
-                if spec is None:
-                    logger.error(f"Could not load {python_script}.")
-                    raise RuntimeError(f"Could not load {python_script}.")
+            if not cls._EXPAND_ON_DEMAND:
+                for key in [key for key in cls._REGISTRY if key not in current_keys]:
+                    cls.expand_configuration(
+                        key=key,
+                        valid_key_buffer=cls._VALID_KEYS,
+                        invalid_key_buffer=cls._INVALID_KEYS,
+                    )
+        finally:
+            cls.expanded = True
+            cls.split_invalid_registrations(invalid_keys=cls._INVALID_KEYS)
 
+    @classmethod
+    def split_invalid_registrations(cls, invalid_keys: Set[RegistrationKey[Any]]):
+        """
+        Moves invalid registrations out of the registry.
+        Invalid registrations are kept aside since they are still required
+         to re-expand their dependants during incremental builds.
+
+        Args:
+            invalid_keys: the set of invalid registration keys
+        """
+        for key in invalid_keys:
+            if key in cls._REGISTRY:
+                cls._INVALID_REGISTRY[key] = cls._REGISTRY.pop(key)
+
+    @classmethod
+    @time_it
+    def incremental_build(
+        cls, fingerprint: Dict[str, str], workers: int = 1
+    ) -> Tuple[Set[RegistrationKey[Any]], Set[RegistrationKey[Any]]]:
+        """
+        Updates the built registry according to configuration scripts that changed
+         since the previous build.
+        Registrations issued by changed scripts and all their ancestors in the
+         dependency DAG are invalidated, re-registered and re-expanded.
+        The remaining registry state is left untouched.
+
+        Args:
+            fingerprint: the current content hashes of configuration scripts.
+            workers: number of worker processes used to statically parse
+             configuration scripts.
+
+        Returns:
+            valid_keys: the set of valid registration keys
+            invalid_keys: the set of invalid registration keys
+        """
+        previous_fingerprint = cls._FINGERPRINT
+        changed_scripts = {
+            Path(script)
+            for script in set(previous_fingerprint).union(fingerprint)
+            if previous_fingerprint.get(script) != fingerprint.get(script)
+        }
+        cls._FINGERPRINT = fingerprint
+
+        if not changed_scripts:
+            return cls._VALID_KEYS, cls._INVALID_KEYS
+
+        logger.info(f"Found {len(changed_scripts)} changed configuration scripts.")
+
+        changed_keys = set()
+        for script in changed_scripts:
+            changed_keys.update(cls._SCRIPT_KEYS.get(script, set()))
+
+        affected_keys = set(changed_keys)
+        for key in changed_keys:
+            if key not in cls._DEPENDENCY_DAG:
+                continue
+            affected_keys.update(cls.variant_keys(key=key))
+            for node in [key] + cls.variant_keys(key=key):
+                affected_keys.update(cls._DEPENDENCY_DAG.ancestors(node))
+        affected_keys.discard(cls._ROOT_KEY)
+
+        affected_scripts = {
+            script
+            for script, keys in cls._SCRIPT_KEYS.items()
+            if not keys.isdisjoint(affected_keys)
+        }.union(changed_scripts)
+
+        invalidated_keys = set()
+        for script in affected_scripts:
+            invalidated_keys.update(cls._SCRIPT_KEYS.pop(script, set()))
+        cls.invalidate(keys=invalidated_keys)
+
+        # Invalid configurations are required to resolve their dependants
+        cls._REGISTRY.update(cls._INVALID_REGISTRY)
+        cls._INVALID_REGISTRY = {}
+        cls.REGISTRATION_METHODS = {}
+        cls.expanded = False
+
+        cls._MODULE_MAPPING = {}
+        cls._EXP_NAMESPACES = []
+        cls.register_namespaces(directories=cls._BUILD_DIRECTORIES, workers=workers)
+
+        for script in sorted(affected_scripts):
+            if script.as_posix() not in fingerprint:
+                continue
+
+            if not any(directory in script.parents for directory in cls._EXP_MODULES):
+                continue
+
+            cls.load_script(python_script=script)
+
+        cls.check_registration_graph()
+
+        for script in sorted(affected_scripts):
+            for key in cls._SCRIPT_KEYS.get(script, set()):
+                cls.expand_configuration(
+                    key=key,
+                    valid_key_buffer=cls._VALID_KEYS,
+                    invalid_key_buffer=cls._INVALID_KEYS,
+                )
+
+        cls.expanded = True
+        cls.split_invalid_registrations(invalid_keys=cls._INVALID_KEYS)
+
+        return cls._VALID_KEYS, cls._INVALID_KEYS
+
+    @classmethod
+    def variant_keys(cls, key: RegistrationKey[Any]) -> List[RegistrationKey[Any]]:
+        """
+        Lists the variant keys generated from the given key during expansion.
+        """
+        return cls._DEPENDENCY_DAG.successors(key, edge_type="variant")
+
+    @classmethod
+    def dependencies(cls, key: Registration) -> List[RegistrationKey[Any]]:
+        """
+        Lists the transitive dependencies of a registration, each one after its own
+         dependencies.
+        Queries are answered by a reachability index over the dependency DAG (see
+         ``DAG.reachability()``), which is rebuilt only after the DAG changes.
+
+        Args:
+            key: the registration key.
+
+        Returns:
+            The registration keys the given key transitively depends on.
+
+        Raises:
+            ``NotRegisteredException``: if the key is not in the dependency DAG.
+        """
+        key = RegistrationKey.parse(registration_key=key)
+        cls.load_namespaces(namespaces=[key.namespace])
+        if key not in cls._DEPENDENCY_DAG:
+            raise NotRegisteredException(registration_key=key)
+
+        return cls._DEPENDENCY_DAG.reachability(edge_type="child").reachable(key)
+
+    @classmethod
+    def dependents(cls, key: Registration) -> List[RegistrationKey[Any]]:
+        """
+        Lists the registrations transitively depending on a registration (e.g., the
+         runnable keys to re-run once a shared dependency changes), each one after
+         its own dependencies.
+        Expanded variants are listed as well, since they depend on the same keys of
+         their parent registration.
+        Queries are answered by a reachability index over the dependency DAG (see
+         ``DAG.reachability()``), which is rebuilt only after the DAG changes.
+
+        Args:
+            key: the registration key.
+
+        Returns:
+            The registration keys transitively depending on the given key.
+
+        Raises:
+            ``NotRegisteredException``: if the key is not in the dependency DAG.
+        """
+        key = RegistrationKey.parse(registration_key=key)
+        # Dependants may be declared in any namespace
+        cls.load_namespaces()
+        if key not in cls._DEPENDENCY_DAG:
+            raise NotRegisteredException(registration_key=key)
+
+        index = cls._DEPENDENCY_DAG.reachability(edge_type="child", reverse=True)
+        return [
+            dependent
+            for dependent in reversed(index.reachable(key))
+            if dependent is not cls._ROOT_KEY
+        ]
+
+    @classmethod
+    def invalidate(cls, keys: Set[RegistrationKey[Any]]):
+        """
+        Removes the given keys, along with their variants, from the registry
+         and the dependency DAG.
+
+        Args:
+            keys: the set of registration keys to remove.
+        """
+        owned_keys = set().union(*cls._SCRIPT_KEYS.values())
+
+        # Resolved dependants of removed keys are stale
+        cls._RESOLVED = {}
+
+        removed_keys = set()
+        for key in keys:
+            removed_keys.add(key)
+            if key in cls._DEPENDENCY_DAG:
+                removed_keys.update(
+                    variant_key
+                    for variant_key in cls.variant_keys(key=key)
+                    if variant_key not in owned_keys
+                )
+
+        orphan_candidates = set()
+        for key in removed_keys:
+            cls._REGISTRY.pop(key, None)
+            cls._INVALID_REGISTRY.pop(key, None)
+            cls._VALID_KEYS.discard(key)
+            cls._INVALID_KEYS.discard(key)
+            cls._VALIDATION_ERRORS.pop(key, None)
+            if key in cls._DEPENDENCY_DAG:
+                orphan_candidates.update(cls._DEPENDENCY_DAG.successors(key))
+        cls._DEPENDENCY_DAG.remove_nodes_from(removed_keys)
+
+        orphan_keys = []
+        for node in orphan_candidates.difference(removed_keys):
+            if cls._DEPENDENCY_DAG.in_degree(node):
+                continue
+
+            if node in cls._REGISTRY or node in cls._INVALID_REGISTRY:
+                cls._DEPENDENCY_DAG.add_edge(cls._ROOT_KEY, node, edge_type="child")
+            else:
+                orphan_keys.append(node)
+        cls._DEPENDENCY_DAG.remove_nodes_from(orphan_keys)
+
+    @classmethod
+    def snapshot_state(cls) -> Dict[str, Any]:
+        """
+        Collects the registry state to be stored in a snapshot.
+
+        Returns:
+            A dictionary containing the registry state.
+        """
+        return {
+            "directories": cls._BUILD_DIRECTORIES,
+            "registry": cls._REGISTRY,
+            "invalid_registry": cls._INVALID_REGISTRY,
+            "dag": cls._DEPENDENCY_DAG,
+            "valid_keys": cls._VALID_KEYS,
+            "invalid_keys": cls._INVALID_KEYS,
+            "module_mapping": cls._MODULE_MAPPING,
+            "namespaces": cls._EXP_NAMESPACES,
+            "modules": cls._EXP_MODULES,
+            "script_keys": cls._SCRIPT_KEYS,
+            "sampling": cls._SAMPLING,
+        }
+
+    @classmethod
+    def restore_state(cls, fingerprint: Dict[str, str], state: Dict[str, Any]):
+        """
+        Restores the registry from a snapshot state (see ``snapshot_state()``).
+
+        Args:
+            fingerprint: the content hashes of configuration scripts the snapshot
+             has been built from.
+            state: the registry state stored in a snapshot.
+        """
+        cls._BUILD_DIRECTORIES = state["directories"]
+        cls._REGISTRY = IndexedRegistry(state["registry"])
+        cls._INVALID_REGISTRY = state["invalid_registry"]
+        cls._DEPENDENCY_DAG = state["dag"]
+        cls._RESOLVED = {}
+        cls._VALID_KEYS = state["valid_keys"]
+        cls._INVALID_KEYS = state["invalid_keys"]
+        cls._VALIDATION_ERRORS = {}
+        cls._MODULE_MAPPING = state["module_mapping"]
+        cls._EXP_NAMESPACES = state["namespaces"]
+        cls._EXP_MODULES = state["modules"]
+        cls._SCRIPT_KEYS = state["script_keys"]
+        cls._SAMPLING = state.get("sampling", {})
+        cls._FINGERPRINT = fingerprint
+
+        for directory in cls._EXP_MODULES:
+            if directory.as_posix() not in sys.path:
+                sys.path.insert(0, directory.as_posix())
+
+        cls.expanded = True
+
+    @classmethod
+    def file_index(cls, directory: Union[AnyStr, Path]) -> FileIndex:
+        """
+        Retrieves the index of configuration scripts of a directory.
+        The directory is walked only the first time it is requested during a build:
+         subsequent static parsing, fingerprinting and module loading share the same
+         index.
+        Folders and files listed in the directory's ``.cinnamonignore`` file are
+         skipped.
+
+        Args:
+            directory: the directory to index.
+
+        Returns:
+            The ``FileIndex`` of the directory.
+        """
+        directory = Path(directory).resolve()
+        if directory not in cls._FILE_INDEX:
+            cls._FILE_INDEX[directory] = FileIndex(
+                directory=directory, configuration_folder=cls._CONFIGURATION_FOLDER
+            )
+        return cls._FILE_INDEX[directory]
+
+    @classmethod
+    def configuration_scripts(cls, directory: Path) -> List[Path]:
+        """
+        Lists all Python scripts of a directory that belong to a
+         ``configurations`` folder.
+
+        Args:
+            directory: the directory to inspect.
+
+        Returns:
+            The sorted list of configuration scripts.
+        """
+        return cls.file_index(directory=directory).scripts
+
+    @classmethod
+    @time_it
+    def fingerprint_configuration_files(cls, directories: List[Path]) -> Dict[str, str]:
+        """
+        Computes the content hashes of all configuration scripts in the given
+         directories.
+
+        Args:
+            directories: list of directories containing cinnamon registrations.
+
+        Returns:
+            A mapping from configuration script path to its content hash.
+        """
+        fingerprint = {}
+        for directory in directories:
+            index = cls.file_index(directory=directory)
+            for python_script in index:
+                fingerprint[python_script.as_posix()] = index.file_hash(python_script)
+        return dict(sorted(fingerprint.items()))
+
+    @classmethod
+    def import_script(cls, python_script: Path) -> types.ModuleType:
+        """
+        Imports a configuration script as a module without issuing registrations.
+        Already imported scripts are not executed again.
+
+        Args:
+            python_script: path of the configuration script
+
+        Returns:
+            The imported module
+        """
+        if python_script not in cls._SCRIPT_MODULES:
+            cls._SCRIPT_MODULES[python_script] = cls._execute_script(
+                python_script=python_script
+            )
+        return cls._SCRIPT_MODULES[python_script]
+
+    @classmethod
+    def _execute_script(cls, python_script: Path) -> types.ModuleType:
+        spec = importlib.util.spec_from_file_location(
+            name=python_script.name, location=python_script
+        )
+
+        if spec is None:
+            logger.error(f"Could not load {python_script}.")
+            raise RuntimeError(f"Could not load {python_script}.")
+
+        try:
+            module = importlib.util.module_from_spec(spec=spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            logger.error(f"Failed to execute module {python_script.name}. {e}")
+            raise RuntimeError(f"Failed to execute module {python_script.name}. {e}")
+
+        return module
+
+    @classmethod
+    @time_it
+    def update_namespaces(
+        cls, namespaces: List[str], module_mapping: Dict[str, List[str]]
+    ):
+        for key in module_mapping:
+            if key in cls._MODULE_MAPPING:
+                raise RuntimeWarning(
+                    f"Found duplicate namespace: {key}. Overriding existing mapping..."
+                )
+
+        cls._EXP_NAMESPACES.extend(namespaces)
+        cls._MODULE_MAPPING = {**cls._MODULE_MAPPING, **module_mapping}
+
+    @classmethod
+    @time_it
+    def parse_scripts(
+        cls, directories: List[Path], workers: int = 1
+    ) -> List[Tuple[Path, Path, Tuple[List[str], List[CatalogEntry]]]]:
+        """
+        Statically parses the configuration scripts of the given directories.
+        Parsing results are cached by script content hash: only new or edited
+         scripts are parsed.
+        If ``workers > 1``, scripts are parsed in parallel by a process pool.
+
+        Args:
+            directories: list of directories containing cinnamon registrations.
+            workers: number of worker processes used for parsing.
+
+        Returns:
+            A list of (directory, script, (namespaces, registrations)) tuples, in
+             script order.
+        """
+        scripts = []
+        for directory in directories:
+            index = cls.file_index(directory=directory)
+            scripts.extend(
+                (directory, python_script, index.file_hash(python_script))
+                for python_script in index
+            )
+
+        to_parse = {}
+        for _, python_script, file_hash in scripts:
+            if file_hash not in cls._PARSE_CACHE:
+                to_parse.setdefault(file_hash, python_script)
+
+        if workers > 1 and len(to_parse) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = executor.map(
+                    extract_registrations,
+                    to_parse.values(),
+                    chunksize=max(1, len(to_parse) // (workers * 4)),
+                )
+                cls._PARSE_CACHE.update(zip(to_parse.keys(), parsed))
+        else:
+            for file_hash, python_script in to_parse.items():
+                cls._PARSE_CACHE[file_hash] = extract_registrations(
+                    filename=python_script
+                )
+
+        return [
+            (directory, python_script, cls._PARSE_CACHE[file_hash])
+            for directory, python_script, file_hash in scripts
+        ]
+
+    @classmethod
+    @time_it
+    def parse_configuration_files(
+        cls, directories: List[Path], workers: int = 1
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Runs a static code analyzer to inspect code scripts containing
+         cinnamon registrations with the goal of determining unique namespaces.
+        The returned mapping does not depend on the number of workers.
+
+        Args:
+            directories: list of directories containing cinnamon registrations.
+            workers: number of worker processes used for parsing.
+
+        Returns:
+            namespaces: unique list of namespaces
+            mapping: mapping from namespace to pathlib.Path directories.
+        """
+
+        # Merging follows script order: the mapping is the same as the serial one
+        namespaces = []
+        mapping = {}
+        for directory, _, (dir_namespaces, _) in cls.parse_scripts(
+            directories=directories, workers=workers
+        ):
+            namespaces.extend(dir_namespaces)
+            mapping.update({namespace: directory for namespace in dir_namespaces})
+
+        namespaces = list(set(namespaces))
+        return namespaces, mapping
+
+    @classmethod
+    @time_it
+    def catalog(
+        cls,
+        directory: Union[Path, AnyStr],
+        external_directories: List[Union[AnyStr, Path]] | None = None,
+        workers: int = 1,
+    ) -> Dict[RegistrationKey[Any], CatalogEntry]:
+        """
+        Lists the registrations declared in the given directories without
+         executing any configuration script.
+        The catalog is built via static code analysis: only registrations whose
+         arguments are literals are listed, and variants are not included.
+        The registry state is not modified: listed keys carry no special tags, and
+         runnable registrations are the ones whose entry has a ``run_method``.
+
+        Args:
+            directory: the main directory of the project containing configurations.
+            external_directories: external directories containing configurations.
+            workers: number of worker processes used to parse configuration scripts.
+
+        Returns:
+            A mapping from ``RegistrationKey`` to its ``CatalogEntry``, ordered by
+             script.
+        """
+        directories = [Path(directory).resolve()]
+        if external_directories is not None:
+            directories += [
+                external_directory.resolve()
+                for external_directory in cls.resolve_external_directories(
+                    external_directories=external_directories
+                )
+            ]
+
+        cls._FILE_INDEX = {}
+
+        catalog = {}
+        for _, python_script, (_, entries) in cls.parse_scripts(
+            directories=directories, workers=workers
+        ):
+            for entry in entries:
+                key = RegistrationKey[Any](
+                    name=entry.name,
+                    tags=entry.tags,
+                    namespace=entry.namespace,
+                )
+                if key not in catalog:
+                    catalog[key] = replace(entry, filename=python_script)
+
+        return catalog
+
+    @classmethod
+    @time_it
+    def resolve_external_directories(
+        cls,
+        external_directories: List[Union[AnyStr, Path]],
+    ) -> List[Path]:
+        """
+        Checks if provided directories are valid directories and exist.
+
+        Args:
+            external_directories: directories to validate.
+
+        Returns:
+            resolved_directories: validated directories as pathlib.Path instances
+
+        Raises:
+            ``InvalidDirectoryException``: if any of the provided directories is
+             not a directory or does not exist.
+        """
+
+        resolved_directories = []
+        for directory in external_directories:
+            directory = Path(directory)
+            if not directory.exists() or not directory.is_dir():
+                raise InvalidDirectoryException(directory=directory)
+            resolved_directories.append(directory)
+
+        return resolved_directories
+
+    @classmethod
+    @time_it
+    def load_registrations(
+        cls,
+        directory: Union[AnyStr, Path],
+    ):
+        """
+        Imports a Python's module for registration.
+        The Registry looks for ``register()`` and ``register_method()`` decorators.
+        These functions are the entry points for registrations: that is, where the
+         ``Registry`` APIs are invoked to issue registrations.
+
+        Args:
+            directory: path of the module
+
+        Raises:
+            ``InvalidDirectoryException``: if the provided directory is not a directory
+             or does not exist.
+        """
+        directory = Path(directory)
+
+        if not directory.exists() or not directory.is_dir():
+            raise InvalidDirectoryException(directory=directory)
+
+        directory = directory.resolve()
+        if directory in cls._EXP_MODULES:
+            return
+
+        # Add directory to PYTHONPATH
+        sys.path.insert(0, directory.as_posix())
+
+        cls._EXP_MODULES.add(directory)
+
+        for python_script in cls.configuration_scripts(directory=directory):
+            cls.load_script(python_script=python_script)
+
+    @classmethod
+    def load_script(cls, python_script: Path):
+        """
+        Imports a configuration script and runs its registration methods.
+        Keys registered by the script are tracked to support incremental builds.
+
+        Args:
+            python_script: path of the configuration script
+        """
+        python_script = python_script.resolve()
+
+        parent_script = cls._CURRENT_SCRIPT
+        cls._CURRENT_SCRIPT = python_script
+        cls._SCRIPT_KEYS[python_script] = set()
+
+        try:
+            with cls.REGISTRATION_CONTEXT:
                 # import module and run registration methods
                 current_keys = set(cls.REGISTRATION_METHODS.keys())
 
-                try:
-                    module = importlib.util.module_from_spec(spec=spec)
-                    spec.loader.exec_module(module)
-                except Exception as e:
-                    logger.error(f"Failed to execute module {python_script.name}. {e}")
-                    raise RuntimeError(
-                        f"Failed to execute module {python_script.name}. {e}"
+                module = cls._execute_script(python_script=python_script)
+                cls._SCRIPT_MODULES[python_script] = module
+
+                new_keys = [
+                    key for key in cls.REGISTRATION_METHODS if key not in current_keys
+                ]
+
+                module_dict = module.__dict__
+                for key in new_keys:
+                    key_method = cls.REGISTRATION_METHODS[key]
+                    if isinstance(key_method, BufferedRegistration):
+                        qual_parts = key_method.func.__qualname__.split(".")
+                        method_name = qual_parts[-1]
+                        class_method_name = qual_parts[-2]
+
+                        class_method = module_dict[class_method_name]
+
+                        Registry.register_configuration(
+                            config=getattr(class_method, method_name)(),
+                            name=key_method.name,
+                            tags=key_method.tags,
+                            namespace=key_method.namespace,
+                            component=key_method.component,
+                            run_method=key_method.run_method,
+                        )
+                    else:
+                        cls.REGISTRATION_METHODS[key]()
+        finally:
+            cls._CURRENT_SCRIPT = parent_script
+
+    @classmethod
+    def special_tags(
+        cls,
+        registration_key: RegistrationKey[Any],
+    ) -> frozenset:
+        """
+        Retrieves the special tags of a registered ``RegistrationKey`` from its
+         ``ConfigurationInfo`` (see ``ConfigurationInfo.special_tags``).
+
+        Args:
+            registration_key: the ``RegistrationKey`` instance.
+
+        Returns:
+            The special tags of the key, empty if the key is not registered.
+        """
+        config_info = cls._REGISTRY.get(registration_key)
+        if config_info is None:
+            config_info = cls._INVALID_REGISTRY.get(registration_key)
+
+        if config_info is None:
+            return RegistrationKey.EMPTY_TAGS
+        return config_info.special_tags
+
+    @classmethod
+    def in_registry(
+        cls,
+        registration_key: RegistrationKey[T],
+    ) -> bool:
+        return registration_key in cls._REGISTRY
+
+    @classmethod
+    def is_namespace_covered(cls, registration_key: RegistrationKey[T]) -> bool:
+        return registration_key.namespace in cls._EXP_NAMESPACES
+
+    @classmethod
+    def in_graph(
+        cls,
+        registration_key: Registration | None = None,
+        name: str | None = None,
+        namespace: str | None = None,
+        tags: Tags = None,
+    ) -> bool:
+        registration_key = RegistrationKey.parse(
+            registration_key=registration_key, name=name, tags=tags, namespace=namespace
+        )
+        return registration_key in cls._DEPENDENCY_DAG
+
+    # DAG Resolution APIs
+
+    @classmethod
+    def check_registration_graph(cls) -> bool:
+        """
+        Checks if the dependency DAG is valid.
+
+        Raises:
+           ``AlreadyExpandedException``: if the dependency DAG has been expanded.
+
+           ``NotADAGException``: if the dependency DAG is not a DAG.
+
+           ``DisconnectedGraphException``: if, for some reason, the dependency DAG
+            contains disconnected nodes.
+           This should never happen via cinnamon APIs, unless some manual intervention
+            on the dependency DAG is carried out.
+        """
+
+        if cls.expanded:
+            raise AlreadyExpandedException()
+
+        # check if DAG is DAG
+        if not cls._DEPENDENCY_DAG.is_acyclic():
+            raise NotADAGException(edges=cls._DEPENDENCY_DAG.edges)
+
+        # check if isolated nodes
+        isolated_nodes = cls._DEPENDENCY_DAG.isolates()
+        if len(isolated_nodes) > 0 and len(cls._DEPENDENCY_DAG.nodes) > 1:
+            raise DisconnectedGraphException(nodes=isolated_nodes)
+
+        return True
+
+    @classmethod
+    @time_it
+    def dag_resolution(
+        cls,
+        workers: int = 1,
+        sampling: Sampling = None,
+        progress: ExpansionProgress | None = None,
+    ) -> Tuple[Set[RegistrationKey[Any]], Set[RegistrationKey[Any]]]:
+        """
+        Expands and resolves dependencies in registration DAG.
+        The dependency traversal is done bottom-up, level by level
+         (see ``expand_levels()``).
+        Expanded keys are retrieved, and built for full validation.
+        If ``workers > 1``, conditions of independent configurations are validated
+         in parallel by a process pool (see ``parallel_expansion()``).
+        The resulting valid and invalid keys do not depend on the number of workers.
+
+        If a ``sampling`` policy is given, only the variant combinations it selects
+         are expanded, registered and validated (see ``sample_variants()``).
+        A policy can be given for all registrations or by registration key, in which
+         case the ``None`` key sets the policy of the remaining registrations.
+
+        Args:
+            workers: number of worker processes used for validation.
+            sampling: variant sampling policy, either global or by registration key.
+            progress: optional callback, called after each expanded level with the
+             level index, the number of levels and the keys expanded in the level.
+
+        Returns:
+            valid_keys: the set of valid registration keys
+            invalid_keys:the set of invalid registration keys
+        """
+
+        cls.check_registration_graph()
+        if sampling is not None:
+            cls._SAMPLING = cls.parse_sampling(sampling=sampling)
+
+        # Variants expansion doesn't change the topology of the graph
+        valid_key_buffer: Set[RegistrationKey[Any]] = set()
+        invalid_key_buffer: Set[RegistrationKey[Any]] = set()
+        logger.info(f"Resolving {len(cls._REGISTRY)} configurations...")
+        keys = list(cls._DEPENDENCY_DAG.successors(cls._ROOT_KEY))
+        if workers > 1:
+            cls.parallel_expansion(
+                keys=keys,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+                workers=workers,
+                progress=progress,
+            )
+        else:
+            cls.expand_levels(
+                keys=keys,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+                progress=progress,
+            )
+
+        cls.expanded = True
+
+        return valid_key_buffer, invalid_key_buffer
+
+    @classmethod
+    @time_it
+    def expand_keys(
+        cls,
+        keys: List[Registration] | None = None,
+        names: Union[List[str], str] | None = None,
+        namespaces: Union[List[str], str] | None = None,
+        tags: Tags = None,
+    ) -> Tuple[Set[RegistrationKey[Any]], Set[RegistrationKey[Any]]]:
+        """
+        Expands and resolves the given registrations and their transitive
+         dependencies only.
+        Registrations can be specified either directly or via ``retrieve_keys()``
+         filters.
+        Expansion results are cached: already expanded registrations are not
+         expanded again and subsequent calls extend the current expansion.
+
+        Args:
+            keys: the registration keys to expand.
+            names: a name or a list of names to filter registration keys.
+            namespaces: a namespace or a list of namespaces to filter registration keys.
+            tags: a tag set to filter registration keys.
+
+        Returns:
+            valid_keys: the set of valid keys among the expanded registrations and
+             their variants
+            invalid_keys: the set of invalid keys among the expanded registrations and
+             their variants
+
+        Raises:
+            ``NotExpandedException``: if the registry has not been built yet.
+
+            ``NotRegisteredException``: if one of the given keys is not registered.
+        """
+        if not cls.expanded:
+            raise NotExpandedException()
+
+        if keys is None:
+            keys = cls.retrieve_keys(names=names, namespaces=namespaces, tags=tags)
+        else:
+            keys = [RegistrationKey.parse(registration_key=key) for key in keys]
+            cls.load_namespaces(namespaces=list({key.namespace for key in keys}))
+
+        # Variants are expanded by their parent registration
+        targets = {}
+        for key in keys:
+            parents = []
+            if key in cls._DEPENDENCY_DAG:
+                parents = cls._DEPENDENCY_DAG.predecessors(key, edge_type="variant")
+            targets.update(dict.fromkeys(parents or [key]))
+
+        # Invalid configurations are required to resolve their dependants
+        cls._REGISTRY.update(cls._INVALID_REGISTRY)
+        cls._INVALID_REGISTRY = {}
+        cls.expanded = False
+
+        valid_keys = set()
+        try:
+            for key in targets:
+                valid_keys.update(
+                    cls.expand_configuration(
+                        key=key,
+                        valid_key_buffer=cls._VALID_KEYS,
+                        invalid_key_buffer=cls._INVALID_KEYS,
                     )
+                )
+        finally:
+            cls.expanded = True
+            cls.split_invalid_registrations(invalid_keys=cls._INVALID_KEYS)
+
+        invalid_keys = set()
+        for key in targets:
+            invalid_keys.update(
+                set(cls.variant_keys(key=key))
+                .union({key})
+                .intersection(cls._INVALID_KEYS)
+            )
+
+        return valid_keys, invalid_keys
+
+    @classmethod
+    def load_key(cls, registration_key: RegistrationKey[Any]):
+        """
+        Makes a registration available for retrieval when the registry has been
+         built lazily or without expansion (see ``build()``).
+        If the key is not registered, it may be the variant of a not yet expanded
+         registration: registrations with same name and namespace, and a subset of
+         its tags, are expanded.
+
+        Args:
+            registration_key: the registration key to load.
+        """
+        cls.load_namespaces(namespaces=[registration_key.namespace])
+
+        if not cls._EXPAND_ON_DEMAND or not cls.expanded:
+            return
+
+        if registration_key in cls._REGISTRY:
+            candidates = [registration_key]
+        else:
+            candidates = [
+                key
+                for key in cls._REGISTRY
+                if key.name == registration_key.name
+                and key.namespace == registration_key.namespace
+                and key.tags.issubset(registration_key.tags)
+            ]
+
+        candidates = [
+            key for key in candidates if not cls._REGISTRY[key].config.expanded
+        ]
+        if candidates:
+            cls.expand_keys(keys=candidates)
+
+    @classmethod
+    def dependency_levels(
+        cls, keys: List[RegistrationKey[Any]]
+    ) -> List[List[RegistrationKey[Any]]]:
+        """
+        Groups the given keys and their transitive dependencies by depth in the
+         dependency DAG.
+        Keys in the same level do not depend on each other: the first level contains
+         keys without dependencies, and each following level only depends on
+         previous ones.
+        Only the sub-graph reachable from the given keys is visited, iteratively:
+         dependency chains are not bounded by the interpreter recursion limit.
+
+        Args:
+            keys: the registration keys to group.
+
+        Returns:
+            The list of levels, each sorted by key string format.
+
+        Raises:
+            ``NotADAGException``: if the visited sub-graph contains a cycle.
+        """
+        dag = cls._DEPENDENCY_DAG
+
+        # Post-order traversal: dependencies are assigned a depth before their
+        # dependants, which are visited again once all their children are done
+        depths: Dict[RegistrationKey[Any], int] = {}
+        visiting = set()
+        stack = [(key, None) for key in reversed(keys)]
+        while stack:
+            node, children = stack.pop()
+            if node in depths:
+                continue
+
+            if children is not None:
+                visiting.discard(node)
+                depths[node] = 1 + max(
+                    (depths[child] for child in children), default=-1
+                )
+                continue
 
-                new_keys = set(cls.REGISTRATION_METHODS.keys()).difference(current_keys)
+            if node in visiting:
+                raise NotADAGException(edges=dag.edges)
+            visiting.add(node)
 
-                module_dict = module.__dict__
-                for key in new_keys:
-                    key_method = cls.REGISTRATION_METHODS[key]
-                    if isinstance(key_method, BufferedRegistration):
-                        qual_parts = key_method.func.__qualname__.split(".")
-                        method_name = qual_parts[-1]
-                        class_method_name = qual_parts[-2]
+            children = dag.successors(node, edge_type="child")
+            stack.append((node, children))
+            stack.extend((child, None) for child in children if child not in depths)
 
-                        class_method = module_dict[class_method_name]
+        levels = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+        for node, depth in depths.items():
+            levels[depth].append(node)
 
-                        Registry.register_configuration(
-                            config=getattr(class_method, method_name)(),
-                            name=key_method.name,
-                            tags=key_method.tags,
-                            namespace=key_method.namespace,
-                            component=key_method.component,
-                            run_method=key_method.run_method,
-                        )
-                    else:
-                        cls.REGISTRATION_METHODS[key]()
+        return [sorted(level, key=str) for level in levels]
 
     @classmethod
-    def in_registry(
+    @time_it
+    def parallel_expansion(
         cls,
-        registration_key: RegistrationKey[T],
-    ) -> bool:
-        return registration_key in cls._REGISTRY
+        keys: List[RegistrationKey[Any]],
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+        workers: int,
+        progress: ExpansionProgress | None = None,
+    ):
+        """
+        Expands the given keys level by level in the dependency DAG
+         (see ``expand_levels()``).
+        Within each level, variants are generated and registered in key order by the
+         current process, while their conditions are validated in parallel by a
+         process pool.
+        Validation results are merged in the same order: the outcome is the same
+         as the one of ``expand_configuration()``.
+        Configurations that cannot be sent to worker processes are validated by the
+         current process.
+
+        Args:
+            keys: the registration keys to expand.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+            workers: number of worker processes.
+            progress: optional callback, called after each expanded level.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            cls.expand_levels(
+                keys=keys,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+                executor=executor,
+                workers=workers,
+                progress=progress,
+            )
 
     @classmethod
-    def is_namespace_covered(cls, registration_key: RegistrationKey[T]) -> bool:
-        return registration_key.namespace in cls._EXP_NAMESPACES
+    def expand_levels(
+        cls,
+        keys: List[RegistrationKey[Any]],
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+        executor: ProcessPoolExecutor | None = None,
+        workers: int = 1,
+        progress: ExpansionProgress | None = None,
+    ):
+        """
+        Expands the given keys and their transitive dependencies without recursion,
+         walking the dependency DAG bottom-up one level at a time
+         (see ``dependency_levels()``).
+        When a level is expanded, all the dependencies of its keys have already been
+         expanded: each level is expanded as a single batch (see ``expand_level()``).
+        Already expanded keys are skipped.
+
+        Args:
+            keys: the registration keys to expand.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+            executor: optional process pool validating configuration conditions.
+            workers: number of worker processes of ``executor``.
+            progress: optional callback, called after each expanded level with the
+             level index, the number of levels and the keys expanded in the level.
+        """
+        levels = cls.dependency_levels(keys=keys)
+        for depth, level in enumerate(levels):
+            level = [
+                key
+                for key in level
+                if not cls.retrieve_configuration_info(
+                    registration_key=key
+                ).config.expanded
+            ]
+            logger.debug(
+                f"Expanding level {depth + 1}/{len(levels)}:"
+                f" {len(level)} configurations"
+            )
+            cls.expand_level(
+                keys=level,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+                executor=executor,
+                workers=workers,
+            )
+
+            if progress is not None:
+                progress(depth, len(levels), level)
 
     @classmethod
-    def in_graph(
+    def expand_level(
         cls,
-        registration_key: Registration | None = None,
-        name: str | None = None,
-        namespace: str | None = None,
-        tags: Tags = None,
-    ) -> bool:
-        registration_key = RegistrationKey.parse(
-            registration_key=registration_key, name=name, tags=tags, namespace=namespace
+        keys: List[RegistrationKey[Any]],
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+        executor: ProcessPoolExecutor | None = None,
+        workers: int = 1,
+    ):
+        """
+        Expands a batch of keys whose dependencies are already expanded, and
+         validates their variants, in key order.
+
+        Args:
+            keys: the registration keys to expand.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+            executor: optional process pool validating configuration conditions.
+             If None, conditions are validated by the current process.
+            workers: number of worker processes of ``executor``.
+        """
+        jobs = itertools.chain.from_iterable(
+            cls.expand_structure(
+                key=key,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+            )
+            for key in keys
         )
-        return registration_key in cls._DEPENDENCY_DAG
 
-    # DAG Resolution APIs
+        if executor is None:
+            for job_key, resolved_config in jobs:
+                validation_result = cls.validate_dependencies(
+                    key=job_key,
+                    config=resolved_config,
+                    valid_key_buffer=valid_key_buffer,
+                    invalid_key_buffer=invalid_key_buffer,
+                )
+                if validation_result.passed:
+                    validation_result = resolved_config.validate_conditions(
+                        strict=False, recursive=False
+                    )
+
+                cls.store_validation_result(
+                    key=job_key,
+                    validation_result=validation_result,
+                    valid_key_buffer=valid_key_buffer,
+                    invalid_key_buffer=invalid_key_buffer,
+                )
+            return
+
+        # Bounded chunks: the variant space is never materialized
+        for chunk in batched(jobs, cls.VARIANT_CHUNK_SIZE):
+            cls.validate_chunk(
+                jobs=chunk,
+                executor=executor,
+                workers=workers,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+            )
 
     @classmethod
-    def check_registration_graph(cls) -> bool:
+    def validate_chunk(
+        cls,
+        jobs: Tuple[Tuple[RegistrationKey[Any], cinnamon.configuration.Configuration]],
+        executor: ProcessPoolExecutor,
+        workers: int,
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+    ):
         """
-        Checks if the dependency DAG is valid.
+        Validates resolved configurations via a process pool and stores results
+         in the given order.
+        Dependencies are validated by the current process (see
+         ``validate_dependencies()``).
 
-        Raises:
-           ``AlreadyExpandedException``: if the dependency DAG has been expanded.
+        Args:
+            jobs: (key, resolved configuration) pairs to validate.
+            executor: the process pool.
+            workers: number of worker processes.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+        """
+        payloads = []
+        dependency_results = []
+        for job_key, resolved_config in jobs:
+            dependency_result = cls.validate_dependencies(
+                key=job_key,
+                config=resolved_config,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+            )
+            dependency_results.append(dependency_result)
+            if not dependency_result.passed:
+                payloads.append(None)
+                continue
 
-           ``NotADAGException``: if the dependency DAG is not a DAG.
+            try:
+                payloads.append(serialize(resolved_config, scripts=cls._SCRIPT_MODULES))
+            except Exception as e:
+                logger.debug(f"Validating {job_key} locally. {e}")
+                payloads.append(None)
+
+        remote_payloads = [payload for payload in payloads if payload is not None]
+        remote_results = iter(
+            executor.map(
+                _validate_payload,
+                remote_payloads,
+                chunksize=max(1, len(remote_payloads) // (workers * 4)),
+            )
+        )
 
-           ``DisconnectedGraphException``: if, for some reason, the dependency DAG
-            contains disconnected nodes.
-           This should never happen via cinnamon APIs, unless some manual intervention
-            on the dependency DAG is carried out.
+        for (job_key, resolved_config), payload, dependency_result in zip(
+            jobs, payloads, dependency_results
+        ):
+            if not dependency_result.passed:
+                validation_result = dependency_result
+            else:
+                validation_result = (
+                    next(remote_results) if payload is not None else None
+                )
+            if validation_result is None:
+                validation_result = resolved_config.validate_conditions(
+                    strict=False, recursive=False
+                )
+
+            cls.store_validation_result(
+                key=job_key,
+                validation_result=validation_result,
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+            )
+
+    @classmethod
+    def validate_dependencies(
+        cls,
+        key: RegistrationKey[Any],
+        config: cinnamon.configuration.Configuration,
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+    ) -> ValidationResult:
         """
+        Validates the dependencies of a resolved configuration.
+        Registered dependencies are validated once, when expanded: their result is
+         read from the key buffers instead of validating their resolved configuration
+         again. Other dependencies are validated along with their own dependencies.
+        An invalid registered dependency reports its own validation error.
 
-        if cls.expanded:
-            raise AlreadyExpandedException()
+        Args:
+            key: the registration key of the resolved configuration.
+            config: the resolved configuration.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
 
-        # check if DAG is DAG
-        if not nx.is_directed_acyclic_graph(cls._DEPENDENCY_DAG):
-            raise NotADAGException(edges=cls._DEPENDENCY_DAG.edges)
+        Returns:
+            The validation result of the first invalid dependency, if any.
+        """
+        registered_config = cls.retrieve_configuration_info(registration_key=key).config
+        for dependency_name, dependency in registered_config.dependencies.items():
+            if isinstance(dependency, RegistrationKey):
+                if dependency in valid_key_buffer:
+                    continue
 
-        # check if isolated nodes
-        isolated_nodes = list(nx.isolates(cls._DEPENDENCY_DAG))
-        if len(isolated_nodes) > 0 and len(cls._DEPENDENCY_DAG.nodes) > 1:
-            raise DisconnectedGraphException(nodes=isolated_nodes)
+                if dependency in invalid_key_buffer:
+                    validation_result = cls._VALIDATION_ERRORS.get(dependency)
+                    if validation_result is None:
+                        # e.g., restored from a snapshot
+                        validation_result = getattr(
+                            config, dependency_name
+                        ).validate_conditions(strict=False, recursive=False)
+                    if validation_result.passed:
+                        validation_result = ValidationResult(
+                            passed=False,
+                            error_message=f"Dependency {dependency} is not valid!",
+                            source=config.__class__.__name__,
+                        )
+                    return validation_result
 
-        return True
+                dependency = getattr(config, dependency_name)
+
+            if isinstance(dependency, cinnamon.configuration.Configuration):
+                validation_result = dependency.validate_conditions(strict=False)
+                if not validation_result.passed:
+                    return validation_result
+
+        return ValidationResult(passed=True, source=config.__class__.__name__)
 
     @classmethod
-    @time_it
-    def dag_resolution(
+    def store_validation_result(
         cls,
-    ) -> Tuple[Set[RegistrationKey[Any]], Set[RegistrationKey[Any]]]:
+        key: RegistrationKey[Any],
+        validation_result: ValidationResult,
+        valid_key_buffer: Set[RegistrationKey[Any]],
+        invalid_key_buffer: Set[RegistrationKey[Any]],
+    ) -> bool:
+        if validation_result.passed:
+            key.metadata = None
+            valid_key_buffer.add(key)
+            cls._VALIDATION_ERRORS.pop(key, None)
+        else:
+            key.metadata = validation_result.stack_trace
+            invalid_key_buffer.add(key)
+            cls._VALIDATION_ERRORS[key] = validation_result
+
+        return validation_result.passed
+
+    @classmethod
+    def parse_sampling(
+        cls, sampling: Sampling = None
+    ) -> Dict[RegistrationKey[Any] | None, SamplingPolicy]:
         """
-        Expands and resolves dependencies in registration DAG.
-        The dependency traversal is done bottom-up by recursively expanding top nodes
-        (i.e., ``RegistrationKey`` instances).
-        Expanded keys are retrieved, and built for full validation.
+        Normalizes a variant sampling policy into a mapping from registration key
+         to policy, where the ``None`` key is the policy of the remaining keys.
+
+        Args:
+            sampling: variant sampling policy, either global or by registration key.
 
         Returns:
-            valid_keys: the set of valid registration keys
-            invalid_keys:the set of invalid registration keys
+            The variant sampling policies by registration key.
         """
+        if sampling is None:
+            return {}
 
-        cls.check_registration_graph()
+        if isinstance(sampling, SamplingPolicy):
+            return {None: sampling}
 
-        # Variants expansion doesn't change the topology of the graph
-        valid_key_buffer: Set[RegistrationKey[Any]] = set()
-        invalid_key_buffer: Set[RegistrationKey[Any]] = set()
-        logger.info(f"Resolving {len(cls._REGISTRY)} configurations...")
-        for key in cls._DEPENDENCY_DAG.successors(cls._ROOT_KEY):
-            Registry.expand_configuration(
-                key=key,
-                valid_key_buffer=valid_key_buffer,
-                invalid_key_buffer=invalid_key_buffer,
+        return {
+            RegistrationKey.parse(registration_key=key) if key is not None else None: (
+                policy
             )
+            for key, policy in sampling.items()
+        }
 
-        cls.expanded = True
+    @classmethod
+    def sample_variants(
+        cls,
+        key: RegistrationKey[Any],
+        config: cinnamon.configuration.Configuration,
+    ) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Selects the variant combinations of a configuration to expand according to
+         the registry sampling policy.
+        Samples are drawn using the key string format as salt: the selected
+         combinations, and thus the tags of variant keys, are the same across builds.
+        Combinations violating the configuration ``variant_constraints`` are
+         skipped: when no sampling policy applies, violating subtrees of the variant
+         space are pruned without being enumerated; otherwise, the policy draws
+         larger samples until enough satisfying combinations are found.
 
-        return valid_key_buffer, invalid_key_buffer
+        Args:
+            key: the registration key of the configuration.
+            config: the configuration.
+
+        Returns:
+            An iterator over the selected variant combinations.
+        """
+        space = config.variants
+        constraints = config.variant_constraints
+
+        policy = cls._SAMPLING.get(key, cls._SAMPLING.get(None))
+        if policy is None:
+            return space.constrained(constraints) if constraints else iter(space)
+
+        return policy.sample(space=space, salt=str(key), constraints=constraints)
 
     @classmethod
     def expand_configuration(
@@ -805,20 +2487,60 @@ class Registry:
         valid_key_buffer: Set[RegistrationKey[T]] | None = None,
         invalid_key_buffer: Set[RegistrationKey[T]] | None = None,
     ) -> Set[RegistrationKey[Any]]:
+        """
+        Expands a registered configuration along with its transitive dependencies
+         (see ``expand_levels()``).
+
+        Args:
+            key: the registration key to expand.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+
+        Returns:
+            The set of valid keys among the given key and its variants.
+        """
         valid_key_buffer = valid_key_buffer if valid_key_buffer is not None else set()
         invalid_key_buffer = (
             invalid_key_buffer if invalid_key_buffer is not None else set()
         )
 
-        config_info = cls.retrieve_configuration_info(registration_key=key)
-        config = config_info.config
+        config = cls.retrieve_configuration_info(registration_key=key).config
+        if not config.expanded:
+            cls.expand_levels(
+                keys=[key],
+                valid_key_buffer=valid_key_buffer,
+                invalid_key_buffer=invalid_key_buffer,
+            )
+
+        # We retrieve all valid variants of input key through dependency DAG
+        keys = set(cls.variant_keys(key=key)).union({key})
+        return keys.intersection(valid_key_buffer)
 
-        # We retrieve all keys related to input key through dependency DAG
-        if config.expanded:
-            keys = {edge[1] for edge in cls._DEPENDENCY_DAG.out_edges(key)}.union({key})
-            return keys
+    @classmethod
+    def expand_structure(
+        cls,
+        key: RegistrationKey[T],
+        valid_key_buffer: Set[RegistrationKey[T]],
+        invalid_key_buffer: Set[RegistrationKey[T]],
+    ) -> Iterator[Tuple[RegistrationKey[Any], cinnamon.configuration.Configuration]]:
+        """
+        Expands the dependencies and variants of a registered configuration without
+         validating its conditions.
+        Dependencies are expected to be already expanded (see ``expand_levels()``),
+         and are expanded (and validated) first otherwise.
+        Variants are added to the dependency DAG and registered.
 
-        keys = set()
+        Args:
+            key: the registration key to expand.
+            valid_key_buffer: set where valid keys are stored.
+            invalid_key_buffer: set where invalid keys are stored.
+
+        Returns:
+            An iterator over (key, resolved configuration) pairs left to validate:
+             one for each variant and one for the given key, in this order.
+        """
+        config_info = cls.retrieve_configuration_info(registration_key=key)
+        config = config_info.config
 
         # dependencies
         for dependency_name, dependency in config.dependencies.items():
@@ -836,7 +2558,8 @@ class Registry:
                     dependency_keys
                 ).difference({dependency})
 
-            for key_variant in config.meta[dependency_name].variants:
+            key_variants = config.field_meta(field_name=dependency_name).variants
+            for key_variant in key_variants:
                 if key_variant is not None and isinstance(key_variant, RegistrationKey):
                     dependency_variants = dependency_variants.union(
                         Registry.expand_configuration(
@@ -846,23 +2569,23 @@ class Registry:
                         )
                     )
 
-            config.meta[dependency_name].variants = list(dependency_variants)
+            # Metadata is copied from the class one on write: unchanged variants
+            # are not rewritten
+            if key_variants or dependency_variants:
+                config.meta[dependency_name].variants = list(dependency_variants)
 
         # variants
-        for variant_info in config.variants:
+        for variant_info in cls.sample_variants(key=key, config=config):
             variant_key = key.from_variant(
                 variant_kwargs=variant_info["values"],
                 variant_indexes=variant_info["indexes"],
             )
 
-            if not cls.in_graph(variant_key):
-                cls._DEPENDENCY_DAG.add_node(variant_key)
-            cls._DEPENDENCY_DAG.add_edge(key, variant_key, type="variant")
+            cls._DEPENDENCY_DAG.add_edge(key, variant_key, edge_type="variant")
 
+            # Variants only store their updated fields (see ``overlay()``)
             try:
-                variant_config = config.model_copy(
-                    update=variant_info["values"], deep=True
-                )
+                variant_config = config.overlay(update=variant_info["values"])
             except pydantic.ValidationError as validation_result:
                 variant_key.metadata = repr(validation_result)
                 invalid_key_buffer.add(variant_key)
@@ -878,34 +2601,17 @@ class Registry:
                     run_method=config_info.run_method,
                 )
 
-            resolved_config = Registry.resolve_configuration(
-                config=variant_config.model_copy(deep=True)
-            )
-            validation_result = resolved_config.validate_conditions(strict=False)
-
-            if validation_result.passed:
-                keys.add(variant_key)
-                valid_key_buffer.add(variant_key)
-            else:
-                variant_key.metadata = validation_result.stack_trace
-                invalid_key_buffer.add(variant_key)
-
-        resolved_config = Registry.resolve_configuration(
-            config=config.model_copy(deep=True)
-        )
-        validation_result = resolved_config.validate_conditions(strict=False)
+            # Resolution re-assigns dependency fields: registered configurations keep
+            # their keys
+            cls._RESOLVED.pop(variant_key, None)
+            yield variant_key, cls.resolved_configuration(registration_key=variant_key)
 
-        if validation_result.passed:
-            valid_key_buffer.add(key)
-            keys.add(key)
-        else:
-            key.metadata = validation_result.stack_trace
-            invalid_key_buffer.add(key)
+        # Dependency variants have been expanded
+        cls._RESOLVED.pop(key, None)
+        yield key, cls.resolved_configuration(registration_key=key)
 
         config.expanded = True
 
-        return keys
-
     # Registration APIs
 
     # Component
@@ -916,7 +2622,9 @@ class Registry:
         registration_key: RegistrationKey[T],
         **build_args,
     ) -> T:
-        instance: T = Registry.instantiate(registration_key=registration_key, **build_args)
+        instance: T = Registry.instantiate(
+            registration_key=registration_key, **build_args
+        )
         return instance
 
     @classmethod
@@ -960,6 +2668,7 @@ class Registry:
         registration_key = RegistrationKey.parse(
             registration_key=registration_key, name=name, tags=tags, namespace=namespace
         )
+        cls.load_key(registration_key=registration_key)
 
         if not cls.in_registry(registration_key=registration_key):
             raise NotRegisteredException(registration_key=registration_key)
@@ -970,7 +2679,8 @@ class Registry:
         if config_info.component is None:
             raise NotBoundException(registration_key=registration_key)
 
-        component_args = {**config.values, **build_args}
+        # Components may modify their arguments in place
+        component_args = {**config.detach().values, **build_args}
         component_class = import_class_from_string(config_info.component)
 
         if expected_type is not None and not issubclass(component_class, expected_type):
@@ -1031,17 +2741,20 @@ class Registry:
         if cls.in_registry(registration_key=registration_key):
             raise AlreadyRegisteredException(registration_key=registration_key)
 
-        # Store configuration in registry
+        # Store configuration in registry (special tags are indexed on insertion)
         cls._REGISTRY[registration_key] = ConfigurationInfo(
             config=config, component=component, run_method=run_method
         )
-        if run_method is not None:
-            registration_key.special_tags.add("__runnable")
+
+        if cls._CURRENT_SCRIPT is not None:
+            cls._SCRIPT_KEYS[cls._CURRENT_SCRIPT].add(registration_key)
 
         # Add to dependency graph
         cls._DEPENDENCY_DAG.add_node(registration_key)
-        if not len(cls._DEPENDENCY_DAG.in_edges(registration_key)):
-            cls._DEPENDENCY_DAG.add_edge(cls._ROOT_KEY, registration_key, type="child")
+        if not cls._DEPENDENCY_DAG.in_degree(registration_key):
+            cls._DEPENDENCY_DAG.add_edge(
+                cls._ROOT_KEY, registration_key, edge_type="child"
+            )
 
         # include dependencies
         for dependency_name, dependency in config.dependencies.items():
@@ -1051,9 +2764,9 @@ class Registry:
                 )
 
             dependency_key = dependency
-            dependency_variants: list[RegistrationKey] = config.meta[
-                dependency_name
-            ].variants
+            dependency_variants: list[RegistrationKey] = config.field_meta(
+                field_name=dependency_name
+            ).variants
             dependencies = (
                 [dependency_key] + dependency_variants
                 if dependency_key is not None
@@ -1064,10 +2777,7 @@ class Registry:
                 if not isinstance(dep, RegistrationKey):
                     continue
 
-                if not cls.in_graph(dep):
-                    cls._DEPENDENCY_DAG.add_node(dep)
-
-                cls._DEPENDENCY_DAG.add_edge(registration_key, dep, type="child")
+                cls._DEPENDENCY_DAG.add_edge(registration_key, dep, edge_type="child")
 
                 if dep.namespace != namespace:
                     if not cls.is_namespace_covered(dep):
@@ -1075,7 +2785,12 @@ class Registry:
                             registration_key=registration_key,
                             namespaces=cls._EXP_NAMESPACES,
                         )
-                    cls.load_registrations(directory=cls._MODULE_MAPPING[dep.namespace])
+                    if cls._LAZY:
+                        cls.load_namespace(namespace=dep.namespace)
+                    else:
+                        cls.load_registrations(
+                            directory=cls._MODULE_MAPPING[dep.namespace]
+                        )
 
         return registration_key
 
@@ -1083,22 +2798,97 @@ class Registry:
     def resolve_configuration(
         cls, config: cinnamon.configuration.Configuration
     ) -> cinnamon.configuration.Configuration:
+        """
+        Replaces, in place, dependency keys of a configuration, and keys in
+         dependency variants, with the shared resolved configurations of those keys
+         (see ``resolved_configuration()``).
+
+        Args:
+            config: the configuration to resolve.
+
+        Returns:
+            The resolved configuration.
+        """
         for dependency_name, dependency in config.dependencies.items():
             if dependency is not None and isinstance(dependency, RegistrationKey):
-                dependency = Registry.retrieve_configuration(
-                    registration_key=dependency
-                )
+                dependency = cls.resolved_configuration(registration_key=dependency)
                 setattr(config, dependency_name, dependency)
 
-            config.meta[dependency_name].variants = [
-                Registry.retrieve_configuration(registration_key=variant_key)
-                if isinstance(variant_key, RegistrationKey)
-                else variant_key
-                for variant_key in config.meta[dependency_name].variants
-            ]
+            dependency_variants = config.field_meta(field_name=dependency_name).variants
+            if any(
+                isinstance(variant_key, RegistrationKey)
+                for variant_key in dependency_variants
+            ):
+                config.meta[dependency_name].variants = [
+                    cls.resolved_configuration(registration_key=variant_key)
+                    if isinstance(variant_key, RegistrationKey)
+                    else variant_key
+                    for variant_key in dependency_variants
+                ]
 
         return config
 
+    @classmethod
+    def resolved_configuration(
+        cls, registration_key: Registration
+    ) -> cinnamon.configuration.Configuration:
+        """
+        Retrieves the resolved configuration of a registered key, i.e. an overlay
+         of the registered configuration where dependency keys are replaced with
+         resolved configurations (see ``resolve_configuration()``).
+        Resolved configurations are cached by key and shared: dependants and their
+         variants point to the same resolved dependencies, so that each key is
+         resolved once.
+        Resolved configurations are read-only: they must not be modified.
+
+        Args:
+            registration_key: the key used to register the configuration.
+
+        Returns:
+            The resolved configuration.
+
+        Raises:
+            ``NotRegisteredException``: if the key, or one of its transitive
+             dependencies, is not registered.
+
+            ``NotADAGException``: if the dependencies of the key contain a cycle.
+        """
+        registration_key = RegistrationKey.parse(registration_key=registration_key)
+        resolved = cls._RESOLVED
+
+        # Post-order traversal: dependencies are resolved before their dependants,
+        # which are visited again once all their dependencies are resolved
+        visiting = set()
+        stack = [(registration_key, None)]
+        while stack:
+            key, config = stack.pop()
+            if key in resolved:
+                continue
+
+            if config is not None:
+                visiting.discard(key)
+                resolved[key] = cls.resolve_configuration(config=config.overlay())
+                continue
+
+            if key in visiting:
+                raise NotADAGException(edges=cls._DEPENDENCY_DAG.edges)
+            visiting.add(key)
+
+            config = cls.retrieve_configuration_info(registration_key=key).config
+            stack.append((key, config))
+            for dependency_name, dependency in config.dependencies.items():
+                dependency_keys = [dependency] + config.field_meta(
+                    field_name=dependency_name
+                ).variants
+                stack.extend(
+                    (dependency_key, None)
+                    for dependency_key in dependency_keys
+                    if isinstance(dependency_key, RegistrationKey)
+                    and dependency_key not in resolved
+                )
+
+        return resolved[registration_key]
+
     @classmethod
     def _retrieve(
         cls,
@@ -1125,6 +2915,8 @@ class Registry:
             registration_key=registration_key, name=name, tags=tags, namespace=namespace
         )
 
+        cls.load_key(registration_key=registration_key)
+
         if not cls.in_registry(registration_key=registration_key):
             raise NotRegisteredException(registration_key=registration_key)
 
@@ -1150,11 +2942,12 @@ class Registry:
             tags: the ``tags`` field of ``RegistrationKey``
 
         Returns:
-            config: the built configuration instance
+            config: the built configuration instance, whose field values can be
+             modified in place (see ``Configuration.detach()``)
         """
         return cls._retrieve(
             registration_key=registration_key, name=name, namespace=namespace, tags=tags
-        ).config
+        ).config.detach()
 
     @classmethod
     def retrieve_configuration_info(
@@ -1193,6 +2986,8 @@ class Registry:
         """
         Retrieves ``RegistrationKey`` via given name, tags, namespaces filters.
         The search can be limited to a fixed set of keys, optionally given in input.
+        Otherwise, registered keys are looked up via the registry inverted index
+         (see ``KeyIndex``), in registration order.
 
         Args:
             names: a name or a list of names to filter registration keys.
@@ -1204,7 +2999,16 @@ class Registry:
         Returns:
         """
 
-        keys = keys if keys is not None else cls._REGISTRY.keys()
+        if keys is None:
+            cls.load_namespaces(
+                namespaces=[namespaces] if isinstance(namespaces, str) else namespaces
+            )
+            return cls._REGISTRY.index.select(
+                names=names,
+                namespaces=namespaces,
+                tags=tags,
+                special_tags=special_tags,
+            )
 
         return [
             key
@@ -1218,3 +3022,38 @@ class Registry:
     @classmethod
     def retrieve_runnable_keys(cls) -> List[RegistrationKey[Any]]:
         return cls.retrieve_keys(special_tags={"__runnable"})
+
+    @classmethod
+    def query(
+        cls,
+        query: str,
+        keys: List[RegistrationKey[T]] | None = None,
+    ) -> List[RegistrationKey[Any]]:
+        """
+        Retrieves ``RegistrationKey`` matching a query (see ``parse_query()``).
+        For instance:
+            (name:svm* or name:logreg) and C>=0.1 and model.kernel!=linear
+
+        The search can be limited to a fixed set of keys, optionally given in input.
+        Otherwise, registered keys are looked up via the registry inverted index
+         (see ``KeyIndex``), in registration order.
+
+        Args:
+            query: the query string.
+            keys: an optional list of ``RegistrationKey`` on which to apply the search.
+
+        Returns:
+            The list of matching ``RegistrationKey``.
+
+        Raises:
+            ``InvalidQueryException``: if the query is malformed.
+        """
+        expression = parse_query(query)
+
+        if keys is None:
+            cls.load_namespaces()
+            index = cls._REGISTRY.index
+        else:
+            index = KeyIndex(keys=keys)
+
+        return expression.select(index)
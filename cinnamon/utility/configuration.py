@@ -1,7 +1,10 @@
+import itertools
+import math
 import sys
 from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Union
 
-__all__ = ["batched"]
+__all__ = ["batched", "VariantSpace"]
 
 
 if sys.version_info >= (3, 12):
@@ -11,3 +14,171 @@ else:
     def batched(iterable, chunk_size):
         iterator = iter(iterable)
         return iter(lambda: tuple(islice(iterator, chunk_size)), tuple())
+
+
+Variant = Dict[str, Dict[str, Any]]
+
+# (read fields, predicate over the values of read fields)
+Constraint = Tuple[Set[str], Callable[[Dict[str, Any]], bool]]
+
+
+class VariantSpace:
+    """
+    Lazy view over the variant combinations of a ``Configuration``.
+
+    Combinations follow the ``itertools.product`` order of field choices and are
+     generated on demand: the space is never materialized.
+    Each combination is a dict with ``values`` (field values) and ``indexes``
+     (the index of each value within its field choices) keys.
+    The size of the space and random access by index are computed via mixed-radix
+     arithmetic.
+    """
+
+    def __init__(
+        self,
+        field_choices: Dict[str, List[Tuple[Any, int]]],
+        exclude_default: bool = False,
+    ):
+        """
+
+        Args:
+            field_choices: mapping from field name to its (value, index) choices.
+            exclude_default: if True, the first combination (i.e., all fields set to
+             their first choice) is excluded.
+        """
+        self.field_names = list(field_choices.keys())
+        self.field_choices = list(field_choices.values())
+        self.radices = [len(choices) for choices in self.field_choices]
+
+        size = math.prod(self.radices) if len(self.radices) else 0
+        self.offset = 1 if exclude_default and size else 0
+        self.count = size - self.offset
+
+    def _build(self, combination: Tuple[Tuple[Any, int], ...]) -> Variant:
+        combo_values = {}
+        combo_indexes = {}
+        for key, (val, idx) in zip(self.field_names, combination):
+            combo_values[key] = val
+            combo_indexes[key] = idx
+
+        return {"values": combo_values, "indexes": combo_indexes}
+
+    def variant_at(self, index: int) -> Variant:
+        """
+        Computes a combination from its position in the space.
+
+        Args:
+            index: position of the combination. Negative indexes count from the end.
+
+        Returns:
+            The combination at the given position.
+
+        Raises:
+            ``IndexError``: if the index is out of range.
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"Variant index out of range: {index}")
+
+        position = index + self.offset
+        combination = []
+        for choices, radix in zip(reversed(self.field_choices), reversed(self.radices)):
+            position, digit = divmod(position, radix)
+            combination.append(choices[digit])
+
+        return self._build(tuple(reversed(combination)))
+
+    def index_of(self, digits: Sequence[int]) -> int | None:
+        """
+        Computes the position of a combination from the index of each field value
+         within its field choices.
+
+        Args:
+            digits: the index of each field value, in field order.
+
+        Returns:
+            The position of the combination, or None if the combination is excluded
+             from the space.
+        """
+        position = 0
+        for digit, radix in zip(digits, self.radices):
+            position = position * radix + digit
+
+        index = position - self.offset
+        return index if index >= 0 else None
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Variant, List[Variant]]:
+        if isinstance(index, slice):
+            return [self.variant_at(idx) for idx in range(*index.indices(self.count))]
+        return self.variant_at(index)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def satisfies(self, variant: Variant, constraints: List[Constraint]) -> bool:
+        """
+        Checks if a combination satisfies all the given constraints.
+        """
+        return all(predicate(variant["values"]) for _, predicate in constraints)
+
+    def constrained(self, constraints: List[Constraint]) -> Iterator[Variant]:
+        """
+        Iterates over the combinations satisfying all the given constraints, in
+         ``itertools.product`` order.
+
+        Fields are assigned one at a time and each constraint is checked as soon as
+         all the fields it reads are assigned: subtrees of the space violating a
+         constraint are pruned without generating their combinations.
+        Constraints reading no field of the space are checked once.
+
+        Args:
+            constraints: (read fields, predicate) pairs. Predicates receive the
+             values of assigned fields.
+
+        Returns:
+            An iterator over the satisfying combinations.
+        """
+        if not self.count:
+            return
+
+        positions = {name: idx for idx, name in enumerate(self.field_names)}
+        checks = [[] for _ in range(len(self.field_names) + 1)]
+        for fields, predicate in constraints:
+            depth = max(
+                (positions[field] + 1 for field in fields if field in positions),
+                default=0,
+            )
+            checks[depth].append(predicate)
+
+        values = {}
+        combination = []
+
+        def visit(depth: int, is_default: bool) -> Iterator[Variant]:
+            if not all(predicate(values) for predicate in checks[depth]):
+                return
+
+            if depth == len(self.field_names):
+                if not (is_default and self.offset):
+                    yield self._build(tuple(combination))
+                return
+
+            name = self.field_names[depth]
+            for digit, choice in enumerate(self.field_choices[depth]):
+                values[name] = choice[0]
+                combination.append(choice)
+                yield from visit(depth=depth + 1, is_default=is_default and not digit)
+                combination.pop()
+            values.pop(name, None)
+
+        yield from visit(depth=0, is_default=True)
+
+    def __iter__(self) -> Iterator[Variant]:
+        if not self.count:
+            return iter(())
+
+        combinations = islice(itertools.product(*self.field_choices), self.offset, None)
+        return map(self._build, combinations)
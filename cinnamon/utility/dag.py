@@ -0,0 +1,735 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Sequence, Set, Tuple
+
+__all__ = ["DAG", "Reachability"]
+
+Edge = Tuple[Hashable, Hashable]
+
+# Half-open interval of post-order numbers
+Interval = Tuple[int, int]
+
+# Adjacency of nodes without edges: arrays are only allocated on first edge
+_NO_EDGES = ()
+
+
+class NodeView:
+    def __init__(self, dag: DAG):
+        self._dag = dag
+
+    def __len__(self) -> int:
+        return len(self._dag)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._dag)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._dag
+
+
+class EdgeView:
+    def __init__(self, dag: DAG):
+        self._dag = dag
+
+    def __len__(self) -> int:
+        return self._dag.edge_count
+
+    def __iter__(self) -> Iterator[Edge]:
+        nodes = self._dag._nodes
+        for source_id, targets in enumerate(self._dag._succ):
+            for target_id in targets:
+                yield nodes[source_id], nodes[target_id]
+
+    def __contains__(self, edge: Edge) -> bool:
+        return self._dag.has_edge(*edge)
+
+
+class Reachability:
+    """
+    Reachability index of a DAG via interval labels (Agrawal et al., 1989).
+
+    Nodes are numbered in post-order by a depth-first traversal: the nodes of each
+     traversal sub-tree get consecutive numbers, ending with the sub-tree root.
+    Hence, the nodes reachable from a node are a union of intervals of post-order
+     numbers: the one of its traversal sub-tree, plus the ones of nodes reachable
+     via other edges.
+    Intervals are only stored for nodes reaching other nodes than their sub-tree:
+     tree-shaped regions of the graph cost two integers per node.
+
+    The index is a snapshot: it must be rebuilt after the graph changes
+     (see ``DAG.reachability()``).
+    """
+
+    def __init__(
+        self,
+        ids: Dict[Hashable, int],
+        nodes: List[Hashable | None],
+        adjacency: Sequence[Sequence[int]],
+    ):
+        """
+
+        Args:
+            ids: the node ids.
+            nodes: the nodes by id, None for removed ones.
+            adjacency: the successor ids of each node id.
+        """
+        self._ids = ids
+        self._nodes = nodes
+        # Node ids by post-order number
+        self._order = array("q")
+        self._post = array("q", [-1]) * len(nodes)
+        # Lowest post-order number in the traversal sub-tree of each node
+        self._low = array("q", [-1]) * len(nodes)
+        self._intervals: Dict[int, List[Interval]] = {}
+
+        order, post, low = self._order, self._post, self._low
+        for start_id, node in enumerate(nodes):
+            if node is None or low[start_id] != -1:
+                continue
+
+            low[start_id] = len(order)
+            stack = [(start_id, iter(adjacency[start_id]))]
+            while stack:
+                node_id, successors = stack[-1]
+                for successor_id in successors:
+                    if low[successor_id] == -1:
+                        low[successor_id] = len(order)
+                        stack.append((successor_id, iter(adjacency[successor_id])))
+                        break
+                else:
+                    stack.pop()
+                    post[node_id] = len(order)
+                    order.append(node_id)
+                    if adjacency[node_id]:
+                        self._label(node_id, adjacency[node_id])
+
+    def _label(self, node_id: int, successors: Sequence[int]):
+        """
+        Computes the intervals of a node from the ones of its successors, which
+         have already been labeled in post-order.
+        """
+        low, post = self._low, self._post
+        tree_interval = (low[node_id], post[node_id])
+
+        intervals = None
+        for successor_id in successors:
+            successor_intervals = self._intervals.get(successor_id)
+            successor_interval = (low[successor_id], post[successor_id] + 1)
+            if (
+                successor_intervals is None
+                and tree_interval[0] <= successor_interval[0]
+                and successor_interval[1] <= tree_interval[1]
+            ):
+                # Traversal sub-tree of the node
+                continue
+
+            if intervals is None:
+                intervals = [tree_interval]
+            if successor_intervals is not None:
+                intervals.extend(successor_intervals)
+            intervals.append(successor_interval)
+
+        if intervals is None:
+            return
+
+        intervals.sort()
+        merged = []
+        for start, end in intervals:
+            if start >= end:
+                continue
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+
+        if merged != [tree_interval]:
+            self._intervals[node_id] = merged
+
+    def intervals(self, node: Hashable) -> List[Interval]:
+        """
+        Lists the sorted, disjoint intervals of post-order numbers of the nodes
+         reachable from a node.
+        """
+        node_id = self._ids[node]
+        intervals = self._intervals.get(node_id)
+        if intervals is None:
+            return [(self._low[node_id], self._post[node_id])]
+        return intervals
+
+    def reachable(self, node: Hashable) -> List[Hashable]:
+        """
+        Lists the nodes reachable from a node, in post-order: each node follows the
+         nodes it reaches.
+        """
+        order, nodes = self._order, self._nodes
+        return [
+            nodes[node_id]
+            for start, end in self.intervals(node)
+            for node_id in order[start:end]
+        ]
+
+    def reaches(self, source: Hashable, target: Hashable) -> bool:
+        """
+        Checks if a node is reachable from another one, in logarithmic time in the
+         number of intervals of the latter.
+        """
+        target_id = self._ids.get(target)
+        if target_id is None or source not in self._ids:
+            return False
+
+        target_post = self._post[target_id]
+        intervals = self.intervals(source)
+        index = bisect_right(intervals, (target_post, target_post)) - 1
+        if index >= 0 and intervals[index][1] > target_post:
+            return True
+        # Intervals starting at the target post-order number
+        return index + 1 < len(intervals) and intervals[index + 1][0] == target_post
+
+
+class DAG:
+    """
+    Directed acyclic graph with integer node ids and array-backed adjacency lists.
+
+    Each node gets an integer id, in insertion order, and its successors and
+     predecessors are stored as arrays of ids.
+    Edges are labeled by a type (e.g., ``child`` or ``variant``), stored as a byte
+     along with each successor.
+
+    A topological order is maintained incrementally as edges are added
+     (Pearce-Kelly algorithm): edges consistent with the current order cost O(1),
+     while others only re-order the affected region of the graph.
+    An edge closing a cycle is still added, but marks the graph as cyclic (see
+     ``is_acyclic()``).
+
+    Reachability queries are answered by an interval labeling index, built on
+     first use and kept until the graph changes (see ``reachability()``).
+
+    Node and edge views, as well as node and edge methods, follow ``networkx``
+     naming. The graph can be exported to ``networkx`` (see ``to_networkx()``).
+    """
+
+    def __init__(self):
+        self._ids: Dict[Hashable, int] = {}
+        self._nodes: List[Hashable | None] = []
+        self._succ: List[array | Tuple] = []
+        self._succ_types: List[bytearray | Tuple] = []
+        self._pred: List[array | Tuple] = []
+        # Position of each node in topological order
+        self._order = array("q")
+        self._next_order = 0
+        self._topological: List[int] | None = None
+        self._cyclic = False
+        self._types: List[str | None] = []
+        self._type_codes: Dict[str | None, int] = {}
+        self._reachability: Dict[Tuple[str | None, bool], Reachability] = {}
+        self.edge_count = 0
+
+    # Nodes
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._ids)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._ids
+
+    @property
+    def nodes(self) -> NodeView:
+        return NodeView(self)
+
+    @property
+    def edges(self) -> EdgeView:
+        return EdgeView(self)
+
+    def add_node(self, node: Hashable) -> int:
+        """
+        Adds a node, if missing, after all nodes in topological order.
+
+        Returns:
+            The node id.
+        """
+        node_id = self._ids.get(node)
+        if node_id is not None:
+            return node_id
+
+        node_id = len(self._nodes)
+        self._ids[node] = node_id
+        self._nodes.append(node)
+        self._succ.append(_NO_EDGES)
+        self._succ_types.append(_NO_EDGES)
+        self._pred.append(_NO_EDGES)
+        self._order.append(self._next_order)
+        self._next_order += 1
+        self._topological = None
+        if self._reachability:
+            self._reachability = {}
+        return node_id
+
+    def remove_node(self, node: Hashable):
+        self.remove_nodes_from([node])
+
+    def remove_nodes_from(self, nodes: Iterable[Hashable]):
+        """
+        Removes the given nodes, along with their edges.
+        Missing nodes are ignored.
+        The adjacency of each neighbour is rebuilt once, regardless of the number
+         of removed nodes it is adjacent to.
+        """
+        removed = set()
+        for node in nodes:
+            node_id = self._ids.pop(node, None)
+            if node_id is not None:
+                removed.add(node_id)
+        if not removed:
+            return
+
+        sources, targets = set(), set()
+        for node_id in removed:
+            targets.update(self._succ[node_id])
+            sources.update(self._pred[node_id])
+            self.edge_count -= len(self._succ[node_id])
+
+        for source_id in sources.difference(removed):
+            kept = [
+                (target_id, edge_type)
+                for target_id, edge_type in zip(
+                    self._succ[source_id], self._succ_types[source_id]
+                )
+                if target_id not in removed
+            ]
+            self.edge_count -= len(self._succ[source_id]) - len(kept)
+            self._succ[source_id] = array("q", [target_id for target_id, _ in kept])
+            self._succ_types[source_id] = bytearray(edge_type for _, edge_type in kept)
+
+        for target_id in targets.difference(removed):
+            self._pred[target_id] = array(
+                "q",
+                [
+                    source_id
+                    for source_id in self._pred[target_id]
+                    if source_id not in removed
+                ],
+            )
+
+        for node_id in removed:
+            self._nodes[node_id] = None
+            self._succ[node_id] = _NO_EDGES
+            self._succ_types[node_id] = _NO_EDGES
+            self._pred[node_id] = _NO_EDGES
+
+        self._topological = None
+        self._reachability = {}
+
+    # Edges
+
+    def _type_code(self, edge_type: str | None) -> int:
+        code = self._type_codes.get(edge_type)
+        if code is None:
+            code = len(self._types)
+            self._types.append(edge_type)
+            self._type_codes[edge_type] = code
+        return code
+
+    def has_edge(self, source: Hashable, target: Hashable) -> bool:
+        source_id = self._ids.get(source)
+        target_id = self._ids.get(target)
+        if source_id is None or target_id is None:
+            return False
+        # The shortest adjacency list is scanned: shared nodes have many neighbours
+        successors = self._succ[source_id]
+        predecessors = self._pred[target_id]
+        if len(successors) <= len(predecessors):
+            return target_id in successors
+        return source_id in predecessors
+
+    def add_edge(
+        self, source: Hashable, target: Hashable, edge_type: str | None = None
+    ):
+        """
+        Adds an edge, along with its missing nodes.
+        If the edge already exists, its type is updated.
+
+        Args:
+            source: the source node.
+            target: the target node.
+            edge_type: the edge type.
+        """
+        source_id = self._ids.get(source)
+        if source_id is None:
+            source_id = self.add_node(source)
+        target_id = self._ids.get(target)
+        if target_id is None:
+            target_id = self.add_node(target)
+        code = self._type_codes.get(edge_type)
+        if code is None:
+            code = self._type_code(edge_type)
+
+        if self._reachability:
+            self._reachability = {}
+
+        successors = self._succ[source_id]
+        predecessors = self._pred[target_id]
+        # The shortest adjacency list is scanned: shared nodes have many neighbours
+        if (
+            target_id in successors
+            if len(successors) <= len(predecessors)
+            else source_id in predecessors
+        ):
+            # Existing edge
+            self._succ_types[source_id][successors.index(target_id)] = code
+            return
+
+        if type(successors) is not array:
+            successors = self._succ[source_id] = array("q")
+            self._succ_types[source_id] = bytearray()
+        if type(predecessors) is not array:
+            predecessors = self._pred[target_id] = array("q")
+
+        successors.append(target_id)
+        self._succ_types[source_id].append(code)
+        predecessors.append(source_id)
+        self.edge_count += 1
+
+        if not self._cyclic and self._order[target_id] < self._order[source_id]:
+            self._reorder(source_id=source_id, target_id=target_id)
+
+    def _reorder(self, source_id: int, target_id: int):
+        """
+        Restores the topological order after adding an edge violating it, or marks
+         the graph as cyclic.
+        """
+        order = self._order
+        lower, upper = order[target_id], order[source_id]
+
+        # Common case (e.g., a new node depending on an older one): the affected
+        # region is just the two nodes, which swap their positions
+        if all(order[node_id] > upper for node_id in self._succ[target_id]) and all(
+            order[node_id] < lower for node_id in self._pred[source_id]
+        ):
+            order[source_id], order[target_id] = lower, upper
+            self._topological = None
+            return
+
+        # Nodes reachable from target, up to source in topological order
+        forward = {target_id}
+        stack = [target_id]
+        while stack:
+            for successor_id in self._succ[stack.pop()]:
+                if successor_id == source_id:
+                    self._cyclic = True
+                    self._topological = None
+                    return
+                if successor_id not in forward and order[successor_id] < upper:
+                    forward.add(successor_id)
+                    stack.append(successor_id)
+
+        # Nodes reaching source, down to target in topological order
+        backward = {source_id}
+        stack = [source_id]
+        while stack:
+            for predecessor_id in self._pred[stack.pop()]:
+                if predecessor_id not in backward and order[predecessor_id] > lower:
+                    backward.add(predecessor_id)
+                    stack.append(predecessor_id)
+
+        # Backward nodes are moved before forward ones, re-using their positions
+        affected = sorted(backward, key=order.__getitem__) + sorted(
+            forward, key=order.__getitem__
+        )
+        positions = sorted(order[node_id] for node_id in affected)
+        for node_id, position in zip(affected, positions):
+            order[node_id] = position
+        self._topological = None
+
+    def _neighbours(
+        self,
+        node: Hashable,
+        edge_type: str | None,
+        successors: bool,
+    ) -> List[int]:
+        node_id = self._ids[node]
+        if successors:
+            targets = self._succ[node_id]
+            if edge_type is None:
+                return list(targets)
+            code = self._type_codes.get(edge_type)
+            return [
+                target_id
+                for target_id, target_type in zip(targets, self._succ_types[node_id])
+                if target_type == code
+            ]
+
+        sources = self._pred[node_id]
+        if edge_type is None:
+            return list(sources)
+        code = self._type_codes.get(edge_type)
+        return [
+            source_id
+            for source_id in sources
+            if self._succ_types[source_id][self._succ[source_id].index(node_id)] == code
+        ]
+
+    def successors(
+        self, node: Hashable, edge_type: str | None = None
+    ) -> List[Hashable]:
+        """
+        Lists the successors of a node, optionally restricted to edges of the given
+         type, in edge insertion order.
+        """
+        nodes = self._nodes
+        return [
+            nodes[node_id]
+            for node_id in self._neighbours(node, edge_type=edge_type, successors=True)
+        ]
+
+    def predecessors(
+        self, node: Hashable, edge_type: str | None = None
+    ) -> List[Hashable]:
+        """
+        Lists the predecessors of a node, optionally restricted to edges of the
+         given type, in edge insertion order.
+        """
+        nodes = self._nodes
+        return [
+            nodes[node_id]
+            for node_id in self._neighbours(node, edge_type=edge_type, successors=False)
+        ]
+
+    def out_edges(self, node: Hashable) -> List[Tuple[Hashable, Hashable, str]]:
+        """
+        Lists the (source, target, type) outgoing edges of a node.
+        """
+        node_id = self._ids[node]
+        nodes, types = self._nodes, self._types
+        return [
+            (node, nodes[target_id], types[code])
+            for target_id, code in zip(self._succ[node_id], self._succ_types[node_id])
+        ]
+
+    def in_edges(self, node: Hashable) -> List[Tuple[Hashable, Hashable, str]]:
+        """
+        Lists the (source, target, type) incoming edges of a node.
+        """
+        node_id = self._ids[node]
+        nodes, types = self._nodes, self._types
+        return [
+            (
+                nodes[source_id],
+                node,
+                types[
+                    self._succ_types[source_id][self._succ[source_id].index(node_id)]
+                ],
+            )
+            for source_id in self._pred[node_id]
+        ]
+
+    def in_degree(self, node: Hashable) -> int:
+        return len(self._pred[self._ids[node]])
+
+    def out_degree(self, node: Hashable) -> int:
+        return len(self._succ[self._ids[node]])
+
+    # Traversals
+
+    def _reachable(
+        self,
+        node: Hashable,
+        edge_type: str | None,
+        successors: bool,
+    ) -> Set[int]:
+        node_id = self._ids[node]
+        code = self._type_codes.get(edge_type) if edge_type is not None else None
+        adjacency = self._succ if successors else self._pred
+
+        visited = set()
+        stack = [node_id]
+        while stack:
+            current_id = stack.pop()
+            if code is None or not successors:
+                neighbours = adjacency[current_id]
+            else:
+                neighbours = [
+                    target_id
+                    for target_id, target_type in zip(
+                        adjacency[current_id], self._succ_types[current_id]
+                    )
+                    if target_type == code
+                ]
+            for neighbour_id in neighbours:
+                if neighbour_id not in visited:
+                    visited.add(neighbour_id)
+                    stack.append(neighbour_id)
+        return visited
+
+    def descendants(
+        self, node: Hashable, edge_type: str | None = None
+    ) -> Set[Hashable]:
+        """
+        Computes the nodes reachable from a node, optionally only via edges of the
+         given type.
+        """
+        nodes = self._nodes
+        return {
+            nodes[node_id]
+            for node_id in self._reachable(node, edge_type=edge_type, successors=True)
+        }
+
+    def ancestors(self, node: Hashable) -> Set[Hashable]:
+        """
+        Computes the nodes from which a node is reachable.
+        """
+        nodes = self._nodes
+        return {
+            nodes[node_id]
+            for node_id in self._reachable(node, edge_type=None, successors=False)
+        }
+
+    def is_acyclic(self) -> bool:
+        """
+        Checks if the graph is acyclic.
+        The check is incremental: it is only carried out from scratch once node
+         removals may have broken a previously detected cycle.
+        """
+        if self._cyclic:
+            self._rebuild_order()
+        return not self._cyclic
+
+    def _rebuild_order(self):
+        """
+        Re-computes the topological order from scratch (Kahn's algorithm), marking
+         the graph as cyclic if none exists.
+        """
+        in_degrees = {
+            node_id: len(self._pred[node_id]) for node_id in self._ids.values()
+        }
+        ready = sorted(
+            (node_id for node_id, degree in in_degrees.items() if not degree),
+            key=self._order.__getitem__,
+        )
+        ordered = []
+        while ready:
+            node_id = ready.pop()
+            ordered.append(node_id)
+            for target_id in self._succ[node_id]:
+                in_degrees[target_id] -= 1
+                if not in_degrees[target_id]:
+                    ready.append(target_id)
+
+        self._cyclic = len(ordered) < len(in_degrees)
+        if not self._cyclic:
+            for position, node_id in enumerate(ordered):
+                self._order[node_id] = position
+            self._next_order = len(ordered)
+        self._topological = None
+
+    def topological_sort(self) -> List[Hashable]:
+        """
+        Lists nodes in topological order: each node precedes its successors.
+        The order is cached until the graph changes.
+
+        Raises:
+            ``ValueError``: if the graph contains a cycle.
+        """
+        if not self.is_acyclic():
+            raise ValueError("The graph contains a cycle")
+
+        if self._topological is None:
+            self._topological = sorted(self._ids.values(), key=self._order.__getitem__)
+
+        nodes = self._nodes
+        return [nodes[node_id] for node_id in self._topological]
+
+    def _adjacency(self, edge_type: str | None, reverse: bool) -> List[Sequence[int]]:
+        if edge_type is None:
+            return self._pred if reverse else self._succ
+
+        code = self._type_codes.get(edge_type)
+        adjacency = [[] for _ in self._nodes]
+        for source_id, (targets, types) in enumerate(zip(self._succ, self._succ_types)):
+            for target_id, target_type in zip(targets, types):
+                if target_type != code:
+                    continue
+                if reverse:
+                    adjacency[target_id].append(source_id)
+                else:
+                    adjacency[source_id].append(target_id)
+        return adjacency
+
+    def reachability(
+        self, edge_type: str | None = None, reverse: bool = False
+    ) -> Reachability:
+        """
+        Retrieves the reachability index of the graph, optionally restricted to
+         edges of the given type.
+        The index is built on first use, in linear time for tree-shaped graphs, and
+         cached until the graph changes.
+
+        Args:
+            edge_type: the type of edges to follow, or None for all edges.
+            reverse: if True, edges are followed backwards: the index answers
+             ancestor queries.
+
+        Returns:
+            The reachability index.
+
+        Raises:
+            ``ValueError``: if the graph contains a cycle.
+        """
+        index = self._reachability.get((edge_type, reverse))
+        if index is None:
+            if not self.is_acyclic():
+                raise ValueError("The graph contains a cycle")
+
+            index = Reachability(
+                ids=self._ids,
+                nodes=self._nodes,
+                adjacency=self._adjacency(edge_type=edge_type, reverse=reverse),
+            )
+            self._reachability[(edge_type, reverse)] = index
+        return index
+
+    def isolates(self) -> List[Hashable]:
+        """
+        Lists nodes without edges.
+        """
+        return [
+            node
+            for node, successors, predecessors in zip(
+                self._nodes, self._succ, self._pred
+            )
+            if node is not None and not successors and not predecessors
+        ]
+
+    def to_networkx(self):
+        """
+        Exports the graph to a ``networkx.DiGraph``, with edge types stored in the
+         ``type`` edge attribute.
+        Requires ``networkx`` (``pip install cinnamon[graph]``).
+        """
+        try:
+            import networkx as nx
+        except ImportError:
+            raise ImportError(
+                "networkx is required to export the graph. "
+                "Install it with: pip install cinnamon[graph]"
+            ) from None
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self)
+        for node in self:
+            graph.add_edges_from(
+                (source, target, {"type": edge_type})
+                for source, target, edge_type in self.out_edges(node)
+            )
+        return graph
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_topological"] = None
+        state["_reachability"] = {}
+        return state
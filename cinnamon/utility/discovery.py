@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import re
+from fnmatch import translate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from cinnamon.utility.snapshot import hash_file
+
+__all__ = [
+    "IGNORE_FILENAME",
+    "DEFAULT_IGNORE_PATTERNS",
+    "read_ignore_file",
+    "FileIndex",
+]
+
+IGNORE_FILENAME = ".cinnamonignore"
+
+# Subtrees that never contain cinnamon registrations
+DEFAULT_IGNORE_PATTERNS = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "__pycache__/",
+    ".venv/",
+    "venv/",
+    ".tox/",
+    ".nox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    "node_modules/",
+    "site-packages/",
+    "*.egg-info/",
+]
+
+
+def read_ignore_file(filename: Path) -> List[str]:
+    """
+    Reads exclusion patterns from a ``.cinnamonignore`` file.
+    The file follows a subset of the ``.gitignore`` syntax:
+        - one glob pattern per line; empty lines and lines starting with ``#``
+         are skipped.
+        - patterns without a ``/`` match file or folder names at any depth.
+        - patterns containing a ``/`` match paths relative to the scanned
+         directory.
+        - a trailing ``/`` restricts the pattern to folders.
+
+    Args:
+        filename: path of the ignore file
+
+    Returns:
+        The list of exclusion patterns
+    """
+    if not filename.is_file():
+        return []
+
+    with filename.open("r") as f:
+        lines = [line.strip() for line in f.readlines()]
+
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+class FileIndex:
+    """
+    Index of the configuration scripts contained in a directory.
+
+    The directory tree is walked once: subtrees matching exclusion patterns are
+     pruned before being visited.
+    The index lists all Python scripts belonging to a configuration folder.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        configuration_folder: str = "configurations",
+        ignore_patterns: Optional[Iterable[str]] = None,
+    ):
+        """
+
+        Args:
+            directory: the directory to index.
+            configuration_folder: name of folders containing configuration scripts.
+            ignore_patterns: exclusion patterns. Defaults to
+             ``DEFAULT_IGNORE_PATTERNS`` and those in ``directory/.cinnamonignore``.
+        """
+        self.directory = Path(directory)
+        self.configuration_folder = configuration_folder
+
+        if ignore_patterns is None:
+            ignore_patterns = DEFAULT_IGNORE_PATTERNS + read_ignore_file(
+                self.directory.joinpath(IGNORE_FILENAME)
+            )
+        self.ignore_patterns = list(ignore_patterns)
+
+        # (name patterns, path patterns) for any entry and for folders only
+        self._any_matchers = self._compile(dir_only=False)
+        self._dir_matchers = self._compile(dir_only=True)
+
+        self.scripts: List[Path] = sorted(self._walk())
+        self._hashes: Dict[Path, str] = {}
+
+    def _compile(self, dir_only: bool) -> tuple:
+        name_patterns, path_patterns = [], []
+        for pattern in self.ignore_patterns:
+            if pattern.endswith("/") != dir_only:
+                continue
+
+            pattern = pattern.rstrip("/")
+            if "/" in pattern:
+                path_patterns.append(translate(pattern.lstrip("/")))
+            else:
+                name_patterns.append(translate(pattern))
+
+        return tuple(
+            re.compile("|".join(patterns)) if patterns else None
+            for patterns in (name_patterns, path_patterns)
+        )
+
+    @staticmethod
+    def _match(matchers: tuple, name: str, relative_path: str) -> bool:
+        name_matcher, path_matcher = matchers
+        return bool(
+            (name_matcher is not None and name_matcher.match(name))
+            or (path_matcher is not None and path_matcher.match(relative_path))
+        )
+
+    def is_ignored(self, relative_path: str, name: str, is_dir: bool) -> bool:
+        """
+        Checks if a file or folder matches any exclusion pattern.
+
+        Args:
+            relative_path: posix path relative to the indexed directory.
+            name: name of the file or folder.
+            is_dir: whether the entry is a folder.
+
+        Returns:
+            True if the entry is excluded.
+        """
+        if self._match(self._any_matchers, name=name, relative_path=relative_path):
+            return True
+
+        return is_dir and self._match(
+            self._dir_matchers, name=name, relative_path=relative_path
+        )
+
+    def _walk(self) -> Iterable[Path]:
+        root_in_folder = self.configuration_folder in self.directory.parts
+        visited = set()
+
+        # (directory path, relative posix path, inside a configuration folder)
+        stack = [(self.directory, "", root_in_folder)]
+        while stack:
+            current, relative, in_folder = stack.pop()
+
+            real_path = os.path.realpath(current)
+            if real_path in visited:
+                continue
+            visited.add(real_path)
+
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+
+            for entry in entries:
+                entry_relative = f"{relative}/{entry.name}" if relative else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if self.is_ignored(
+                    relative_path=entry_relative, name=entry.name, is_dir=is_dir
+                ):
+                    continue
+
+                if is_dir:
+                    stack.append(
+                        (
+                            Path(entry.path),
+                            entry_relative,
+                            in_folder or entry.name == self.configuration_folder,
+                        )
+                    )
+                elif in_folder and entry.name.endswith(".py"):
+                    yield Path(entry.path)
+
+    def file_hash(self, filename: Path) -> str:
+        """
+        Computes the content hash of an indexed script.
+        Hashes are computed once and shared by all consumers of the index.
+
+        Args:
+            filename: path of the script.
+
+        Returns:
+            The hexadecimal SHA-256 digest of the script content.
+        """
+        if filename not in self._hashes:
+            self._hashes[filename] = hash_file(filename)
+        return self._hashes[filename]
+
+    def __len__(self) -> int:
+        return len(self.scripts)
+
+    def __iter__(self):
+        return iter(self.scripts)
@@ -13,6 +13,7 @@ __all__ = [
     "AlreadyExpandedException",
     "NotExpandedException",
     "InvalidDirectoryException",
+    "InvalidQueryException",
     "ValidationResult",
     "ValidationFailureException",
 ]
@@ -101,6 +102,15 @@ class InvalidDirectoryException(Exception):
         )
 
 
+class InvalidQueryException(Exception):
+    def __init__(self, query: str, position: int, reason: str):
+        super().__init__(
+            f"Invalid registration key query: {reason} {os.linesep}"
+            f"{query}{os.linesep}"
+            f"{' ' * position}^"
+        )
+
+
 @dataclass
 class ValidationResult:
     """
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from cinnamon.utility.tags import TAG_TRIE, Tag
+
+__all__ = ["KeyIndex", "IndexedRegistry"]
+
+Term = Tuple[str, Hashable]
+
+
+class KeyIndex:
+    """
+    Inverted index over registration keys.
+
+    Each indexed key gets an integer id, in insertion order.
+    The index maps each term (i.e., a key ``name``, ``namespace``, structured tag
+     and special tag) to the sorted list of ids of keys having it (posting list).
+    Queries intersect posting lists via bitsets: each bitset is built from its
+     posting list on first use and cached until the posting list changes.
+
+    Special tags are indexed when a key is added, either as given or as read from
+     the key: changing the special tags of an indexed key requires adding it again.
+
+    Distinct values of each field are tracked as well, to expand patterns into
+     terms (see ``values()``).
+    """
+
+    # Term of keys without (special) tags
+    NO_TAGS = None
+
+    def __init__(self, keys: Iterable[Any] = ()):
+        self._keys: List[Any | None] = []
+        self._ids: Dict[Any, int] = {}
+        self._postings: Dict[Term, List[int]] = {}
+        self._bitsets: Dict[Term, int] = {}
+        self._values: Dict[str, List[Hashable]] = {}
+        self._universe: int | None = None
+        self._removed = 0
+
+        # Special tags given on insertion, by key
+        self._special_tags: Dict[Any, Set[Any]] = {}
+
+        for key in keys:
+            self.add(key)
+
+    @classmethod
+    def terms(cls, key: Any, special_tags: Optional[Set[Any]] = None) -> List[Term]:
+        """
+        Lists the terms a key is indexed by.
+
+        Args:
+            key: the key.
+            special_tags: the special tags of the key. If None, they are read from
+             the key.
+        """
+        if special_tags is None:
+            special_tags = key.special_tags
+
+        terms = [("name", key.name), ("namespace", key.namespace)]
+        terms.extend(("tag", tag) for tag in key.structured_tags or [cls.NO_TAGS])
+        terms.extend(("special_tag", tag) for tag in special_tags or [cls.NO_TAGS])
+        return terms
+
+    def add(self, key: Any, special_tags: Optional[Set[Any]] = None):
+        """
+        Adds a key to the index, after all currently indexed keys.
+        If the key is already indexed, it is re-indexed.
+
+        Args:
+            key: the key.
+            special_tags: the special tags of the key. If None, they are read from
+             the key.
+        """
+        if key in self._ids:
+            self.remove(key)
+
+        key_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = key_id
+        self._universe = None
+        if special_tags is not None:
+            self._special_tags[key] = special_tags
+        for term in self.terms(key, special_tags=special_tags):
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = []
+                self._values.setdefault(term[0], []).append(term[1])
+            posting.append(key_id)
+            self._bitsets.pop(term, None)
+
+    def remove(self, key: Any):
+        """
+        Removes a key from the index, if indexed.
+        Ids of removed keys are dropped from posting lists when their bitsets are
+         rebuilt, or when removed keys outnumber indexed ones.
+        """
+        key_id = self._ids.pop(key, None)
+        if key_id is None:
+            return
+
+        self._keys[key_id] = None
+        self._universe = None
+        special_tags = self._special_tags.pop(key, None)
+        for term in self.terms(key, special_tags=special_tags):
+            self._bitsets.pop(term, None)
+
+        self._removed += 1
+        if self._removed > max(len(self._ids), 1024):
+            self.compact()
+
+    def clear(self):
+        self.__init__()
+
+    def compact(self):
+        """
+        Re-assigns ids to indexed keys, dropping removed ones.
+        """
+        keys = [key for key in self._keys if key is not None]
+        special_tags = self._special_tags
+        self.__init__()
+        for key in keys:
+            self.add(key, special_tags=special_tags.get(key))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._ids
+
+    def __iter__(self):
+        return (key for key in self._keys if key is not None)
+
+    def _posting(self, term: Term) -> List[int]:
+        posting = self._postings.get(term)
+        if posting is None:
+            return []
+
+        if term not in self._bitsets:
+            # Bitsets are rebuilt after changes: drop removed ids meanwhile
+            keys = self._keys
+            posting[:] = [key_id for key_id in posting if keys[key_id] is not None]
+        return posting
+
+    def _bitset(self, term: Term) -> int:
+        bitset = self._bitsets.get(term)
+        if bitset is None:
+            posting = self._posting(term)
+            buffer = bytearray((len(self._keys) + 7) // 8)
+            for key_id in posting:
+                buffer[key_id >> 3] |= 1 << (key_id & 7)
+            bitset = int.from_bytes(buffer, "little")
+            self._bitsets[term] = bitset
+        return bitset
+
+    def values(self, field: str) -> List[Hashable]:
+        """
+        Lists the distinct values of a field (i.e., ``name``, ``namespace``, ``tag``
+         or ``special_tag``) among indexed keys, in insertion order.
+        Values of removed keys may be listed as well.
+        """
+        return self._values.get(field, [])
+
+    @classmethod
+    def term(cls, field: str, value: Any) -> Term:
+        """
+        Builds the term of a field value.
+        Tags are indexed as ``Tag`` instances: tags in their string format are
+         looked up in the shared ``TagTrie``.
+        """
+        if field != "tag" or value is cls.NO_TAGS or isinstance(value, Tag):
+            return field, value
+
+        tag = TAG_TRIE.lookup(value)
+        # Unknown tags match no key
+        return field, tag if tag is not None else str(value)
+
+    def bitset(self, terms: Iterable[Term]) -> int:
+        """
+        Computes the bitset of keys matching any of the given terms: the i-th bit
+         is set if the key with id i matches.
+        """
+        bitset = 0
+        for term in terms:
+            bitset |= self._bitset(term)
+        return bitset
+
+    def universe(self) -> int:
+        """
+        Computes the bitset of all indexed keys.
+        """
+        if self._universe is None:
+            buffer = bytearray((len(self._keys) + 7) // 8)
+            for key_id in self._ids.values():
+                buffer[key_id >> 3] |= 1 << (key_id & 7)
+            self._universe = int.from_bytes(buffer, "little")
+        return self._universe
+
+    def keys_of(self, bitset: int) -> List[Any]:
+        """
+        Retrieves the keys of a bitset, in insertion order.
+        """
+        keys = self._keys
+        bits = bin(bitset & self.universe())[:1:-1]
+        matches = []
+        key_id = bits.find("1")
+        while key_id != -1:
+            matches.append(keys[key_id])
+            key_id = bits.find("1", key_id + 1)
+        return matches
+
+    def _group(self, terms: List[Term]) -> Tuple[List[int], int]:
+        """
+        Computes the ids and bitset of keys matching any of the given terms.
+        """
+        if len(terms) == 1:
+            return self._posting(terms[0]), self._bitset(terms[0])
+
+        bitset = 0
+        for term in terms:
+            bitset |= self._bitset(term)
+        postings = [self._posting(term) for term in terms]
+        return sorted(set().union(*postings)), bitset
+
+    def _tag_groups(self, field: str, tags: Set[Any]) -> List[List[Term]]:
+        """
+        Translates a tag filter (see ``match_tags()``) into groups of terms:
+         keys must match any term of each group.
+        """
+        if self.NO_TAGS in tags:
+            tags = tags - {self.NO_TAGS}
+            if not tags:
+                return []
+
+            # Keys without tags, or with all the given ones
+            no_tags = (field, self.NO_TAGS)
+            return [[self.term(field, tag), no_tags] for tag in tags]
+
+        return [[self.term(field, tag)] for tag in tags]
+
+    def select(
+        self,
+        names: Optional[Union[List[str], str]] = None,
+        namespaces: Optional[Union[List[str], str]] = None,
+        tags: Optional[Set[Any]] = None,
+        special_tags: Optional[Set[Any]] = None,
+    ) -> List[Any]:
+        """
+        Retrieves indexed keys matching all the given filters, with the same
+         semantics of ``match_name()``, ``match_namespace()`` and ``match_tags()``.
+
+        Args:
+            names: a name or a list of names.
+            namespaces: a namespace or a list of namespaces.
+            tags: a tag set.
+            special_tags: a special tag set.
+
+        Returns:
+            The matching keys, in insertion order.
+        """
+        groups = []
+        if names is not None:
+            names = names if isinstance(names, list) else [names]
+            groups.append([("name", name) for name in names])
+        if namespaces is not None:
+            namespaces = namespaces if isinstance(namespaces, list) else [namespaces]
+            groups.append([("namespace", namespace) for namespace in namespaces])
+        if tags is not None:
+            groups.extend(self._tag_groups(field="tag", tags=set(tags)))
+        if special_tags is not None:
+            groups.extend(self._tag_groups(field="special_tag", tags=set(special_tags)))
+
+        if not groups:
+            return list(self)
+
+        keys = self._keys
+        if len(groups) == 1 and len(groups[0]) == 1:
+            return [keys[key_id] for key_id in self._posting(groups[0][0])]
+
+        # Keys are read from the smallest group, and checked against all others
+        groups = [self._group(terms) for terms in groups]
+        candidates = min((ids for ids, _ in groups), key=len)
+        bitset = -1
+        for _, group_bitset in groups:
+            bitset &= group_bitset
+        if not bitset:
+            return []
+
+        mask = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+        size = len(mask)
+        return [
+            keys[key_id]
+            for key_id in candidates
+            if (key_id >> 3) < size and mask[key_id >> 3] >> (key_id & 7) & 1
+        ]
+
+
+class IndexedRegistry(dict):
+    """
+    Dictionary whose keys are indexed by a ``KeyIndex``.
+    The index is updated along with the dictionary.
+    Values exposing ``special_tags`` (e.g., ``ConfigurationInfo``) determine the
+     special tags their key is indexed by: the index does not depend on where the
+     dictionary is stored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.index = KeyIndex()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: Any, value: Any):
+        if key not in self:
+            self.index.add(key, special_tags=getattr(value, "special_tags", None))
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any):
+        super().__delitem__(key)
+        self.index.remove(key)
+
+    def pop(self, key: Any, *args) -> Any:
+        if key in self:
+            self.index.remove(key)
+        return super().pop(key, *args)
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = super().popitem()
+        self.index.remove(key)
+        return key, value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self.index.clear()
+
+    def copy(self) -> IndexedRegistry:
+        return IndexedRegistry(self)
+
+    def __reduce__(self):
+        return IndexedRegistry, (dict(self),)
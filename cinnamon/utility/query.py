@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import functools
+import operator
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Tuple
+
+from cinnamon.utility.exceptions import InvalidQueryException
+from cinnamon.utility.index import KeyIndex
+from cinnamon.utility.tags import TAG_TRIE, Tag
+
+__all__ = ["Query", "Match", "Compare", "And", "Or", "Not", "parse_query"]
+
+FIELDS = ("name", "namespace", "tag", "special_tag")
+
+COMPARISONS: Dict[str, Callable[[float, float], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Comparison of swapped operands: 0.1 < C is C > 0.1
+FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+KEYWORDS = ("and", "or", "not")
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+    (?P<string>'[^']*'|"[^"]*")
+    |(?P<operator><=|>=|!=|[()=<>:])
+    |(?P<word>[^\s()=<>!:'"]+)
+    )""",
+    re.VERBOSE,
+)
+
+_GLOB = re.compile(r"[*?\[]")
+
+
+def is_pattern(value: str) -> bool:
+    return _GLOB.search(value) is not None
+
+
+def to_number(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class Query(ABC):
+    """
+    Base class of registration key query expressions.
+    Expressions are evaluated against a ``KeyIndex`` into the bitset of matching
+     keys (see ``KeyIndex.bitset()``).
+    """
+
+    @abstractmethod
+    def evaluate(self, index: KeyIndex) -> int:
+        """
+        Evaluates the expression into the bitset of the index keys it matches.
+        """
+
+    def select(self, index: KeyIndex) -> List:
+        """
+        Retrieves the keys of an index matching the expression, in insertion order.
+        """
+        return index.keys_of(self.evaluate(index))
+
+
+@dataclass(frozen=True)
+class Match(Query):
+    """
+    Matches keys having a field value equal to ``value``.
+    If ``pattern`` is True, ``value`` is a shell-style pattern (see ``fnmatch``).
+
+    Args:
+        field: one of ``name``, ``namespace``, ``tag`` or ``special_tag``.
+        value: the value or pattern to match.
+        pattern: whether ``value`` is a pattern.
+    """
+
+    field: str
+    value: str
+    pattern: bool = False
+
+    def evaluate(self, index: KeyIndex) -> int:
+        if not self.pattern:
+            return index.bitset([index.term(self.field, self.value)])
+
+        return index.bitset(
+            (self.field, value)
+            for value in index.values(self.field)
+            if value is not None and fnmatchcase(str(value), self.value)
+        )
+
+
+@dataclass(frozen=True)
+class Compare(Query):
+    """
+    Matches keys having a compound tag (i.e., ``param=value``) whose value
+     satisfies a comparison.
+
+    Equality (``=``) and inequality (``!=``) compare tag values in their string
+     format (or patterns, if ``pattern`` is True).
+    Ordering comparisons (``<``, ``<=``, ``>``, ``>=``) compare typed tag values
+     (see ``Tag.value``): non-numeric tag values never match.
+    Candidate tags are read from the shared ``TagTrie`` node of ``param_name``.
+    Inequality only matches keys having the compound tag.
+
+    Args:
+        param_name: the compound tag parameter name (e.g., ``model.kernel``).
+        operator: the comparison operator.
+        value: the value to compare tag values with.
+        pattern: whether ``value`` is a pattern.
+    """
+
+    param_name: str
+    operator: str
+    value: str
+    pattern: bool = False
+
+    def matches(self, tag: Tag) -> bool:
+        if self.operator in COMPARISONS:
+            value = tag.value
+            return (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and COMPARISONS[self.operator](value, float(self.value))
+            )
+
+        if self.pattern:
+            equal = fnmatchcase(tag.text, self.value)
+        else:
+            equal = tag.text == self.value
+        return equal if self.operator == "=" else not equal
+
+    def evaluate(self, index: KeyIndex) -> int:
+        node = TAG_TRIE.find(tuple(self.param_name.split(TAG_TRIE.HIERARCHY_SEPARATOR)))
+        if node is None:
+            return 0
+
+        if self.operator == "=" and not self.pattern:
+            tag = node.tags.get(self.value)
+            return index.bitset([("tag", tag)]) if tag is not None else 0
+
+        return index.bitset(
+            ("tag", tag)
+            for text, tag in list(node.tags.items())
+            if text is not None and self.matches(tag)
+        )
+
+
+@dataclass(frozen=True)
+class And(Query):
+    operands: Tuple[Query, ...]
+
+    def evaluate(self, index: KeyIndex) -> int:
+        bitset = -1
+        for operand in self.operands:
+            bitset &= operand.evaluate(index)
+            if not bitset:
+                break
+        return bitset
+
+
+@dataclass(frozen=True)
+class Or(Query):
+    operands: Tuple[Query, ...]
+
+    def evaluate(self, index: KeyIndex) -> int:
+        bitset = 0
+        for operand in self.operands:
+            bitset |= operand.evaluate(index)
+        return bitset
+
+
+@dataclass(frozen=True)
+class Not(Query):
+    operand: Query
+
+    def evaluate(self, index: KeyIndex) -> int:
+        return index.universe() & ~self.operand.evaluate(index)
+
+
+class QueryParser:
+    """
+    Recursive descent parser of registration key queries.
+
+    Grammar:
+        query       := conjunction ("or" conjunction)*
+        conjunction := negation ("and" negation)*
+        negation    := "not" negation | "(" query ")" | predicate
+        predicate   := FIELD ":" value
+                     | value OPERATOR value [OPERATOR number]
+                     | value
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = self.tokenize(query)
+        self.position = 0
+
+    @staticmethod
+    def tokenize(query: str) -> List[Tuple[str, str, int]]:
+        tokens = []
+        position = 0
+        end = len(query.rstrip())
+        while position < end:
+            match = _TOKEN.match(query, position)
+            if match is None or match.end() == position:
+                start = len(query) - len(query[position:].lstrip())
+                raise InvalidQueryException(
+                    query=query, position=start, reason="unexpected character."
+                )
+
+            kind = match.lastgroup
+            text = match.group(kind)
+            start = match.start(kind)
+            if kind == "word" and text in KEYWORDS:
+                kind = "keyword"
+            tokens.append((kind, text, start))
+            position = match.end()
+        return tokens
+
+    def error(self, reason: str) -> InvalidQueryException:
+        if self.position < len(self.tokens):
+            position = self.tokens[self.position][2]
+        else:
+            position = len(self.query)
+        return InvalidQueryException(query=self.query, position=position, reason=reason)
+
+    def peek(self) -> Tuple[str, str, int] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def accept(self, kind: str, *texts: str) -> str | None:
+        token = self.peek()
+        if token is not None and token[0] == kind and (not texts or token[1] in texts):
+            self.position += 1
+            return token[1]
+        return None
+
+    def parse(self) -> Query:
+        if not self.tokens:
+            raise self.error("empty query.")
+
+        query = self.parse_disjunction()
+        if self.peek() is not None:
+            raise self.error("expected 'and', 'or' or end of query.")
+        return query
+
+    def parse_disjunction(self) -> Query:
+        operands = [self.parse_conjunction()]
+        while self.accept("keyword", "or"):
+            operands.append(self.parse_conjunction())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_conjunction(self) -> Query:
+        operands = [self.parse_negation()]
+        while self.accept("keyword", "and"):
+            operands.append(self.parse_negation())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_negation(self) -> Query:
+        if self.accept("keyword", "not"):
+            return Not(self.parse_negation())
+
+        if self.accept("operator", "("):
+            query = self.parse_disjunction()
+            if not self.accept("operator", ")"):
+                raise self.error("expected ')'.")
+            return query
+
+        return self.parse_predicate()
+
+    def parse_value(self) -> Tuple[str, bool]:
+        """
+        Parses a word or a quoted string.
+        Returns the value and whether it is a pattern: quoted strings never are.
+        """
+        word = self.accept("word")
+        if word is not None:
+            return word, is_pattern(word)
+
+        string = self.accept("string")
+        if string is not None:
+            return string[1:-1], False
+
+        raise self.error("expected a value.")
+
+    def parse_number(self) -> str:
+        value, _ = self.parse_value()
+        if to_number(value) is None:
+            self.position -= 1
+            raise self.error("expected a number.")
+        return value
+
+    def parse_predicate(self) -> Query:
+        first_token = self.peek()
+        value, pattern = self.parse_value()
+
+        if self.accept("operator", ":"):
+            if first_token[0] != "word" or value not in FIELDS:
+                self.position -= 2
+                raise self.error(f"expected one of {', '.join(FIELDS)}.")
+
+            field_value, field_pattern = self.parse_value()
+            return Match(field=value, value=field_value, pattern=field_pattern)
+
+        comparison = self.accept("operator", "=", "!=", *COMPARISONS)
+        if comparison is None:
+            return Match(field="tag", value=value, pattern=pattern)
+
+        if comparison in COMPARISONS and to_number(value) is not None:
+            # Range: 0.1 <= C < 1.0
+            param_name, _ = self.parse_value()
+            lower = Compare(
+                param_name=param_name, operator=FLIPPED[comparison], value=value
+            )
+            upper = self.accept("operator", *COMPARISONS)
+            if upper is None:
+                return lower
+
+            upper = Compare(
+                param_name=param_name, operator=upper, value=self.parse_number()
+            )
+            return And((lower, upper))
+
+        if comparison in COMPARISONS:
+            return Compare(
+                param_name=value, operator=comparison, value=self.parse_number()
+            )
+
+        compared_value, compared_pattern = self.parse_value()
+        return Compare(
+            param_name=value,
+            operator=comparison,
+            value=compared_value,
+            pattern=compared_pattern,
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_query(query: str) -> Query:
+    """
+    Parses a registration key query.
+
+    Queries combine predicates via ``and``, ``or``, ``not`` and parentheses.
+    Predicates are:
+        - ``name:value``, ``namespace:value``, ``tag:value`` and ``special_tag:value``
+         match keys by field value.
+        - ``param=value`` and ``param!=value`` match keys by compound tag value.
+        - ``param<value``, ``param<=value``, ``param>value`` and ``param>=value``
+         match keys by numeric compound tag value.
+        - ``lower<=param<upper`` (and any other ordering operators) match keys by
+         numeric compound tag value range.
+        - ``value`` matches keys having the ``value`` tag.
+
+    Dependency tags are matched via their hierarchy tag (e.g., ``model.kernel=linear``).
+    Unquoted values containing ``*``, ``?`` or ``[`` are shell-style patterns
+     (see ``fnmatch``).
+    Quoted values (e.g., ``'a tag'``) are matched literally.
+
+    Args:
+        query: the query string.
+
+    Returns:
+        The parsed query expression.
+
+    Raises:
+        ``InvalidQueryException``: if the query is malformed.
+    """
+    return QueryParser(query).parse()
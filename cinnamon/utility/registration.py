@@ -4,12 +4,16 @@ import ast
 import importlib
 import types
 from copy import deepcopy
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Set, Union
+from typing import Any, List, Optional, Set, Tuple, Union
 
 __all__ = [
     "NamespaceExtractor",
+    "CatalogEntry",
+    "RegistrationExtractor",
+    "extract_registrations",
     "Tags",
     "TAGGABLE_TYPES",
     "match_name",
@@ -68,18 +72,152 @@ class NamespaceExtractor(ast.NodeVisitor):
 
     def visit_Call(self, node):
         if self.register_flag:
-            call_args = [ast.unparse(keyword) for keyword in node.keywords]
+            call_args = [
+                ast.unparse(keyword)
+                for keyword in node.keywords
+                if keyword.arg == "namespace"
+            ]
             if len(call_args):
-                namespace = (
-                    [item for item in call_args if item.startswith("namespace")][0]
-                    .split("namespace=")[-1]
-                    .strip()
-                )
+                namespace = call_args[0].split("namespace=")[-1].strip()
                 namespace = namespace.replace("'", "").replace('"', "")
                 self.namespaces.append(namespace)
         self.generic_visit(node)
 
 
+@dataclass
+class CatalogEntry:
+    """
+    A registration statically declared in a configuration script.
+
+    Args:
+        name: the ``name`` field of the registration key.
+        namespace: the ``namespace`` field of the registration key.
+        tags: the ``tags`` field of the registration key.
+        component: ``Component`` module path as string.
+        run_method: ``Component`` method to run when instantiating the ``Component``
+         as runnable.
+        filename: path of the configuration script issuing the registration.
+    """
+
+    name: str
+    namespace: str
+    tags: Tags = None
+    component: Optional[str] = None
+    run_method: Optional[str] = None
+    filename: Optional[Path] = None
+
+
+class RegistrationExtractor(NamespaceExtractor):
+    """
+    Static code analyzer that collects the registrations declared by
+     cinnamon-compliant scripts, besides their namespaces.
+
+    Both ``register_method()`` decorators and ``Registry.register_configuration()``
+     calls within ``register()`` functions are collected.
+    Only registrations whose arguments are literals can be statically determined:
+     the others (e.g., registrations issued in a loop) are skipped.
+    """
+
+    # Positional order of ``Registry.register_configuration()`` arguments
+    REGISTRATION_ARGS = [
+        "config",
+        "name",
+        "namespace",
+        "tags",
+        "component",
+        "run_method",
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.entries: List[CatalogEntry] = []
+
+    def extract(self, filename: Path) -> Tuple[List[str], List[CatalogEntry]]:
+        namespaces = self.process(filename=filename)
+        entries = self.entries
+        self.entries = []
+        return namespaces, entries
+
+    @staticmethod
+    def _literal(node: ast.AST) -> Tuple[bool, Any]:
+        try:
+            return True, ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return False, None
+
+    def _add_entry(self, arguments: dict):
+        values = {}
+        for argument in ["name", "namespace", "tags", "component", "run_method"]:
+            if argument not in arguments:
+                continue
+
+            is_literal, value = self._literal(arguments[argument])
+            if not is_literal:
+                return
+            values[argument] = value
+
+        if not isinstance(values.get("name"), str) or not isinstance(
+            values.get("namespace"), str
+        ):
+            return
+
+        tags = values.get("tags")
+        if tags is not None and not isinstance(tags, (set, list, tuple)):
+            return
+
+        # Namespaces may be given as positional arguments
+        if values["namespace"] not in self.namespaces:
+            self.namespaces.append(values["namespace"])
+
+        self.entries.append(
+            CatalogEntry(
+                name=values["name"],
+                namespace=values["namespace"],
+                tags=set(tags) if tags is not None else None,
+                component=values.get("component"),
+                run_method=values.get("run_method"),
+            )
+        )
+
+    def visit_FunctionDef(self, node):
+        for item in reversed(node.decorator_list):
+            if isinstance(item, ast.Call) and ast.unparse(item.func).endswith(
+                "register_method"
+            ):
+                self._add_entry(
+                    {keyword.arg: keyword.value for keyword in item.keywords}
+                )
+
+        super().visit_FunctionDef(node)
+
+    def visit_Call(self, node):
+        if self.register_flag and ast.unparse(node.func).endswith(
+            "register_configuration"
+        ):
+            arguments = dict(zip(self.REGISTRATION_ARGS, node.args))
+            arguments.update({keyword.arg: keyword.value for keyword in node.keywords})
+            self._add_entry(arguments)
+
+        super().visit_Call(node)
+
+
+def extract_registrations(filename: Path) -> Tuple[List[str], List[CatalogEntry]]:
+    """
+    Statically extracts the namespaces and the registrations declared in a
+     configuration script.
+    This is a module-level function so that it can be dispatched to worker
+     processes.
+
+    Args:
+        filename: path of the configuration script.
+
+    Returns:
+        namespaces: the list of declared namespaces, in declaration order.
+        entries: the list of statically determined registrations.
+    """
+    return RegistrationExtractor().extract(filename=filename)
+
+
 def match_name(name: str, names: Optional[Union[List[str], str]] = None):
     if names is None:
         return True
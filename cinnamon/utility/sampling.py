@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional
+
+from cinnamon.utility.configuration import Constraint, Variant, VariantSpace
+
+__all__ = [
+    "SamplingPolicy",
+    "FirstSampling",
+    "RandomSampling",
+    "LatinHypercubeSampling",
+    "HaltonSampling",
+]
+
+
+@dataclass(frozen=True)
+class SamplingPolicy(ABC):
+    """
+    Base class of policies selecting a subset of the variant combinations of a
+     ``Configuration``.
+
+    Policies are deterministic: the same policy applied to the same variant space
+     with the same ``salt`` always selects the same combinations.
+    Selected combinations are returned in variant space order.
+
+    Args:
+        size: maximum number of combinations to select.
+    """
+
+    size: int
+
+    def __post_init__(self):
+        if self.size < 0:
+            raise ValueError(f"Sampling size must be non-negative. Got {self.size}")
+
+    @abstractmethod
+    def select(self, space: VariantSpace, salt: str) -> List[int]:
+        """
+        Selects combination positions from a variant space.
+        Only called when the space has more than ``size`` combinations.
+
+        Args:
+            space: the variant space.
+            salt: string identifying the sampled space (e.g., the registration key
+             string format) to draw different samples for different spaces.
+
+        Returns:
+            The list of selected positions.
+        """
+
+    def sample(
+        self,
+        space: VariantSpace,
+        salt: str = "",
+        constraints: Optional[List[Constraint]] = None,
+    ) -> Iterator[Variant]:
+        """
+        Samples combinations from a variant space.
+
+        When constraints are given, only satisfying combinations are selected.
+        Since the policy selects positions without knowing the constraints, larger
+         samples are drawn until ``size`` satisfying combinations are found or the
+         whole space has been drawn.
+
+        Args:
+            space: the variant space.
+            salt: string identifying the sampled space.
+            constraints: (read fields, predicate) pairs the selected combinations
+             must satisfy.
+
+        Returns:
+            An iterator over the selected combinations, in variant space order.
+        """
+        if constraints:
+            indexes = self._select_constrained(
+                space=space, salt=salt, constraints=constraints
+            )
+            return map(space.variant_at, sorted(indexes))
+
+        if len(space) <= self.size:
+            return iter(space)
+
+        indexes = sorted(set(self.select(space=space, salt=salt)))
+        return map(space.variant_at, indexes)
+
+    def _select_constrained(
+        self,
+        space: VariantSpace,
+        salt: str,
+        constraints: List[Constraint],
+    ) -> List[int]:
+        """
+        Selects up to ``size`` positions of combinations satisfying the constraints.
+        The draw size doubles at each round: positions drawn by earlier rounds are
+         preferred, so that the sample stays as close as possible to the one the
+         policy would select without constraints.
+        """
+        checked: Dict[int, bool] = {}
+        draw = self.size
+        while True:
+            if draw < len(space):
+                positions = replace(self, size=draw).select(space=space, salt=salt)
+            else:
+                positions = range(len(space))
+
+            for position in positions:
+                if position not in checked:
+                    checked[position] = space.satisfies(
+                        variant=space.variant_at(position), constraints=constraints
+                    )
+
+            selected = [position for position, valid in checked.items() if valid]
+            if len(selected) >= self.size or draw >= len(space):
+                return selected[: self.size]
+
+            draw *= 2
+
+
+@dataclass(frozen=True)
+class FirstSampling(SamplingPolicy):
+    """
+    Selects the first ``size`` combinations of the variant space.
+    """
+
+    def select(self, space: VariantSpace, salt: str) -> List[int]:
+        return list(range(self.size))
+
+
+@dataclass(frozen=True)
+class RandomSampling(SamplingPolicy):
+    """
+    Selects ``size`` combinations uniformly at random, without replacement.
+
+    Args:
+        size: number of combinations to select.
+        seed: the random seed. The sample of each variant space is drawn from a
+         generator seeded by both ``seed`` and the space ``salt``.
+    """
+
+    seed: int = 0
+
+    def select(self, space: VariantSpace, salt: str) -> List[int]:
+        generator = random.Random(f"{self.seed}:{salt}")
+        return generator.sample(range(len(space)), self.size)
+
+
+def _unique_positions(
+    space: VariantSpace,
+    points: Iterator[List[float]],
+    size: int,
+) -> List[int]:
+    """
+    Maps points of the unit hypercube to variant space positions, each dimension
+     being a variant field, until ``size`` distinct positions are found or points
+     are exhausted.
+    """
+    positions = {}
+    for point in points:
+        index = space.index_of(
+            [
+                min(int(value * radix), radix - 1)
+                for value, radix in zip(point, space.radices)
+            ]
+        )
+        if index is not None:
+            positions[index] = None
+        if len(positions) == size:
+            break
+
+    return list(positions)
+
+
+@dataclass(frozen=True)
+class LatinHypercubeSampling(SamplingPolicy):
+    """
+    Selects combinations via Latin hypercube sampling: the choices of each field are
+     covered as evenly as possible by the sample.
+    Combinations drawn more than once are selected once: the sample may contain
+     less than ``size`` combinations.
+
+    Args:
+        size: maximum number of combinations to select.
+        seed: the random seed. The sample of each variant space is drawn from a
+         generator seeded by both ``seed`` and the space ``salt``.
+    """
+
+    seed: int = 0
+
+    def select(self, space: VariantSpace, salt: str) -> List[int]:
+        generator = random.Random(f"{self.seed}:{salt}")
+
+        strata = []
+        for _ in space.radices:
+            permutation = list(range(self.size))
+            generator.shuffle(permutation)
+            strata.append(permutation)
+
+        points = (
+            [
+                (permutation[idx] + generator.random()) / self.size
+                for permutation in strata
+            ]
+            for idx in range(self.size)
+        )
+        return _unique_positions(space=space, points=points, size=self.size)
+
+
+def _primes(count: int) -> List[int]:
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % prime for prime in primes):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _radical_inverse(index: int, base: int) -> float:
+    inverse, scale = 0.0, 1.0 / base
+    while index:
+        index, digit = divmod(index, base)
+        inverse += digit * scale
+        scale /= base
+    return inverse
+
+
+@dataclass(frozen=True)
+class HaltonSampling(SamplingPolicy):
+    """
+    Selects combinations via the Halton low-discrepancy sequence: the sample
+     evenly covers the variant space, without clusters or gaps.
+    The sequence does not depend on any seed.
+
+    Args:
+        size: number of combinations to select.
+        max_draws: maximum number of sequence points drawn per requested
+         combination, since distinct points may map to the same combination.
+    """
+
+    max_draws: int = 64
+
+    def select(self, space: VariantSpace, salt: str) -> List[int]:
+        bases = _primes(len(space.radices))
+        points = (
+            [_radical_inverse(index=idx, base=base) for base in bases]
+            for idx in range(1, self.size * self.max_draws + 1)
+        )
+        return _unique_positions(space=space, points=points, size=self.size)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import io
+import marshal
+import os
+import pickle
+import sys
+import types
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "hash_file",
+    "fingerprint_files",
+    "SnapshotPickler",
+    "SnapshotUnpickler",
+    "serialize",
+    "deserialize",
+    "dump_snapshot",
+    "load_snapshot",
+]
+
+logger = getLogger(__name__)
+
+# Bump whenever the layout of the snapshot payload changes
+SNAPSHOT_VERSION = 3
+
+ScriptLoader = Callable[[Path], types.ModuleType]
+
+
+def hash_file(filename: Path) -> str:
+    """
+    Computes the SHA-256 content hash of a file.
+
+    Args:
+        filename: path of the file to hash.
+
+    Returns:
+        The hexadecimal digest of the file content.
+    """
+    with filename.open("rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def fingerprint_files(filenames: Iterable[Path]) -> Dict[str, str]:
+    """
+    Maps each file (as posix string) to its content hash.
+    """
+    return {
+        filename.as_posix(): hash_file(filename)
+        for filename in sorted(filenames, key=lambda item: item.as_posix())
+    }
+
+
+def _make_cell(value: Any = None, empty: bool = False) -> types.CellType:
+    return types.CellType() if empty else types.CellType(value)
+
+
+def _make_function(
+    code: types.CodeType,
+    globals_dict: Dict[str, Any],
+    name: str,
+    defaults: Optional[tuple],
+    kwdefaults: Optional[dict],
+    closure: Optional[tuple],
+    qualname: str,
+) -> types.FunctionType:
+    function = types.FunctionType(code, globals_dict, name, defaults, closure)
+    function.__kwdefaults__ = kwdefaults
+    function.__qualname__ = qualname
+    return function
+
+
+def _resolve_qualname(root: Any, qualname: str) -> Any:
+    current = root
+    for part in qualname.split("."):
+        current = getattr(current, part)
+    return current
+
+
+def _is_importable(obj: Any) -> bool:
+    module = sys.modules.get(getattr(obj, "__module__", None) or "")
+    if module is None:
+        return False
+    try:
+        return _resolve_qualname(module, obj.__qualname__) is obj
+    except AttributeError:
+        return False
+
+
+class SnapshotPickler(pickle.Pickler):
+    """
+    Pickler for registry snapshots.
+
+    Configuration scripts are executed as anonymous modules (they are not part of
+     ``sys.modules``): classes and functions they define are stored by script path
+     and qualified name.
+    Functions that cannot be referenced by name (e.g., lambdas used as conditions)
+     are stored by value through their code object.
+    """
+
+    def __init__(self, file, scripts: Dict[Path, types.ModuleType]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.scripts_by_name: Dict[str, list] = {}
+        self.scripts_by_globals: Dict[int, Path] = {}
+        for path, module in scripts.items():
+            self.scripts_by_name.setdefault(module.__name__, []).append((path, module))
+            self.scripts_by_globals[id(module.__dict__)] = path
+
+    def _find_script_reference(self, obj: Any) -> Optional[tuple]:
+        for path, module in self.scripts_by_name.get(obj.__module__, []):
+            try:
+                if _resolve_qualname(module, obj.__qualname__) is obj:
+                    return "script", path.as_posix(), obj.__qualname__
+            except AttributeError:
+                continue
+        return None
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        if isinstance(obj, (type, types.FunctionType)) and not _is_importable(obj):
+            return self._find_script_reference(obj)
+
+        if isinstance(obj, dict) and id(obj) in self.scripts_by_globals:
+            return "globals", self.scripts_by_globals[id(obj)].as_posix()
+
+        if isinstance(obj, dict) and obj.get("__name__") in sys.modules:
+            if sys.modules[obj["__name__"]].__dict__ is obj:
+                return "module_globals", obj["__name__"]
+
+        return None
+
+    def reducer_override(self, obj: Any):
+        if isinstance(obj, types.CodeType):
+            return marshal.loads, (marshal.dumps(obj),)
+
+        if isinstance(obj, types.CellType):
+            try:
+                return _make_cell, (obj.cell_contents,)
+            except ValueError:
+                return _make_cell, (None, True)
+
+        if isinstance(obj, types.FunctionType) and not _is_importable(obj):
+            return _make_function, (
+                obj.__code__,
+                obj.__globals__,
+                obj.__name__,
+                obj.__defaults__,
+                obj.__kwdefaults__,
+                obj.__closure__,
+                obj.__qualname__,
+            )
+
+        return NotImplemented
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickler counterpart of ``SnapshotPickler``.
+    Configuration scripts referenced by the snapshot are imported on demand
+     via the provided ``script_loader``.
+    """
+
+    def __init__(self, file, script_loader: ScriptLoader):
+        super().__init__(file)
+        self.script_loader = script_loader
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind = pid[0]
+        if kind == "script":
+            module = self.script_loader(Path(pid[1]))
+            return _resolve_qualname(module, pid[2])
+        if kind == "globals":
+            return self.script_loader(Path(pid[1])).__dict__
+        if kind == "module_globals":
+            return importlib.import_module(pid[1]).__dict__
+        raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+
+
+def serialize(obj: Any, scripts: Dict[Path, types.ModuleType]) -> bytes:
+    """
+    Serializes an object that may reference classes and functions defined in
+     configuration scripts (see ``SnapshotPickler``).
+
+    Args:
+        obj: the object to serialize.
+        scripts: configuration script modules the object may depend on.
+
+    Returns:
+        The serialized object.
+    """
+    buffer = io.BytesIO()
+    SnapshotPickler(buffer, scripts=scripts).dump(obj)
+    return buffer.getvalue()
+
+
+def deserialize(data: bytes, script_loader: ScriptLoader) -> Any:
+    """
+    Deserializes an object serialized via ``serialize()``.
+
+    Args:
+        data: the serialized object.
+        script_loader: callable importing a configuration script from its path.
+
+    Returns:
+        The deserialized object.
+    """
+    return SnapshotUnpickler(io.BytesIO(data), script_loader=script_loader).load()
+
+
+def _build_header(fingerprint: Dict[str, str]) -> Dict[str, Any]:
+    import cinnamon
+
+    return {
+        "format": SNAPSHOT_VERSION,
+        "cinnamon": cinnamon.__version__,
+        "python": tuple(sys.version_info[:2]),
+        "fingerprint": fingerprint,
+    }
+
+
+def dump_snapshot(
+    filename: Path,
+    fingerprint: Dict[str, str],
+    state: Dict[str, Any],
+    scripts: Dict[Path, types.ModuleType],
+) -> bool:
+    """
+    Writes a registry snapshot to disk.
+    The snapshot is written to a temporary file first and then atomically moved
+     to ``filename``.
+
+    Args:
+        filename: path of the snapshot file.
+        fingerprint: content hashes of the configuration scripts the snapshot
+         depends on.
+        state: the registry state to store.
+        scripts: configuration script modules executed during the build.
+
+    Returns:
+        True if the snapshot has been written, False otherwise.
+    """
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp_filename = filename.with_name(f"{filename.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_filename.open("wb") as f:
+            pickle.dump(_build_header(fingerprint), f)
+            SnapshotPickler(f, scripts=scripts).dump(state)
+        os.replace(tmp_filename, filename)
+    except Exception as e:
+        logger.warning(f"Could not write registry snapshot {filename}. {e}")
+        tmp_filename.unlink(missing_ok=True)
+        return False
+
+    return True
+
+
+def load_snapshot(
+    filename: Path,
+    script_loader: ScriptLoader,
+    fingerprint: Optional[Dict[str, str]] = None,
+) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+    """
+    Loads a registry snapshot from disk.
+
+    Args:
+        filename: path of the snapshot file.
+        script_loader: callable importing a configuration script from its path.
+        fingerprint: current content hashes of the configuration scripts.
+         If given, the snapshot is discarded when it has been built from
+         different scripts.
+
+    Returns:
+        The content hashes the snapshot has been built from and the stored
+         registry state, or None if the snapshot does not exist, is stale or
+         cannot be loaded.
+    """
+    if not filename.is_file():
+        return None
+
+    try:
+        with filename.open("rb") as f:
+            header = pickle.load(f)
+            stored_fingerprint = header.get("fingerprint")
+            if header != _build_header(stored_fingerprint) or (
+                fingerprint is not None and stored_fingerprint != fingerprint
+            ):
+                logger.info(f"Registry snapshot {filename} is stale.")
+                return None
+            state = SnapshotUnpickler(f, script_loader=script_loader).load()
+    except Exception as e:
+        logger.warning(f"Could not load registry snapshot {filename}. {e}")
+        return None
+
+    return stored_fingerprint, state
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import itertools
+import sys
+from typing import Any, Dict, Iterable, Iterator, Set, Tuple, Union
+
+__all__ = ["TagPath", "Tag", "TagNode", "TagTrie", "TAG_TRIE", "to_value"]
+
+# Tag path: e.g., ("model", "kernel") for model.kernel=linear
+TagPath = Tuple[str, ...]
+
+_LITERALS = {"True": True, "False": False, "None": None}
+
+_UNSET = object()
+
+
+def to_value(text: str) -> Any:
+    """
+    Infers the typed value of a compound tag from its string format.
+
+    Args:
+        text: the string format of the value (e.g., ``1.0`` for ``C=1.0``).
+
+    Returns:
+        The corresponding ``bool``, ``None``, ``int`` or ``float`` value, or the
+         string itself.
+    """
+    if text in _LITERALS:
+        return _LITERALS[text]
+
+    try:
+        return int(text)
+    except ValueError:
+        pass
+
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+class Tag:
+    """
+    Structured registration key tag: a path in a ``TagTrie`` and an optional value.
+    Plain tags (e.g., ``default``) have no value, while compound tags
+     (e.g., ``C=1.0``) do.
+    Tags of dependencies are prefixed by the dependency parameter name
+     (e.g., ``model.kernel=linear`` has path ``("model", "kernel")``).
+
+    Tags are interned by their ``TagTrie``: equal tags are the same object.
+    The (interned) string format is computed once per tag, and shared by all
+     keys having the tag. The typed value is computed on first use only.
+    """
+
+    __slots__ = ("node", "text", "string", "order", "_value")
+
+    _ORDER = itertools.count()
+
+    def __init__(self, node: TagNode, text: str | None, string: str):
+        """
+
+        Args:
+            node: the ``TagNode`` of the tag path.
+            text: the string format of the tag value, or None for plain tags.
+            string: the string format of the tag.
+        """
+        self.node = node
+        self.text = text
+        self.string = sys.intern(string)
+        # Creation order: a canonical tag order within a process
+        self.order = next(self._ORDER)
+        self._value = _UNSET
+
+    @property
+    def path(self) -> TagPath:
+        return self.node.path
+
+    @property
+    def is_compound(self) -> bool:
+        return self.text is not None
+
+    @property
+    def is_hierarchy(self) -> bool:
+        return len(self.node.path) > 1
+
+    @property
+    def value(self) -> Any:
+        """
+        The typed value of a compound tag (see ``to_value()``), or None for plain
+         tags.
+        """
+        if self._value is _UNSET:
+            self._value = None if self.text is None else to_value(self.text)
+        return self._value
+
+    def __str__(self) -> str:
+        return self.string
+
+    def __repr__(self) -> str:
+        return f"{Tag.__name__}({self.string!r})"
+
+    def __reduce__(self):
+        return _parse_tag, (self.string,)
+
+    def __copy__(self) -> Tag:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Tag:
+        return self
+
+
+class TagNode:
+    """
+    Node of a ``TagTrie``, identified by its tag path.
+    Each node stores the tags having its path, by value string format.
+    """
+
+    __slots__ = ("trie", "label", "path", "children", "tags")
+
+    def __init__(self, trie: TagTrie, label: str | None, path: TagPath):
+        self.trie = trie
+        self.label = label
+        self.path = path
+        self.children: Dict[str, TagNode] = {}
+        self.tags: Dict[str | None, Tag] = {}
+
+    def child(self, label: str) -> TagNode:
+        node = self.children.get(label)
+        if node is None:
+            node = TagNode(trie=self.trie, label=label, path=(*self.path, label))
+            self.children[label] = node
+        return node
+
+    def tag(self, text: str | None = None, string: str | None = None) -> Tag:
+        """
+        Retrieves the tag of this node with the given value string format, creating
+         it if missing.
+
+        Args:
+            text: the string format of the tag value, or None for plain tags.
+            string: the string format of the tag, if known.
+        """
+        tag = self.tags.get(text)
+        if tag is None:
+            if string is None:
+                string = self.trie.HIERARCHY_SEPARATOR.join(self.path)
+                if text is not None:
+                    string = f"{string}{self.trie.KEY_VALUE_SEPARATOR}{text}"
+            tag = Tag(node=self, text=text, string=string)
+            self.tags[text] = tag
+        return tag
+
+    def walk(self) -> Iterator[Tag]:
+        """
+        Iterates over the tags of this node and of all its descendants, i.e. the
+         tags whose path starts with this node path.
+        """
+        yield from self.tags.values()
+        for child in list(self.children.values()):
+            yield from child.walk()
+
+
+class TagTrie:
+    """
+    Trie of tag paths, interning ``Tag`` instances.
+    Tags sharing a path prefix (e.g., the tags of a dependency) share trie nodes.
+
+    Tags are never removed from the trie: they are shared by all registration
+     keys, and re-creating a removed tag would break key equality.
+    """
+
+    KEY_VALUE_SEPARATOR: str = "="
+    HIERARCHY_SEPARATOR: str = "."
+
+    def __init__(self):
+        self.root = TagNode(trie=self, label=None, path=())
+        self._parsed: Dict[str, Tag] = {}
+        self._prefixed: Dict[Tuple[str, Tag], Tag] = {}
+
+    def node(self, path: TagPath) -> TagNode:
+        """
+        Retrieves the node of a path, creating it if missing.
+        """
+        node = self.root
+        for label in path:
+            node = node.child(label)
+        return node
+
+    def find(self, path: TagPath) -> TagNode | None:
+        """
+        Retrieves the node of a path, if any.
+        """
+        node = self.root
+        for label in path:
+            node = node.children.get(label)
+            if node is None:
+                return None
+        return node
+
+    def tag(self, path: TagPath, text: str | None = None) -> Tag:
+        """
+        Retrieves the tag with the given path and value string format.
+        """
+        return self.node(path).tag(text)
+
+    def split(self, string: str) -> Tuple[TagPath, str | None]:
+        """
+        Splits the string format of a tag into its path and value string format.
+        """
+        path, separator, text = string.partition(self.KEY_VALUE_SEPARATOR)
+        return tuple(path.split(self.HIERARCHY_SEPARATOR)), text if separator else None
+
+    def parse(self, string: str) -> Tag:
+        """
+        Retrieves the tag with the given string format (e.g., ``model.kernel=linear``).
+        Parsed string formats are memoized.
+        """
+        tag = self._parsed.get(string)
+        if tag is None:
+            string = str(string)
+            path, text = self.split(string)
+            tag = self.node(path).tag(text=text, string=string)
+            self._parsed[tag.string] = tag
+        return tag
+
+    def parse_many(self, tags: Iterable[Union[str, Tag]]) -> Set[Tag]:
+        """
+        Retrieves the tags with the given string formats. ``Tag`` instances are
+         retrieved as they are.
+        """
+        parsed = self._parsed
+        result = set()
+        for tag in tags:
+            if tag.__class__ is not Tag:
+                tag = parsed.get(tag) or self.parse(tag)
+            result.add(tag)
+        return result
+
+    def lookup(self, string: str) -> Tag | None:
+        """
+        Retrieves the tag with the given string format, if it exists.
+        Unlike ``parse()``, no tag is created.
+        """
+        tag = self._parsed.get(string)
+        if tag is not None:
+            return tag
+
+        path, text = self.split(str(string))
+        node = self.find(path)
+        return node.tags.get(text) if node is not None else None
+
+    def prefixed(self, label: str, tag: Tag) -> Tag:
+        """
+        Retrieves the tag obtained by prefixing a tag path with a label: e.g., the
+         tag ``model.kernel=linear`` from the ``kernel=linear`` tag of the ``model``
+         dependency.
+        """
+        prefixed = self._prefixed.get((label, tag))
+        if prefixed is None:
+            prefixed = self.node((label, *tag.path)).tag(
+                text=tag.text,
+                string=f"{label}{self.HIERARCHY_SEPARATOR}{tag.string}",
+            )
+            self._prefixed[(label, tag)] = prefixed
+        return prefixed
+
+
+# Shared by all registration keys
+TAG_TRIE = TagTrie()
+
+
+def _parse_tag(string: str) -> Tag:
+    return TAG_TRIE.parse(string)
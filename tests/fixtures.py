@@ -1,4 +1,4 @@
-from typing import Literal, Type
+from typing import Any, Literal, Type
 
 import pytest
 
@@ -43,6 +43,11 @@ class ConfigWithNonTaggableVariants(Configuration):
     x: list[int] = Param([1, 2, 3], variants=[[2, 2]])
 
 
+class ConfigWithMutableVariants(Configuration):
+    items: Any = Param([1, 2])
+    x: Any = Param([1], variants=[[2], [3]])
+
+
 class ConfigWithMultipleVariants(Configuration):
     x: int = Param(1, variants=[2, 3])
     y: int = Param(2, variants=[3, 4])
@@ -3,15 +3,23 @@ from typing import Callable
 import pydantic
 import pytest
 
-from cinnamon.configuration import Configuration
+from cinnamon.configuration import Configuration, Param
 from cinnamon.registry import RegistrationKey
 from cinnamon.utility.exceptions import ValidationFailureException
+from cinnamon.utility.sampling import (
+    FirstSampling,
+    HaltonSampling,
+    LatinHypercubeSampling,
+    RandomSampling,
+    SamplingPolicy,
+)
 from tests.fixtures import (
     BaseConfig,
     ConfigWithMultipleVariants,
     ConfigWithVariants,
     InvalidConfig,
     NestedConfig,
+    VariantConfigWithChild,
 )
 
 
@@ -79,6 +87,174 @@ def test_variants():
             assert getattr(alt_config, key) == value
 
 
+def test_variants_random_access():
+    """
+    Variants can be counted and indexed without being materialized
+    """
+    config = ConfigWithMultipleVariants.default()
+
+    combinations = list(config.variants)
+    assert config.variant_count == len(combinations) == 8
+    assert [config.variant_at(idx) for idx in range(8)] == combinations
+    assert config.variants[-1] == combinations[-1]
+    assert config.variants[2:5] == combinations[2:5]
+    assert {"x": 0, "y": 0} not in [comb["indexes"] for comb in combinations]
+
+    with pytest.raises(IndexError):
+        config.variant_at(8)
+
+
+def test_variants_large_space():
+    """
+    Large variant spaces are handled lazily
+    """
+
+    class LargeConfig(Configuration):
+        a: int = Param(0, variants=list(range(1, 1000)))
+        b: int = Param(0, variants=list(range(1, 1000)))
+        c: int = Param(0, variants=list(range(1, 1000)))
+
+    config = LargeConfig.default()
+    assert config.variant_count == 1000**3 - 1
+    assert config.variant_at(0)["values"] == {"a": 0, "b": 0, "c": 1}
+    assert config.variant_at(-1)["values"] == {"a": 999, "b": 999, "c": 999}
+    assert next(iter(config.variants)) == config.variant_at(0)
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        FirstSampling(size=10),
+        RandomSampling(size=10, seed=42),
+        LatinHypercubeSampling(size=10, seed=42),
+        HaltonSampling(size=10),
+    ],
+)
+def test_variants_sampling(policy):
+    """
+    Sampling policies select a deterministic subset of large variant spaces
+    """
+
+    class LargeConfig(Configuration):
+        a: int = Param(0, variants=list(range(1, 1000)))
+        b: int = Param(0, variants=list(range(1, 1000)))
+        c: int = Param(0, variants=list(range(1, 1000)))
+
+    space = LargeConfig.default().variants
+    samples = list(policy.sample(space=space, salt="config"))
+    assert 0 < len(samples) <= 10
+    assert samples == list(policy.sample(space=space, salt="config"))
+
+    values = [tuple(sample["values"].values()) for sample in samples]
+    assert len(set(values)) == len(values)
+    assert (0, 0, 0) not in values
+    assert values == sorted(values)
+
+    # Small spaces are not sampled
+    small_space = ConfigWithMultipleVariants.default().variants
+    assert list(policy.sample(space=small_space)) == list(small_space)
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        FirstSampling(size=10),
+        RandomSampling(size=10, seed=42),
+        LatinHypercubeSampling(size=10, seed=42),
+        HaltonSampling(size=10),
+    ],
+)
+def test_variants_sampling_with_constraints(policy):
+    """
+    Sampling policies select ``size`` combinations satisfying the constraints
+    """
+
+    class LargeConfig(Configuration):
+        a: int = Param(0, variants=list(range(1, 100)))
+        b: int = Param(0, variants=list(range(1, 100)))
+
+    space = LargeConfig.default().variants
+    constraints = [({"a", "b"}, lambda values: values["a"] > 90 and values["b"] > 90)]
+    samples = list(policy.sample(space=space, salt="config", constraints=constraints))
+    assert len(samples) == 10
+    assert all(
+        sample["values"]["a"] > 90 and sample["values"]["b"] > 90 for sample in samples
+    )
+
+    # Constraints satisfied by fewer than size combinations select all of them
+    constraints = [({"a", "b"}, lambda values: values["a"] == values["b"] == 99)]
+    samples = list(policy.sample(space=space, salt="config", constraints=constraints))
+    assert [sample["values"] for sample in samples] == [{"a": 99, "b": 99}]
+
+
+def test_sampling_policy_is_abstract():
+    """
+    Sampling policies must define how combinations are selected
+    """
+
+    with pytest.raises(TypeError):
+        SamplingPolicy(size=10)
+
+    class NoSelectSampling(SamplingPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        NoSelectSampling(size=10)
+
+
+def test_variants_latin_hypercube_coverage():
+    """
+    Latin hypercube samples cover the choices of each field evenly
+    """
+
+    class GridConfig(Configuration):
+        a: int = Param(0, variants=list(range(1, 100)))
+        b: int = Param(0, variants=list(range(1, 100)))
+
+    space = GridConfig.default().variants
+    samples = list(LatinHypercubeSampling(size=10).sample(space=space))
+    assert len(samples) == 10
+    for field in ["a", "b"]:
+        strata = {sample["values"][field] // 10 for sample in samples}
+        assert strata == set(range(10))
+
+
+def test_variants_constrained():
+    """
+    Conditions declaring their fields prune the variant space on partial assignments
+    """
+
+    class GridConfig(Configuration):
+        a: int = Param(0, variants=list(range(1, 10)))
+        b: int = Param(0, variants=list(range(1, 10)))
+        c: int = Param(0, variants=list(range(1, 10)))
+
+    config = GridConfig.default()
+    calls = []
+
+    def condition(c):
+        calls.append(1)
+        return c.a < c.b
+
+    config.add_condition(name="a_lt_b", condition=condition, fields=["a", "b"])
+    constraints = config.variant_constraints
+    assert len(constraints) == 1
+
+    combinations = list(config.variants.constrained(constraints))
+    expected = [
+        combination
+        for combination in config.variants
+        if combination["values"]["a"] < combination["values"]["b"]
+    ]
+    assert combinations == expected
+
+    # The condition is checked once per (a, b) pair, not once per combination
+    assert len(calls) == 100
+
+    with pytest.raises(KeyError):
+        config.add_condition(name="unknown", condition=condition, fields=["d"])
+
+
 def test_copy_with_custom_condition():
     config = Configuration.default()
     config.add_condition(name="test-condition", condition=lambda c: True)
@@ -123,6 +299,173 @@ def test_get_delta_copy_built_nested():
     assert copy_config.child.y == 20
 
 
+def test_overlay():
+    """
+    Overlays share non-updated field values with their base configuration until
+     they are detached
+    """
+    config = NestedConfig.default()
+    config.add_condition(name="positive", condition=lambda c: c.x > 0)
+    overlay = config.overlay(update={"x": "5"})
+    assert overlay.x == 5
+    assert config.x == 10
+    assert overlay.child is config.child
+
+    # Detaching copies shared mutable values once
+    child = overlay.detach().child
+    assert child == config.child
+    assert child is not config.child
+    assert overlay.detach().child is child
+    child.y = 20
+    assert config.child.y != 20
+    assert overlay.validate_conditions(strict=False).passed
+
+    # Assignments and conditions are local to the overlay
+    overlay.child = None
+    overlay.add_condition(name="small", condition=lambda c: c.x < 3)
+    assert config.child is not None
+    assert "small" not in config._conditions
+    assert not overlay.validate_conditions(strict=False).passed
+
+    with pytest.raises(pydantic.ValidationError):
+        config.overlay(update={"x": "not an int"})
+
+
+def test_model_copy_field_level_validation():
+    """
+    Copies only validate updated fields, and field validators see other fields
+    """
+
+    class BoundedConfig(Configuration):
+        low: int = 0
+        high: int = 10
+
+        @pydantic.field_validator("high")
+        @classmethod
+        def check_high(cls, value, info):
+            if value < info.data["low"]:
+                raise ValueError("high must not be lower than low")
+            return value
+
+    config = BoundedConfig.default()
+    config.add_condition(name="positive", condition=lambda c: c.high > 0)
+    assert BoundedConfig.update_validator(update={"high": 5}) is not None
+
+    copy = config.model_copy(update={"high": "5"})
+    assert copy.high == 5
+    assert config.high == 10
+    assert copy.model_fields_set >= {"high"}
+    assert "positive" in copy._conditions
+
+    with pytest.raises(pydantic.ValidationError):
+        config.model_copy(update={"high": -1})
+    with pytest.raises(pydantic.ValidationError):
+        config.model_copy(update={"low": "not an int"})
+
+
+def test_model_copy_full_validation():
+    """
+    Classes declaring model validators are validated as a whole on copy
+    """
+
+    class CheckedConfig(Configuration):
+        low: int = 0
+        high: int = 10
+
+        @pydantic.model_validator(mode="after")
+        def check_bounds(self):
+            if self.high < self.low:
+                raise ValueError("high must not be lower than low")
+            return self
+
+    config = CheckedConfig.default()
+    assert CheckedConfig.update_validator(update={"low": 5}) is None
+    assert config.model_copy(update={"low": 5}).low == 5
+    with pytest.raises(pydantic.ValidationError):
+        config.model_copy(update={"low": 20})
+
+
+def test_overlay_full_validation():
+    """
+    Classes declaring model validators are validated once the whole update is
+     applied to an overlay
+    """
+
+    class CheckedConfig(Configuration):
+        low: int = Param(0, variants=[5])
+        high: int = Param(1, variants=[6])
+
+        @pydantic.model_validator(mode="after")
+        def check_bounds(self):
+            if self.high <= self.low:
+                raise ValueError("high must be greater than low")
+            return self
+
+    config = CheckedConfig.default()
+    config.add_condition(name="positive", condition=lambda c: c.low >= 0)
+    overlay = config.overlay(update={"low": 5, "high": 6})
+    assert (overlay.low, overlay.high) == (5, 6)
+    assert (config.low, config.high) == (0, 1)
+    assert "positive" in overlay._conditions
+
+    with pytest.raises(pydantic.ValidationError):
+        config.overlay(update={"low": 5})
+    with pytest.raises(pydantic.ValidationError):
+        config.overlay(update={"unknown": 5})
+
+
+def test_field_plan():
+    """
+    Field plans are computed once per class, while dependencies are also detected
+     from field values
+    """
+    plan = VariantConfigWithChild.field_plan()
+    assert plan is VariantConfigWithChild.field_plan()
+    assert plan.fields == ("x", "c1")
+    assert plan.dependency_fields == {"c1"}
+    assert plan.variant_fields == ("x",)
+    assert VariantConfigWithChild.meta is plan.meta
+
+    config = NestedConfig.default()
+    assert NestedConfig.field_plan().dependency_fields == frozenset()
+    assert list(config.dependencies) == ["child"]
+    assert config.meta is config.meta
+    config.meta.x.tags = {"number"}
+    assert config.model_copy().meta.x.tags == set()
+
+    # Instance metadata is not part of the class plan
+    config.meta.x.variants = [1, 2]
+    assert config.has_variants
+    assert not NestedConfig.default().has_variants
+
+
+def test_shared_field_meta():
+    """
+    Instances share class metadata until it is modified via meta
+    """
+    config = ConfigWithVariants.default()
+    class_meta = ConfigWithVariants.meta.x
+    assert config.field_meta(field_name="x") is class_meta
+    assert config.has_variants
+
+    # Reads do not copy the class metadata, which cannot be modified in place
+    assert config.meta.x.variants == (2, 3)
+    assert config.meta["x"].tags == set()
+    assert config.field_meta(field_name="x") is class_meta
+    with pytest.raises(AttributeError):
+        config.meta.x.variants.append(100)
+
+    config.meta.x.variants = [*config.meta.x.variants, 100]
+    config.meta.x.variants.append(200)
+    assert config.meta.x.variants == [2, 3, 100, 200]
+    assert config.field_meta(field_name="x") is not class_meta
+    assert class_meta.variants == [2, 3]
+    assert ConfigWithVariants.default().field_meta(field_name="x") is class_meta
+
+    with pytest.raises(KeyError):
+        config.field_meta(field_name="missing")
+
+
 def test_to_value_dict():
     config = BaseConfig.default()
     value_dict = config.model_dump()
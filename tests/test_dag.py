@@ -0,0 +1,150 @@
+import pickle
+import random
+
+import pytest
+
+from cinnamon.utility.dag import DAG
+
+
+def test_dag_edges():
+    dag = DAG()
+    dag.add_edge("a", "b", edge_type="child")
+    dag.add_edge("a", "c", edge_type="variant")
+    dag.add_edge("b", "c", edge_type="child")
+
+    assert len(dag) == 3
+    assert len(dag.edges) == 3
+    assert ("a", "b") in dag.edges
+    assert ("b", "a") not in dag.edges
+    assert dag.successors("a") == ["b", "c"]
+    assert dag.successors("a", edge_type="variant") == ["c"]
+    assert dag.predecessors("c", edge_type="child") == ["b"]
+    assert dag.in_edges("c") == [("a", "c", "variant"), ("b", "c", "child")]
+
+    # Existing edges are updated
+    dag.add_edge("a", "c", edge_type="child")
+    assert len(dag.edges) == 3
+    assert dag.successors("a", edge_type="variant") == []
+
+
+def test_dag_topological_sort():
+    dag = DAG()
+    dag.add_edge("c", "d")
+    dag.add_edge("b", "c")
+    dag.add_edge("a", "b")
+    dag.add_node("e")
+
+    order = dag.topological_sort()
+    assert sorted(order) == ["a", "b", "c", "d", "e"]
+    for source, target in dag.edges:
+        assert order.index(source) < order.index(target)
+
+    assert dag.descendants("b") == {"c", "d"}
+    assert dag.ancestors("c") == {"a", "b"}
+    assert dag.isolates() == ["e"]
+
+
+def test_dag_cycle():
+    dag = DAG()
+    dag.add_edge("a", "b")
+    dag.add_edge("b", "c")
+    assert dag.is_acyclic()
+
+    dag.add_edge("c", "a")
+    assert not dag.is_acyclic()
+    with pytest.raises(ValueError):
+        dag.topological_sort()
+
+    # Removing a node of the cycle restores a topological order
+    dag.remove_node("b")
+    assert dag.is_acyclic()
+    assert dag.topological_sort() == ["c", "a"]
+
+
+def test_dag_remove_nodes():
+    dag = DAG()
+    dag.add_edge("a", "b")
+    dag.add_edge("a", "c")
+    dag.add_edge("b", "d")
+    dag.add_edge("c", "d")
+
+    dag.remove_nodes_from(["b", "c", "missing"])
+    assert sorted(dag) == ["a", "d"]
+    assert len(dag.edges) == 0
+    assert dag.successors("a") == []
+    assert dag.predecessors("d") == []
+    assert sorted(dag.isolates()) == ["a", "d"]
+
+
+def test_dag_pickle():
+    dag = DAG()
+    dag.add_edge("a", "b", edge_type="child")
+    dag.topological_sort()
+
+    loaded = pickle.loads(pickle.dumps(dag))
+    assert loaded.topological_sort() == ["a", "b"]
+    assert loaded.successors("a", edge_type="child") == ["b"]
+
+
+def test_dag_to_networkx():
+    nx = pytest.importorskip("networkx")
+
+    dag = DAG()
+    dag.add_edge("a", "b", edge_type="child")
+    dag.add_edge("a", "c", edge_type="variant")
+
+    graph = dag.to_networkx()
+    assert isinstance(graph, nx.DiGraph)
+    assert set(graph.nodes) == {"a", "b", "c"}
+    assert graph.edges["a", "c"]["type"] == "variant"
+
+
+def test_dag_reachability():
+    rng = random.Random(0)
+    nodes = range(200)
+
+    # Edges follow a random rank, not the insertion order: the topological order
+    # is repeatedly updated
+    ranks = rng.sample(nodes, len(nodes))
+    dag = DAG()
+    for node in nodes:
+        dag.add_node(node)
+    for _ in range(600):
+        source, target = sorted(rng.sample(nodes, 2), key=ranks.__getitem__)
+        dag.add_edge(source, target, edge_type=rng.choice(["child", "variant"]))
+
+    order = {node: position for position, node in enumerate(dag.topological_sort())}
+    assert all(order[source] < order[target] for source, target in dag.edges)
+
+    for edge_type in [None, "child"]:
+        index = dag.reachability(edge_type=edge_type)
+        reverse_index = dag.reachability(edge_type=edge_type, reverse=True)
+        descendants = {
+            node: dag.descendants(node, edge_type=edge_type) for node in nodes
+        }
+        for node in nodes:
+            reachable = index.reachable(node)
+            assert len(reachable) == len(descendants[node])
+            assert set(reachable) == descendants[node]
+            # Each node follows the nodes it reaches
+            for position, other in enumerate(reachable):
+                assert not descendants[other].intersection(reachable[position + 1 :])
+
+            for other in nodes:
+                assert index.reaches(node, other) == (other in descendants[node])
+
+            ancestors = {other for other in nodes if node in descendants[other]}
+            assert set(reverse_index.reachable(node)) == ancestors
+
+
+def test_dag_reachability_invalidation():
+    dag = DAG()
+    dag.add_edge("a", "b")
+    assert dag.reachability().reachable("a") == ["b"]
+
+    dag.add_edge("b", "c")
+    assert dag.reachability().reachable("a") == ["c", "b"]
+    assert dag.reachability(reverse=True).reachable("c") == ["a", "b"]
+
+    dag.remove_node("b")
+    assert dag.reachability().reachable("a") == []
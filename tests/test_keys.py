@@ -1,7 +1,13 @@
+import copy
 import json
+import pickle
+import sys
 from pathlib import Path
 
+import pytest
+
 from cinnamon.registry import RegistrationKey
+from cinnamon.utility.tags import TAG_TRIE
 from tests.fixtures import (
     ConfigWithChild,
     ConfigWithNonTaggableVariants,
@@ -108,4 +114,123 @@ def test_tags_simplification():
 def test_key_pydantic_serializable():
     config = ConfigWithChild()
     config_json = config.model_dump_json()
-    assert config_json == '{"c1":"name=test--tags=[\'t2\']--namespace=testing"}'
\ No newline at end of file
+    assert config_json == '{"c1":"name=test--tags=[\'t2\']--namespace=testing"}'
+
+def test_key_interning():
+    key = RegistrationKey(name="test", tags={"tag1", "tag2"}, namespace="testing")
+    other = RegistrationKey(name="test", tags=["tag2", "tag1"], namespace="testing")
+    assert other is key
+    assert RegistrationKey.parse(str(key)) is key
+    assert copy.deepcopy(key) is key
+    assert pickle.loads(pickle.dumps(key)) is key
+    assert RegistrationKey(name="test", namespace="testing") is not key
+
+    assert isinstance(key.tags, frozenset)
+    with pytest.raises(AttributeError):
+        key.name = "other"
+    with pytest.raises(AttributeError):
+        key.tags = set()
+
+    # Annotations are shared by all references
+    key.metadata = "invalid"
+    other = RegistrationKey(name="test", tags={"tag1", "tag2"}, namespace="testing")
+    assert other.metadata == "invalid"
+
+
+def test_key_compact_layout():
+    key = RegistrationKey(name="test", tags={"tag1"}, namespace="testing")
+    other = RegistrationKey(name="test", tags={"tag2"}, namespace="testing")
+    assert not hasattr(key, "__dict__")
+
+    # Tags and special tags are shared, special tags are owned by the registry
+    assert key.special_tags is other.special_tags is RegistrationKey.EMPTY_TAGS
+    with pytest.raises(AttributeError):
+        key.special_tags = {"__runnable"}
+    assert next(iter(key.tags)) is sys.intern("".join(["tag", "1"]))
+
+    # Metadata is only stored for keys that have it
+    assert key not in RegistrationKey._METADATA
+    key.metadata = "invalid"
+    assert RegistrationKey._METADATA[key] == "invalid"
+    key.metadata = None
+    assert key not in RegistrationKey._METADATA
+
+
+def test_key_from_string_round_trip():
+    for tags in [
+        None,
+        {"tag"},
+        {"x=2", "child.y=True"},
+        {"a--b"},
+        {"it's", "back\\slash"},
+    ]:
+        key = RegistrationKey(name="test", tags=tags, namespace="testing")
+        assert RegistrationKey.from_string(str(key)) is key
+
+    key = RegistrationKey.from_string(
+        "name=test--namespace=testing--description=a test"
+    )
+    assert key == RegistrationKey(name="test", namespace="testing")
+    assert key.description == "a test"
+
+    for string_format in [
+        "name",
+        "name=test--",
+        "name=test--tags=[tag]--namespace=testing",
+    ]:
+        with pytest.raises(ValueError):
+            RegistrationKey.from_string(string_format)
+
+
+def test_key_parse_many():
+    keys = [
+        RegistrationKey(name="test", tags={f"x={idx}"}, namespace="testing")
+        for idx in range(100)
+    ]
+    strings = [str(key) for key in keys] * 3 + [keys[0]]
+    parsed = RegistrationKey.parse_many(strings)
+    assert parsed == keys * 3 + [keys[0]]
+    assert all(parsed_key is key for parsed_key, key in zip(parsed, keys))
+
+
+def test_key_structured_tags():
+    child_key = RegistrationKey(
+        name="child", tags={"kernel=linear", "default"}, namespace="testing"
+    )
+    key = RegistrationKey(name="test", tags={"tag"}, namespace="testing").from_variant(
+        variant_kwargs={"C": 1.0, "seed": 42, "verbose": True, "model": child_key},
+    )
+
+    # Structured and parsed tags are the same
+    assert RegistrationKey.from_string(str(key)) is key
+    assert key.tags == {
+        "tag",
+        "C=1.0",
+        "seed=42",
+        "verbose=True",
+        "model.kernel=linear",
+        "model.default",
+    }
+    assert key.compound_tags == {
+        "C=1.0",
+        "seed=42",
+        "verbose=True",
+        "model.kernel=linear",
+    }
+    assert key.hierarchy_tags == {"model.kernel=linear", "model.default"}
+
+    assert key.tag_map == {
+        ("C",): 1.0,
+        ("seed",): 42,
+        ("verbose",): True,
+        ("model", "kernel"): "linear",
+    }
+    assert key.tag_value("model.kernel") == "linear"
+    assert key.tag_value(("seed",)) == 42
+    assert key.tag_value("missing", default=0) == 0
+
+    # Tags are shared and looked up by path prefix
+    tag = TAG_TRIE.parse("model.kernel=linear")
+    assert tag in key.structured_tags
+    assert pickle.loads(pickle.dumps(tag)) is tag
+    assert {str(tag) for tag in TAG_TRIE.find(("model",)).walk()} >= key.hierarchy_tags
@@ -1,3 +1,4 @@
+import shutil
 from pathlib import Path
 
 import pytest
@@ -6,12 +7,19 @@ from cinnamon.registry import (
     RegistrationKey,
     Registry,
 )
+from cinnamon.utility.discovery import FileIndex
 from cinnamon.utility.exceptions import (
     InvalidDirectoryException,
     NamespaceNotFoundException,
 )
 from cinnamon.utility.registration import NamespaceExtractor
-from tests.fixtures import EmptyComponent, reset_registry
+from cinnamon.utility.snapshot import dump_snapshot, load_snapshot
+from tests.fixtures import (
+    BaseConfig,
+    ComponentWithChild,
+    EmptyComponent,
+    reset_registry,
+)
 
 
 def test_parse_configuration_files_with_register():
@@ -108,3 +116,487 @@ def test_deeply_nested_config(reset_registry):
     Registry.load_registrations(directory=directory)
     key = RegistrationKey(name="config", namespace="testing")
     assert Registry.in_registry(key)
+
+
+def test_build_with_cache(reset_registry, tmp_path, monkeypatch):
+    """
+    Build the registry twice with caching enabled: the second build must be
+     restored from the on-disk snapshot without loading registrations
+    """
+    directory = Path(".", "tests", "ext_repo_nested_dec")
+    valid_keys, invalid_keys = Registry.build(
+        directory=directory, cache=True, cache_directory=tmp_path
+    )
+    assert tmp_path.joinpath(Registry._SNAPSHOT_FILENAME).is_file()
+
+    def fail_loading(*args, **kwargs):
+        raise AssertionError("Registrations should not be loaded")
+
+    monkeypatch.setattr(Registry, "load_registrations", fail_loading)
+    cached_valid_keys, cached_invalid_keys = Registry.build(
+        directory=directory, cache=True, cache_directory=tmp_path
+    )
+    assert cached_valid_keys == valid_keys
+    assert cached_invalid_keys == invalid_keys
+
+    key = RegistrationKey(name="config", tags={"nest1"}, namespace="testing")
+    assert isinstance(Registry.instantiate(registration_key=key), EmptyComponent)
+
+
+def test_build_with_cache_runnable_keys(reset_registry, tmp_path, monkeypatch):
+    """
+    Runnable keys restored from the registry snapshot keep their special tags
+    """
+    configurations = tmp_path.joinpath("repo", "configurations")
+    configurations.mkdir(parents=True)
+    configurations.joinpath("runnable.py").write_text(
+        "from cinnamon.configuration import Configuration\n"
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ConfigWithVariants\n\n\n"
+        "@register\n"
+        "def register_configurations():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ConfigWithVariants.default(), name='model',"
+        " namespace='testing', run_method='run'\n"
+        "    )\n"
+        "    Registry.register_configuration(\n"
+        "        config=Configuration.default(), name='data', namespace='testing'\n"
+        "    )\n"
+    )
+
+    directory = tmp_path.joinpath("repo")
+    cache_directory = tmp_path.joinpath("cache")
+    Registry.build(directory=directory, cache=True, cache_directory=cache_directory)
+    runnable_keys = Registry.retrieve_runnable_keys()
+    assert len(runnable_keys) == 3
+
+    def fail_loading(*args, **kwargs):
+        raise AssertionError("Registrations should not be loaded")
+
+    Registry.initialize()
+    monkeypatch.setattr(Registry, "load_registrations", fail_loading)
+    Registry.build(directory=directory, cache=True, cache_directory=cache_directory)
+    assert Registry.retrieve_runnable_keys() == runnable_keys
+    assert Registry.query("special_tag:__runnable") == runnable_keys
+
+
+def test_build_with_stale_cache(reset_registry, tmp_path, monkeypatch):
+    """
+    Changing a configuration script invalidates the registry snapshot
+    """
+    directory = tmp_path.joinpath("repo")
+    shutil.copytree(Path(".", "tests", "external_test_repo"), directory)
+    Registry.build(directory=directory, cache=True)
+
+    script = directory.joinpath("configurations", "test2.py")
+    script.write_text(script.read_text().replace("test2", "test3"))
+
+    loaded_directories = []
+    load_registrations = Registry.load_registrations
+
+    def track_loading(directory):
+        loaded_directories.append(directory)
+        return load_registrations(directory=directory)
+
+    monkeypatch.setattr(Registry, "load_registrations", track_loading)
+    valid_keys, _ = Registry.build(directory=directory, cache=True)
+    assert len(loaded_directories) == 1
+    assert RegistrationKey(name="test3", namespace="external") in valid_keys
+    assert RegistrationKey(name="test2", namespace="external") not in valid_keys
+
+
+def test_snapshot_with_lambda_conditions(tmp_path):
+    """
+    Conditions defined as lambdas (with closures) survive a snapshot round-trip
+    """
+    threshold = 7
+    config = BaseConfig.default()
+    config.add_condition(name="x_bound", condition=lambda c: c.x < threshold)
+
+    filename = tmp_path.joinpath("snapshot.pkl")
+    assert dump_snapshot(
+        filename=filename, fingerprint={}, state={"config": config}, scripts={}
+    )
+
+    _, state = load_snapshot(
+        filename=filename, fingerprint={}, script_loader=Registry.import_script
+    )
+    restored = state["config"]
+    assert restored.validate_conditions(strict=False).passed
+    assert (
+        not restored.model_copy(update={"x": 8})
+        .validate_conditions(strict=False)
+        .passed
+    )
+    assert (
+        load_snapshot(
+            filename=filename,
+            fingerprint={"changed.py": "hash"},
+            script_loader=Registry.import_script,
+        )
+        is None
+    )
+
+
+def _write_incremental_repo(directory: Path):
+    configurations = directory.joinpath("configurations")
+    configurations.mkdir(parents=True)
+    configurations.joinpath("parent.py").write_text(
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ConfigWithChild\n\n\n"
+        "@register\n"
+        "def register_parent():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ConfigWithChild.default(), name='parent', namespace='testing'\n"
+        "    )\n"
+    )
+    configurations.joinpath("child.py").write_text(
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ChildConfig\n\n\n"
+        "@register\n"
+        "def register_child():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ChildConfig.default(), name='test', tags={'t2'},"
+        " namespace='testing'\n"
+        "    )\n"
+    )
+    configurations.joinpath("other.py").write_text(
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ConfigWithVariants\n\n\n"
+        "@register\n"
+        "def register_other():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ConfigWithVariants.default(), name='other',"
+        " namespace='testing'\n"
+        "    )\n"
+    )
+    return configurations
+
+
+def _track_loaded_scripts(monkeypatch) -> list:
+    loaded_scripts = []
+    load_script = Registry.load_script
+
+    def track_loading(python_script):
+        loaded_scripts.append(python_script.name)
+        return load_script(python_script=python_script)
+
+    monkeypatch.setattr(Registry, "load_script", track_loading)
+    return loaded_scripts
+
+
+def _edit_child_script(configurations: Path):
+    script = configurations.joinpath("child.py")
+    script.write_text(script.read_text().replace("ChildConfig", "ConfigWithVariants"))
+
+
+def test_incremental_build(reset_registry, tmp_path, monkeypatch):
+    """
+    Editing a configuration script only re-loads that script and the scripts
+     registering its dependants
+    """
+    configurations = _write_incremental_repo(directory=tmp_path)
+    valid_keys, invalid_keys = Registry.build(directory=tmp_path, incremental=True)
+    assert len(valid_keys) == 7
+    assert not len(invalid_keys)
+
+    loaded_scripts = _track_loaded_scripts(monkeypatch=monkeypatch)
+    assert Registry.build(directory=tmp_path, incremental=True) == (
+        valid_keys,
+        invalid_keys,
+    )
+    assert not len(loaded_scripts)
+
+    _edit_child_script(configurations=configurations)
+    valid_keys, invalid_keys = Registry.build(directory=tmp_path, incremental=True)
+    assert sorted(loaded_scripts) == ["child.py", "parent.py"]
+
+    full_valid_keys, full_invalid_keys = Registry.build(directory=tmp_path)
+    assert valid_keys == full_valid_keys
+    assert invalid_keys == full_invalid_keys
+    assert Registry.in_registry(RegistrationKey(name="other", namespace="testing"))
+
+
+def test_incremental_build_from_snapshot(reset_registry, tmp_path, monkeypatch):
+    """
+    A stale registry snapshot is incrementally updated
+    """
+    configurations = _write_incremental_repo(directory=tmp_path)
+    Registry.build(directory=tmp_path, cache=True, incremental=True)
+
+    Registry.initialize()
+    _edit_child_script(configurations=configurations)
+    loaded_scripts = _track_loaded_scripts(monkeypatch=monkeypatch)
+    valid_keys, invalid_keys = Registry.build(
+        directory=tmp_path, cache=True, incremental=True
+    )
+    assert sorted(loaded_scripts) == ["child.py", "parent.py"]
+
+    Registry.initialize()
+    full_valid_keys, full_invalid_keys = Registry.build(directory=tmp_path)
+    assert valid_keys == full_valid_keys
+    assert invalid_keys == full_invalid_keys
+
+
+def test_file_index_ignore_patterns(tmp_path):
+    """
+    FileIndex skips default and .cinnamonignore exclusions and includes nested
+     configuration folders
+    """
+    configurations = _write_incremental_repo(directory=tmp_path)
+    configurations.joinpath("nested").mkdir()
+    configurations.joinpath("nested", "extra.py").write_text("")
+    configurations.joinpath("drafts").mkdir()
+    configurations.joinpath("drafts", "draft.py").write_text("")
+    configurations.joinpath("__pycache__").mkdir()
+    configurations.joinpath("__pycache__", "cached.py").write_text("")
+    tmp_path.joinpath("data", "configurations").mkdir(parents=True)
+    tmp_path.joinpath("data", "configurations", "data.py").write_text("")
+    tmp_path.joinpath(".cinnamonignore").write_text(
+        "# local exclusions\ndata/\nconfigurations/drafts/\nother.py\n"
+    )
+
+    index = FileIndex(directory=tmp_path)
+    assert [script.relative_to(tmp_path).as_posix() for script in index] == [
+        "configurations/child.py",
+        "configurations/nested/extra.py",
+        "configurations/parent.py",
+    ]
+
+
+def test_build_walks_directory_once(reset_registry, tmp_path, monkeypatch):
+    """
+    Namespace parsing, fingerprinting and registration loading share a single
+     directory walk
+    """
+    _write_incremental_repo(directory=tmp_path)
+    tmp_path.joinpath(".cinnamonignore").write_text("other.py\n")
+
+    walks = []
+    walk = FileIndex._walk
+
+    def track_walk(self):
+        walks.append(self.directory)
+        return walk(self)
+
+    monkeypatch.setattr(FileIndex, "_walk", track_walk)
+    Registry.build(directory=tmp_path, incremental=True)
+    assert walks == [tmp_path.resolve()]
+    assert Registry.in_registry(RegistrationKey(name="parent", namespace="testing"))
+    assert not Registry.in_registry(RegistrationKey(name="other", namespace="testing"))
+
+
+def test_parse_configuration_files_parallel(reset_registry, monkeypatch):
+    """
+    Parallel parsing yields the same namespaces and mapping as serial parsing
+     and parsed scripts are cached by content hash
+    """
+    directories = [
+        Path(".", "tests", name).resolve()
+        for name in ["external_test_repo", "ext_repo_nested", "ext_repo_dep"]
+    ]
+    Registry._PARSE_CACHE = {}
+    namespaces, mapping = Registry.parse_configuration_files(
+        directories=directories, workers=2
+    )
+
+    monkeypatch.setattr(
+        "cinnamon.registry.extract_registrations",
+        lambda filename: pytest.fail(f"{filename} parsed twice"),
+    )
+    assert Registry.parse_configuration_files(directories=directories) == (
+        namespaces,
+        mapping,
+    )
+
+    monkeypatch.undo()
+    Registry._PARSE_CACHE = {}
+    serial_namespaces, serial_mapping = Registry.parse_configuration_files(
+        directories=directories
+    )
+    assert sorted(namespaces) == sorted(serial_namespaces)
+    assert list(mapping.items()) == list(serial_mapping.items())
+
+
+def test_catalog(reset_registry, monkeypatch):
+    """
+    The static catalog lists literal registrations without executing scripts
+    """
+    monkeypatch.setattr(
+        Registry,
+        "_execute_script",
+        lambda python_script: pytest.fail(f"{python_script} executed"),
+    )
+    directory = Path(".", "tests", "ext_repo_nested_dec")
+    catalog = Registry.catalog(
+        directory=directory,
+        external_directories=[Path(".", "tests", "external_test_repo")],
+    )
+    assert list(catalog) == [
+        RegistrationKey(name="config", tags={"nest1"}, namespace="testing"),
+        RegistrationKey(name="config", tags={"nest2"}, namespace="testing"),
+        RegistrationKey(name="test", namespace="external"),
+        RegistrationKey(name="test2", namespace="external"),
+    ]
+
+    entry = catalog[RegistrationKey(name="test", namespace="external")]
+    assert entry.component == "tests.fixtures.EmptyComponent"
+    assert entry.run_method is None
+    assert entry.filename.name == "test.py"
+    assert not any(key.special_tags for key in catalog)
+
+
+def test_catalog_runnable_and_dynamic_registrations(reset_registry, tmp_path):
+    """
+    Runnable registrations keep their run method and non-literal registrations are
+     skipped
+    """
+    configurations = tmp_path.joinpath("configurations")
+    configurations.mkdir()
+    configurations.joinpath("runnable.py").write_text(
+        "from cinnamon.registry import Registry, register\n\n\n"
+        "@register\n"
+        "def register_configurations():\n"
+        "    Registry.register_configuration(\n"
+        "        Configuration.default(), 'model', 'testing', {'a'}, run_method='run'\n"
+        "    )\n"
+        "    for seed in range(3):\n"
+        "        Registry.register_configuration(\n"
+        "            config=Configuration.default(), name=f'seed_{seed}',"
+        " namespace='testing'\n"
+        "        )\n"
+    )
+
+    catalog = Registry.catalog(directory=tmp_path)
+    assert list(catalog) == [
+        RegistrationKey(name="model", tags={"a"}, namespace="testing")
+    ]
+    assert catalog[list(catalog)[0]].run_method == "run"
+
+
+def test_lazy_build(reset_registry, tmp_path, monkeypatch):
+    """
+    A lazy build only imports the scripts of namespaces that are actually used
+    """
+    configurations = tmp_path.joinpath("configurations")
+    configurations.mkdir()
+    configurations.joinpath("main.py").write_text(
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ConfigWithExternalDependency\n\n\n"
+        "@register\n"
+        "def register_configurations():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ConfigWithExternalDependency.default(),\n"
+        "        component='tests.fixtures.ComponentWithChild',\n"
+        "        name='config',\n"
+        "        namespace='main',\n"
+        "    )\n"
+    )
+    configurations.joinpath("unused.py").write_text(
+        "from cinnamon.registry import Registry, register\n"
+        "from tests.fixtures import ConfigWithVariants\n\n\n"
+        "@register\n"
+        "def register_configurations():\n"
+        "    Registry.register_configuration(\n"
+        "        config=ConfigWithVariants.default(), name='other',"
+        " namespace='unused'\n"
+        "    )\n"
+    )
+    external_directories = [Path(".", "tests", "external_test_repo").resolve()]
+
+    valid_keys, invalid_keys = Registry.build(
+        directory=tmp_path, external_directories=external_directories
+    )
+
+    Registry.initialize()
+    loaded_scripts = _track_loaded_scripts(monkeypatch=monkeypatch)
+    lazy_valid_keys, lazy_invalid_keys = Registry.build(
+        directory=tmp_path, external_directories=external_directories, lazy=True
+    )
+    assert not len(loaded_scripts)
+    assert not len(lazy_valid_keys)
+
+    component = Registry.instantiate(name="config", namespace="main")
+    assert isinstance(component, ComponentWithChild)
+    assert sorted(loaded_scripts) == ["main.py", "test.py", "test2.py"]
+    assert not Registry.in_registry(RegistrationKey(name="other", namespace="unused"))
+
+    Registry.retrieve_keys()
+    assert sorted(loaded_scripts) == ["main.py", "test.py", "test2.py", "unused.py"]
+    assert lazy_valid_keys == valid_keys
+    assert lazy_invalid_keys == invalid_keys
+
+
+def test_expand_on_demand(reset_registry, tmp_path):
+    """
+    Registrations are expanded on demand, only along the closure of requested keys
+    """
+    _write_incremental_repo(directory=tmp_path)
+    valid_keys, invalid_keys = Registry.build(directory=tmp_path)
+    other_variant = next(
+        key for key in valid_keys if key.name == "other" and len(key.tags)
+    )
+
+    Registry.initialize()
+    Registry.build(directory=tmp_path, expand=False)
+    parent_key = RegistrationKey(name="parent", namespace="testing")
+    other_key = RegistrationKey(name="other", namespace="testing")
+
+    parent_valid_keys, parent_invalid_keys = Registry.expand_keys(keys=[parent_key])
+    assert parent_key in parent_valid_keys
+    assert not Registry._REGISTRY[other_key].config.expanded
+    assert not Registry.in_registry(other_variant)
+
+    # Variants are expanded when retrieved
+    assert Registry.retrieve_configuration(other_variant) is not None
+    assert Registry._REGISTRY[other_key].config.expanded
+
+    Registry.expand_keys(namespaces="testing")
+    assert Registry._VALID_KEYS == valid_keys
+    assert Registry._INVALID_KEYS == invalid_keys
+    assert parent_valid_keys.issubset(valid_keys)
+    assert parent_invalid_keys.issubset(invalid_keys)
+
+
+def test_parallel_dag_resolution(reset_registry, tmp_path):
+    """
+    Parallel resolution yields the same valid and invalid keys as the serial one
+    """
+    configurations = tmp_path.joinpath("configurations")
+    configurations.mkdir()
+    configurations.joinpath("parallel.py").write_text(
+        "from cinnamon.configuration import Configuration, Param\n"
+        "from cinnamon.registry import RegistrationKey, register_method\n\n\n"
+        "class LeafConfig(Configuration):\n"
+        "    x: int = Param(1, variants=[2, 3, 4])\n\n"
+        "    @classmethod\n"
+        "    @register_method(name='leaf', namespace='testing')\n"
+        "    def default(cls):\n"
+        "        config = cls()\n"
+        "        config.add_condition(lambda c: c.x != 3, name='not_three')\n"
+        "        return config\n\n\n"
+        "class ParentConfig(Configuration):\n"
+        "    y: int = Param(1, variants=[5, 6])\n"
+        "    child: RegistrationKey = RegistrationKey(\n"
+        "        name='leaf', namespace='testing'\n"
+        "    )\n"
+        "\n"
+        "    @classmethod\n"
+        "    @register_method(name='parent', namespace='testing')\n"
+        "    def default(cls):\n"
+        "        config = cls()\n"
+        "        config.add_condition(lambda c: c.y + c.child.x != 8, name='sum')\n"
+        "        return config\n"
+    )
+
+    valid_keys, invalid_keys = Registry.build(directory=tmp_path)
+    serial_metadata = {str(key): key.metadata for key in invalid_keys}
+
+    Registry.initialize()
+    parallel_valid_keys, parallel_invalid_keys = Registry.build(
+        directory=tmp_path, workers=2
+    )
+    assert parallel_valid_keys == valid_keys
+    assert parallel_invalid_keys == invalid_keys
+    assert {str(key): key.metadata for key in parallel_invalid_keys} == serial_metadata
+    assert len(invalid_keys)
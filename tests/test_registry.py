@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 from cinnamon.configuration import Configuration
@@ -5,8 +7,11 @@ from cinnamon.registry import (
     RegistrationKey,
     Registry,
 )
+from cinnamon.utility.query import Query
+from cinnamon.utility.sampling import FirstSampling, RandomSampling
 from cinnamon.utility.exceptions import (
     AlreadyRegisteredException,
+    InvalidQueryException,
     NotADAGException,
     NotRegisteredException,
 )
@@ -16,6 +21,8 @@ from tests.fixtures import (
     CliqueConfigA,
     CliqueConfigB,
     ConfigWithChild,
+    ConfigWithMultipleVariants,
+    ConfigWithMutableVariants,
     ConfigWithVariants,
     IntermediateWithChild,
     InvalidVariantConfig,
@@ -608,6 +615,333 @@ def test_dag_resolution_with_invalid_variants(
     assert isinstance(variant.child, RegistrationKey)
 
 
+def test_dag_resolution_variants_do_not_share_mutable_values(
+        reset_registry,
+):
+    """
+    Mutating the field values of a variant in place affects neither its base
+     configuration nor the other variants
+    """
+    key = Registry.register_configuration(
+        config=ConfigWithMutableVariants.default(), name="a", namespace="testing"
+    )
+    Registry.dag_resolution()
+
+    variants = [
+        Registry.retrieve_configuration(registration_key=variant_key)
+        for variant_key in Registry.variant_keys(key=key)
+    ]
+    assert [variant.x for variant in variants] == [[2], [3]]
+    for variant in variants:
+        variant.items.append(3)
+        variant.x.append(4)
+
+    config = Registry.retrieve_configuration(registration_key=key)
+    assert config.items == [1, 2]
+    assert config.field_meta(field_name="x").variants == [[2], [3]]
+    assert [variant.items for variant in variants] == [[1, 2, 3], [1, 2, 3]]
+
+
+def test_dag_resolution_with_sampling(
+        reset_registry,
+):
+    """
+    Only sampled variants are registered and sampled keys are reproducible
+    """
+
+    def resolve(sampling):
+        Registry.initialize()
+        Registry.register_configuration(
+            config=ConfigWithMultipleVariants.default(), name="a", namespace="testing"
+        )
+        Registry.register_configuration(
+            config=ConfigWithMultipleVariants.default(), name="b", namespace="testing"
+        )
+        return Registry.dag_resolution(sampling=sampling)
+
+    valid_keys, _ = resolve(sampling=RandomSampling(size=2, seed=7))
+    assert len(valid_keys) == 6
+    assert valid_keys == resolve(sampling=RandomSampling(size=2, seed=7))[0]
+
+    key_a = RegistrationKey(name="a", namespace="testing")
+    valid_keys, _ = resolve(sampling={str(key_a): FirstSampling(size=1)})
+    assert len(Registry.variant_keys(key=key_a)) == 1
+    assert len(valid_keys) == 2 + 9
+
+    # Sampled variants are retrievable by their tags
+    variant_key = Registry.variant_keys(key=key_a)[0]
+    variant = Registry.retrieve_configuration(
+        name="a", namespace="testing", tags=variant_key.tags
+    )
+    assert (variant.x, variant.y) == (1, 3)
+
+
+def test_dag_resolution_with_declared_condition_fields(
+        reset_registry,
+):
+    """
+    Variants violating conditions with declared fields are never registered
+    """
+    config = ConfigWithMultipleVariants.default()
+    config.add_condition(
+        name="x_lt_y", condition=lambda c: c.x < c.y, fields={"x", "y"}
+    )
+    key = Registry.register_configuration(config=config, name="a", namespace="testing")
+
+    valid_keys, invalid_keys = Registry.dag_resolution()
+    assert not invalid_keys
+    assert len(valid_keys) == 6
+    for variant_key in Registry.variant_keys(key=key):
+        variant = Registry.retrieve_configuration(registration_key=variant_key)
+        assert variant.x < variant.y
+
+
+def test_dag_resolution_with_sampling_and_declared_condition_fields(
+        reset_registry,
+):
+    """
+    Sampling policies select ``size`` variants satisfying conditions with declared
+     fields
+    """
+    config = ConfigWithMultipleVariants.default()
+    config.add_condition(
+        name="x_lt_y", condition=lambda c: c.x < c.y, fields={"x", "y"}
+    )
+    key = Registry.register_configuration(config=config, name="a", namespace="testing")
+
+    Registry.dag_resolution(sampling=FirstSampling(size=4))
+    variant_keys = Registry.variant_keys(key=key)
+    assert len(variant_keys) == 4
+    for variant_key in variant_keys:
+        variant = Registry.retrieve_configuration(registration_key=variant_key)
+        assert variant.x < variant.y
+
+
+def test_dag_resolution_deep_dependency_chain(
+        reset_registry,
+):
+    """
+    Dependency chains deeper than the recursion limit are expanded level by level
+    """
+    depth = sys.getrecursionlimit() + 100
+    for idx in range(depth):
+        config = ConfigWithChild.default()
+        config.c1 = RegistrationKey(name=f"config{idx + 1}", namespace="testing")
+        Registry.register_configuration(
+            config=config, name=f"config{idx}", namespace="testing"
+        )
+    Registry.register_configuration(
+        config=Configuration.default(), name=f"config{depth}", namespace="testing"
+    )
+
+    levels = []
+    valid_keys, invalid_keys = Registry.dag_resolution(
+        progress=lambda level, total, keys: levels.append((level, total, keys))
+    )
+    assert len(valid_keys) == depth + 1
+    assert not invalid_keys
+    assert len(levels) == depth + 1
+    assert levels[0] == (
+        0,
+        depth + 1,
+        [RegistrationKey(name=f"config{depth}", namespace="testing")],
+    )
+    assert levels[-1][2] == [RegistrationKey(name="config0", namespace="testing")]
+
+
+def test_dependents_and_dependencies(
+        reset_registry,
+):
+    """
+    Transitive dependants and dependencies are retrieved from the dependency DAG,
+     also after the DAG changes
+    """
+    leaf_key = Registry.register_configuration(
+        config=LeafWithVariants.default(), name="leaf", namespace="testing"
+    )
+    intermediate_key = Registry.register_configuration(
+        config=IntermediateWithChild.default(), name="intermediate", namespace="testing"
+    )
+    parent_key = Registry.register_configuration(
+        config=ParentWithVariantsAndChild.default(), name="parent", namespace="testing"
+    )
+
+    assert Registry.dependencies(parent_key) == [leaf_key, intermediate_key]
+    assert Registry.dependencies(leaf_key) == []
+    assert Registry.dependents(leaf_key) == [intermediate_key, parent_key]
+    assert Registry.dependents(str(parent_key)) == []
+
+    Registry.dag_resolution()
+
+    # Variants of dependants are dependants as well
+    parent_variant = parent_key.from_variant(variant_kwargs={"x": 2})
+    dependents = Registry.dependents(leaf_key)
+    assert set(dependents) == {intermediate_key, parent_key, parent_variant}
+    assert dependents[0] == intermediate_key
+    assert leaf_key in Registry.dependencies(parent_variant)
+
+    with pytest.raises(NotRegisteredException):
+        Registry.dependents(RegistrationKey(name="missing", namespace="testing"))
+
+
+def test_resolved_configuration(
+        reset_registry,
+):
+    """
+    Resolved configurations are cached by key and share their resolved dependencies,
+     while registered configurations keep their dependency keys
+    """
+    leaf_config = LeafWithVariants.default()
+    leaf_config.add_condition(name="variant_only", condition=lambda c: c.x == 2)
+    leaf_key = Registry.register_configuration(
+        config=leaf_config, name="leaf", namespace="testing"
+    )
+    intermediate_key = Registry.register_configuration(
+        config=IntermediateWithChild.default(), name="intermediate", namespace="testing"
+    )
+    parent_key = Registry.register_configuration(
+        config=ParentWithVariantsAndChild.default(), name="parent", namespace="testing"
+    )
+
+    valid_keys, invalid_keys = Registry.dag_resolution()
+
+    parent = Registry.resolved_configuration(parent_key)
+    parent_variant = Registry.resolved_configuration(
+        parent_key.from_variant(variant_kwargs={"x": 2})
+    )
+    intermediate = Registry.resolved_configuration(intermediate_key)
+    assert parent is Registry.resolved_configuration(parent_key)
+    assert parent.child is intermediate
+    assert parent_variant.child is intermediate
+    assert intermediate.child is Registry.resolved_configuration(leaf_key)
+    assert Registry.retrieve_configuration(parent_key).child == intermediate_key
+
+    # Dependants of invalid configurations are invalid
+    leaf_variant = leaf_key.from_variant(variant_kwargs={"x": 2})
+    assert leaf_key in invalid_keys
+    assert leaf_variant in valid_keys
+    assert {intermediate_key, parent_key}.issubset(invalid_keys)
+
+    # Dependants report the validation error of their dependency
+    assert "variant_only" in leaf_key.metadata
+    assert intermediate_key.metadata == leaf_key.metadata
+    assert parent_key.metadata == leaf_key.metadata
+
+
+def test_retrieve_keys_index(
+        reset_registry,
+):
+    """
+    Indexed key retrieval matches linear scan semantics, also after removals
+    """
+    for idx in range(20):
+        Registry.register_configuration(
+            config=Configuration.default(),
+            name=f"config{idx % 3}",
+            namespace=f"testing{idx % 2}",
+            tags={f"x={idx % 4}", f"y={idx % 5}"} if idx % 7 else None,
+            run_method="run" if idx % 2 else None,
+        )
+    Registry._REGISTRY.pop(Registry.retrieve_keys(names="config0")[0])
+
+    filters = [
+        {},
+        {"names": "config1"},
+        {"names": ["config1", "config2"], "namespaces": "testing0"},
+        {"tags": {"x=1"}},
+        {"tags": {"x=1", "y=2"}},
+        {"tags": {None}},
+        {"tags": {None, "x=2"}},
+        {"tags": {"missing"}},
+        {"special_tags": {"__runnable"}, "tags": {"y=3"}},
+        {"special_tags": {None}},
+    ]
+    for retrieval_filter in filters:
+        assert Registry.retrieve_keys(**retrieval_filter) == Registry.retrieve_keys(
+            keys=list(Registry._REGISTRY), **retrieval_filter
+        )
+
+
+def test_query(
+        reset_registry,
+):
+    """
+    Queries combine name/namespace globs, compound, hierarchy and numeric tag
+     predicates
+    """
+    for idx in range(24):
+        Registry.register_configuration(
+            config=Configuration.default(),
+            name=f"{'svm' if idx % 2 else 'logreg'}{idx % 3}",
+            namespace=f"testing{idx % 2}",
+            tags={
+                f"C={[0.01, 0.1, 1.0, 10.0][idx % 4]}",
+                f"model.kernel={['linear', 'rbf', 'poly'][idx % 3]}",
+                f"seed={idx}",
+            },
+        )
+    keys = list(Registry._REGISTRY)
+
+    def tag_value(key, param_name):
+        return next(
+            tag.split("=")[1] for tag in key.tags if tag.startswith(f"{param_name}=")
+        )
+
+    queries = [
+        ("name:svm1", lambda key: key.name == "svm1"),
+        ("name:svm*", lambda key: key.name.startswith("svm")),
+        (
+            "namespace:testing[01] and name:logreg?",
+            lambda key: key.name.startswith("logreg"),
+        ),
+        ("C=1.0", lambda key: "C=1.0" in key.tags),
+        ("C=1", lambda key: False),
+        ("C!=1.0", lambda key: "C=1.0" not in key.tags),
+        ("C>=0.1", lambda key: float(tag_value(key, "C")) >= 0.1),
+        ("0.01 < C <= 1", lambda key: 0.01 < float(tag_value(key, "C")) <= 1),
+        ("model.kernel=linear", lambda key: "model.kernel=linear" in key.tags),
+        ("model.kernel=*r*", lambda key: tag_value(key, "model.kernel") != "poly"),
+        (
+            "name:svm* and (C<0.1 or model.kernel=poly) and not seed>=20",
+            lambda key: key.name.startswith("svm")
+            and (float(tag_value(key, "C")) < 0.1 or "model.kernel=poly" in key.tags)
+            and int(tag_value(key, "seed")) < 20,
+        ),
+        ("not 'seed=3'", lambda key: "seed=3" not in key.tags),
+        ("missing or kernel>1", lambda key: False),
+    ]
+    for query, predicate in queries:
+        expected = [key for key in keys if predicate(key)]
+        assert Registry.query(query) == expected, query
+        assert Registry.query(query, keys=keys[::-1]) == expected[::-1], query
+
+    for query in [
+        "",
+        "name:svm* and",
+        "(C=1.0",
+        "C>=high",
+        "tags:x",
+        "C=1.0 C=0.1",
+        "!x",
+    ]:
+        with pytest.raises(InvalidQueryException):
+            Registry.query(query)
+
+
+def test_query_is_abstract():
+    """
+    Query expressions must define how they are evaluated
+    """
+    with pytest.raises(TypeError):
+        Query()
+
+    class NoEvaluateQuery(Query):
+        pass
+
+    with pytest.raises(TypeError):
+        NoEvaluateQuery()
+
+
 def test_register_and_bind_runnable_component(reset_registry):
     key = Registry.register_configuration(
         config=Configuration.default(),
@@ -621,6 +955,36 @@ def test_register_and_bind_runnable_component(reset_registry):
     assert "__runnable" in key.special_tags
 
 
+def test_runnable_special_tags_are_owned_by_registry(reset_registry, tmp_path):
+    """
+    Listing a registration in the catalog does not change the special tags of the
+     registered key
+    """
+    key = Registry.register_configuration(
+        config=Configuration.default(),
+        name="test",
+        tags={"tag"},
+        namespace="testing",
+        run_method="__call__",
+    )
+
+    configurations = tmp_path.joinpath("configurations")
+    configurations.mkdir()
+    configurations.joinpath("script.py").write_text(
+        "from cinnamon.registry import Registry, register\n\n\n"
+        "@register\n"
+        "def register_configurations():\n"
+        "    Registry.register_configuration(\n"
+        "        Configuration.default(), 'test', 'testing', {'tag'}\n"
+        "    )\n"
+    )
+    assert list(Registry.catalog(directory=tmp_path)) == [key]
+
+    assert "__runnable" in key.special_tags
+    assert Registry.retrieve_runnable_keys() == [key]
+    assert Registry.query("special_tag:__runnable") == [key]
+
+
 def test_register_and_bind_custom_runnable_component(reset_registry):
     key = Registry.register_configuration(
         config=Configuration.default(),